@@ -0,0 +1,513 @@
+from array import array
+from contextlib import contextmanager
+from itertools import repeat
+from threading import local
+from operator import add, mul, sub, truediv
+from typing import Any, Callable, Iterator, Sequence
+
+try:
+    from math import sumprod as _dot
+except ImportError:  # Python < 3.12
+    def _dot(x, y) -> float:
+        return sum(map(mul, x, y))
+
+# A backend owns the storage of Vector and Matrix elements and the kernels that
+# operate on it. Every kernel works on flat 1-D buffers:
+#   - a Vector is a buffer of `dimension` numbers
+#   - a Matrix is a buffer of rows * cols numbers in column-major ("F") or
+#     row-major ("C") order (see Matrix.py)
+#
+# Two backends are registered:
+#   "python" - array('d') buffers and interpreter loops, always available
+#   "numpy"  - float64 ndarrays, each kernel is one call into NumPy's C code
+#
+# The numpy backend is the default when NumPy can be imported, otherwise the
+# library falls back to the python backend. Both backends compute the same results
+# (up to floating point rounding in the reductions).
+
+# Edge length of the square output tiles used by the blocked multiplication kernel
+_BLOCK_SIZE = 64
+
+# Inner dimensions up to this size use the outer-product kernel instead (see
+# _matmul_outer), e.g. a small transform applied to a large batch of vectors
+_OUTER_PRODUCT_MAX_K = 8
+
+def _into(out: Any, values: array) -> array:
+    """
+    Returns values, or copies them into the existing buffer out and returns out.
+    The values are computed completely before the copy, so out may alias an input.
+    """
+    if out is None:
+        return values
+    out[:] = values
+    return out
+
+def _split_rows(buffer: array, rows: int, cols: int) -> list[list[float]]:
+    """
+    Splits a row-major buffer into one list per row.
+    Lists are used because the interpreter iterates them faster than array slices
+    (the floats are already boxed), and every row is reused many times.
+    """
+    return [buffer[r * cols:(r + 1) * cols].tolist() for r in range(rows)]
+
+def _matmul_blocked(a: array, b: array, m: int, k: int, n: int, block: int = _BLOCK_SIZE) -> array:
+    """
+    Multiplies a row-major (m x k) buffer `a` by a column-major (k x n) buffer `b`
+    and returns the column-major (m x n) product.
+
+    With `a` row-major and `b` column-major every output element is the dot product
+    of two contiguous slices, so no per-row Vector objects are created. The output is
+    visited in (block x block) tiles so that the rows of `a` and columns of `b` used by
+    a tile are reused while they are still hot.
+    """
+    out = array("d", bytes(8 * m * n))
+    a_rows = _split_rows(a, m, k)
+    for j0 in range(0, n, block):
+        j1 = min(j0 + block, n)
+        b_cols = [b[j * k:(j + 1) * k].tolist() for j in range(j0, j1)]
+        for i0 in range(0, m, block):
+            i1 = min(i0 + block, m)
+            tile_rows = a_rows[i0:i1]
+            for j, b_col in enumerate(b_cols, j0):
+                start = j * m + i0
+                out[start:start + (i1 - i0)] = array("d", map(_dot, tile_rows, repeat(b_col)))
+    return out
+
+def _matmul_outer(a: array, b: array, m: int, k: int, n: int) -> array:
+    """
+    Same contract as _matmul_blocked, for a small inner dimension k.
+
+    Dot products of length k are too short to pay for their per-call overhead, so
+    each output row is built instead as a sum of k scaled rows of `b` (strided
+    slices of the column-major buffer) in one lazy chain of C-level map() calls.
+    """
+    out = array("d", bytes(8 * m * n))
+    b_rows = [b[j::k] for j in range(k)]
+    for i in range(m):
+        a_row = a[i * k:(i + 1) * k]
+        acc = map(mul, b_rows[0], repeat(a_row[0]))
+        for j in range(1, k):
+            acc = map(add, acc, map(mul, b_rows[j], repeat(a_row[j])))
+        out[i::m] = array("d", acc)
+    return out
+
+
+class PythonBackend:
+    """
+    Pure Python kernels over array('d') buffers.
+    """
+    name = "python"
+
+    def array(self, items: Sequence[float]) -> array:
+        """
+        Returns a new buffer holding a copy of items.
+        """
+        if isinstance(items, memoryview):
+            # asarray copies a view, as raw bytes when it is contiguous
+            return self.asarray(items)
+        return array("d", items)
+
+    def asarray(self, data: Any) -> array:
+        """
+        Returns data as this backend's buffer type, copying only if it is not one already.
+        """
+        if isinstance(data, array) and data.typecode == "d":
+            return data
+        if isinstance(data, memoryview) and data.format == "d" and data.c_contiguous:
+            # Packed float64 memory is copied as raw bytes instead of number by number
+            result = array("d")
+            result.frombytes(data.cast("B"))
+            return result
+        return array("d", data)
+
+    def zeros(self, size: int) -> array:
+        return array("d", bytes(8 * size))
+
+    def identity(self, size: int) -> array:
+        data = self.zeros(size * size)
+        data[::size + 1] = array("d", [1.0] * size)
+        return data
+
+    def concat(self, parts: Sequence[Any]) -> array:
+        result = array("d")
+        for part in parts:
+            result.extend(self.asarray(part))
+        return result
+
+    def tolist(self, data: array) -> list[float]:
+        return data.tolist()
+
+    def view(self, data: array, start: int, stop: int, step: int = 1) -> memoryview:
+        """
+        Returns elements start:stop:step of data without copying them. Writes
+        through the view change data, and data cannot be resized while a view exists.
+        """
+        return memoryview(data)[start:stop:step]
+
+    def frombuffer(self, data: Any) -> memoryview:
+        """
+        Returns float64 memory from any buffer (e.g. a memory-mapped file) as a
+        buffer of this backend without copying it.
+        """
+        return memoryview(data).cast("B").cast("d")
+
+    # The elementwise kernels return a new buffer, or write into `out` (a buffer
+    # of the same size, possibly one of the inputs) and return it
+    def add(self, a: array, b: array, out: Any = None) -> array:
+        return _into(out, array("d", map(add, a, b)))
+
+    def sub(self, a: array, b: array, out: Any = None) -> array:
+        return _into(out, array("d", map(sub, a, b)))
+
+    def scale(self, a: array, scalar: float, out: Any = None) -> array:
+        return _into(out, array("d", map(mul, a, repeat(scalar))))
+
+    def divide(self, a: array, scalar: float, out: Any = None) -> array:
+        return _into(out, array("d", map(truediv, a, repeat(scalar))))
+
+    def axpy(self, alpha: float, x: array, y: array) -> array:
+        """
+        y += alpha * x, in place, in one pass without an intermediate alpha * x.
+        """
+        y[:] = array("d", map(add, y, map(mul, x, repeat(alpha))))
+        return y
+
+    def dot(self, a: array, b: array) -> float:
+        return _dot(a, b)
+
+    def norm(self, a: array) -> float:
+        return _dot(a, a) ** 0.5
+
+    def equal(self, a: array, b: array) -> bool:
+        return a == b
+
+    def linear_combination(self, vectors: Sequence[array], scalars: Sequence[float], out: Any = None) -> array:
+        if len(vectors) > len(vectors[0]):
+            # Many short vectors: component i of the result is the dot product of
+            # the scalars with the i-th components of the vectors
+            return _into(out, array("d", map(_dot, zip(*vectors), repeat(tuple(scalars)))))
+        # Few long vectors: one C-level pass per vector into a single running list
+        # of floats (faster than a Python-level dot product per component), with
+        # no multiplication for coefficients of 1, and one conversion at the end
+        total = list(vectors[0]) if scalars[0] == 1 else list(map(mul, vectors[0], repeat(scalars[0])))
+        for vector, scalar in zip(vectors[1:], scalars[1:]):
+            if scalar == 1:
+                total = list(map(add, total, vector))
+            elif scalar == -1:
+                total = list(map(sub, total, vector))
+            else:
+                total = list(map(add, total, map(mul, vector, repeat(scalar))))
+        return _into(out, array("d", total))
+
+    def matmul(self, a: array, b: array, m: int, k: int, n: int) -> array:
+        """
+        (m x k) row-major times (k x n) column-major, returned column-major.
+        """
+        if k <= _OUTER_PRODUCT_MAX_K:
+            return _matmul_outer(a, b, m, k, n)
+        return _matmul_blocked(a, b, m, k, n)
+
+    def matvec(self, a: array, x: array, m: int, k: int) -> array:
+        """
+        (m x k) row-major times a Vector buffer of size k.
+        """
+        return array("d", map(_dot, _split_rows(a, m, k), repeat(x.tolist())))
+
+    def transpose_layout(self, data: array, outer: int, inner: int) -> array:
+        """
+        Reads data as `outer` runs of `inner` numbers and returns it re-ordered as
+        `inner` runs of `outer` numbers, i.e. switches between row and column-major.
+        """
+        # Every output run is a strided slice, which array copies in C
+        result = array("d")
+        for start in range(inner):
+            result.extend(data[start::inner])
+        return result
+
+    def gather(self, data: Any, offset: int, outer: int, inner: int, outer_stride: int, inner_stride: int) -> array:
+        """
+        Copies `outer` runs of `inner` numbers out of data, where number j of run i
+        is data[offset + i * outer_stride + j * inner_stride] (a strided matrix view).
+        """
+        result = array("d")
+        span = (inner - 1) * inner_stride + 1
+        for i in range(outer):
+            start = offset + i * outer_stride
+            result.extend(self.asarray(data[start:start + span:inner_stride]))
+        return result
+
+    def scatter(
+        self, data: Any, offset: int, outer: int, inner: int, outer_stride: int, inner_stride: int, values: Any
+    ) -> None:
+        """
+        The inverse of gather: writes values, `outer` runs of `inner` numbers, into
+        the strided positions of data.
+        """
+        values = self.asarray(values)
+        span = (inner - 1) * inner_stride + 1
+        for i in range(outer):
+            start = offset + i * outer_stride
+            data[start:start + span:inner_stride] = values[i * inner:(i + 1) * inner]
+
+    def lu_factor(self, a: array, n: int) -> tuple[Any, int]:
+        """
+        LU decomposition with partial pivoting of a row-major (n x n) buffer.
+        Returns the factorization (consumed by lu_solve and lu_diagonal) and the
+        sign of the row permutation.
+        """
+        rows = _split_rows(a, n, n)
+        perm = list(range(n))
+        sign = 1
+        for k in range(n):
+            # Partial pivoting: move the largest remaining entry of column k onto
+            # the diagonal to keep the multipliers <= 1
+            pivot = max(range(k, n), key=lambda i: abs(rows[i][k]))
+            if rows[pivot][k] == 0:
+                continue  # singular, the column is already eliminated
+            if pivot != k:
+                rows[k], rows[pivot] = rows[pivot], rows[k]
+                perm[k], perm[pivot] = perm[pivot], perm[k]
+                sign = -sign
+            pivot_tail = rows[k][k + 1:]
+            inverse_pivot = 1 / rows[k][k]
+            for i in range(k + 1, n):
+                row = rows[i]
+                factor = row[k] * inverse_pivot
+                row[k] = factor
+                if factor:
+                    row[k + 1:] = map(sub, row[k + 1:], map(mul, pivot_tail, repeat(factor)))
+        # Split every row into its L part (left of the diagonal), the diagonal and its
+        # U part (right of the diagonal) once, so that solves do not slice again
+        lower = [row[:i] for i, row in enumerate(rows)]
+        diagonal = [row[i] for i, row in enumerate(rows)]
+        upper = [row[i + 1:] for i, row in enumerate(rows)]
+        return (lower, diagonal, upper, perm), sign
+
+    def lu_diagonal(self, factor: Any) -> list[float]:
+        return factor[1]
+
+    def lu_solve(self, factor: Any, b: array, n: int, nrhs: int) -> array:
+        """
+        Solves A x = b for each of the nrhs right-hand sides stored column-major
+        in b and returns the solutions column-major, in O(n^2) per right-hand side.
+        """
+        lower, diagonal, upper, perm = factor
+        result = array("d")
+        for j in range(nrhs):
+            column = b[j * n:(j + 1) * n]
+            x = [column[p] for p in perm]
+            # Forward substitution with the unit lower triangle
+            for i in range(1, n):
+                x[i] -= _dot(lower[i], x[:i])
+            # Back substitution with the upper triangle
+            for i in range(n - 1, -1, -1):
+                x[i] = (x[i] - _dot(upper[i], x[i + 1:])) / diagonal[i]
+            result.extend(x)
+        return result
+
+
+class NumpyBackend:
+    """
+    NumPy kernels over float64 ndarray buffers.
+    """
+    name = "numpy"
+
+    def __init__(self) -> None:
+        import numpy
+        self.np = numpy
+        # Scratch buffer for axpy, per thread so that concurrent calls never
+        # share it. It keeps the size of the largest x seen in that thread.
+        self._scratch = local()
+
+    def array(self, items: Sequence[float]) -> Any:
+        return self.np.array(items, dtype=self.np.float64)
+
+    def asarray(self, data: Any) -> Any:
+        # array('d') exposes the buffer protocol, so this does not copy it
+        return self.np.asarray(data, dtype=self.np.float64)
+
+    def zeros(self, size: int) -> Any:
+        return self.np.zeros(size)
+
+    def identity(self, size: int) -> Any:
+        return self.np.eye(size).ravel()
+
+    def concat(self, parts: Sequence[Any]) -> Any:
+        if not parts:
+            return self.zeros(0)
+        return self.np.concatenate([self.asarray(part) for part in parts])
+
+    def tolist(self, data: Any) -> list[float]:
+        return data.tolist()
+
+    def view(self, data: Any, start: int, stop: int, step: int = 1) -> Any:
+        # Basic slicing of an ndarray never copies
+        return data[start:stop:step]
+
+    def frombuffer(self, data: Any) -> Any:
+        return self.np.frombuffer(data, dtype=self.np.float64)
+
+    def add(self, a: Any, b: Any, out: Any = None) -> Any:
+        return self.np.add(a, b, out=out)
+
+    def sub(self, a: Any, b: Any, out: Any = None) -> Any:
+        return self.np.subtract(a, b, out=out)
+
+    def scale(self, a: Any, scalar: float, out: Any = None) -> Any:
+        return self.np.multiply(a, scalar, out=out)
+
+    def divide(self, a: Any, scalar: float, out: Any = None) -> Any:
+        return self.np.divide(a, scalar, out=out)
+
+    def axpy(self, alpha: float, x: Any, y: Any) -> Any:
+        """
+        y += alpha * x, in place. alpha * x is written into a reused scratch
+        buffer rather than a new temporary on every call.
+        """
+        scratch = getattr(self._scratch, "buffer", None)
+        if scratch is None or scratch.size < x.size:
+            scratch = self._scratch.buffer = self.np.empty(x.size)
+        scaled = scratch[:x.size].reshape(x.shape)
+        self.np.multiply(x, alpha, out=scaled)
+        y += scaled
+        return y
+
+    def dot(self, a: Any, b: Any) -> float:
+        return float(self.np.dot(a, b))
+
+    def norm(self, a: Any) -> float:
+        return float(self.np.dot(a, a)) ** 0.5
+
+    def equal(self, a: Any, b: Any) -> bool:
+        return bool(self.np.array_equal(a, b))
+
+    def linear_combination(self, vectors: Sequence[Any], scalars: Sequence[float], out: Any = None) -> Any:
+        return self.np.matmul(self.np.asarray(scalars, dtype=self.np.float64), self.np.vstack(vectors), out=out)
+
+    def matmul(self, a: Any, b: Any, m: int, k: int, n: int) -> Any:
+        product = a.reshape(m, k) @ b.reshape(n, k).T
+        return product.ravel(order="F")
+
+    def matvec(self, a: Any, x: Any, m: int, k: int) -> Any:
+        return a.reshape(m, k) @ x
+
+    def transpose_layout(self, data: Any, outer: int, inner: int) -> Any:
+        return data.reshape(outer, inner).T.ravel()
+
+    def _strided(self, data: Any, offset: int, outer: int, inner: int, outer_stride: int, inner_stride: int) -> Any:
+        step = data.strides[0]
+        return self.np.lib.stride_tricks.as_strided(
+            data[offset:], shape=(outer, inner), strides=(outer_stride * step, inner_stride * step)
+        )
+
+    def gather(self, data: Any, offset: int, outer: int, inner: int, outer_stride: int, inner_stride: int) -> Any:
+        # flatten() always copies, even when the strided view happens to be contiguous
+        return self._strided(data, offset, outer, inner, outer_stride, inner_stride).flatten()
+
+    def scatter(
+        self, data: Any, offset: int, outer: int, inner: int, outer_stride: int, inner_stride: int, values: Any
+    ) -> None:
+        self._strided(data, offset, outer, inner, outer_stride, inner_stride)[...] = self.asarray(values).reshape(outer, inner)
+
+    def lu_factor(self, a: Any, n: int) -> tuple[Any, int]:
+        np = self.np
+        lu = a.reshape(n, n).copy()
+        perm = np.arange(n)
+        sign = 1
+        for k in range(n):
+            pivot = k + int(np.argmax(np.abs(lu[k:, k])))
+            if lu[pivot, k] == 0:
+                continue
+            if pivot != k:
+                lu[[k, pivot]] = lu[[pivot, k]]
+                perm[[k, pivot]] = perm[[pivot, k]]
+                sign = -sign
+            lu[k + 1:, k] /= lu[k, k]
+            lu[k + 1:, k + 1:] -= np.outer(lu[k + 1:, k], lu[k, k + 1:])
+        return (lu, perm), sign
+
+    def lu_diagonal(self, factor: Any) -> list[float]:
+        return factor[0].diagonal().tolist()
+
+    def lu_solve(self, factor: Any, b: Any, n: int, nrhs: int) -> Any:
+        lu, perm = factor
+        # One row of x per unknown, one column per right-hand side, so every
+        # substitution step works on all right-hand sides at once
+        x = b.reshape(nrhs, n).T[perm].copy()
+        for i in range(1, n):
+            x[i] -= lu[i, :i] @ x[:i]
+        for i in range(n - 1, -1, -1):
+            x[i] = (x[i] - lu[i, i + 1:] @ x[i + 1:]) / lu[i, i]
+        return x.ravel(order="F")
+
+
+# Registry of backend factories by name. Factories are called lazily so that an
+# optional dependency is only imported when its backend is first used.
+_FACTORIES: dict[str, Callable[[], Any]] = {}
+_INSTANCES: dict[str, Any] = {}
+_active: str | None = None
+
+def register_backend(name: str, factory: Callable[[], Any]) -> None:
+    """
+    Registers a backend factory under name. The factory should raise ImportError
+    if the backend cannot be used in this environment.
+    """
+    _FACTORIES[name] = factory
+    _INSTANCES.pop(name, None)
+
+def _instance(name: str) -> Any:
+    if name not in _FACTORIES:
+        raise ValueError(f"Unknown backend '{name}'. Registered: {sorted(_FACTORIES)}")
+    if name not in _INSTANCES:
+        _INSTANCES[name] = _FACTORIES[name]()
+    return _INSTANCES[name]
+
+def available_backends() -> list[str]:
+    """
+    Returns the names of the registered backends that can be used here.
+    """
+    names: list[str] = []
+    for name in _FACTORIES:
+        try:
+            _instance(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+def get_backend(name: str | None = None) -> Any:
+    """
+    Returns the backend called name, or the active one when name is None.
+    """
+    global _active
+    if name is not None:
+        return _instance(name)
+    if _active is None:
+        _active = "numpy" if "numpy" in available_backends() else "python"
+    return _instance(_active)
+
+def set_backend(name: str) -> None:
+    """
+    Makes name the backend used by newly created Vectors and Matrices.
+    Existing objects keep the backend they were created with.
+    """
+    global _active
+    _instance(name)
+    _active = name
+
+@contextmanager
+def use_backend(name: str) -> Iterator[Any]:
+    """
+    Temporarily switches the active backend.
+    Example: with use_backend("python"): ...
+    """
+    global _active
+    previous = _active
+    set_backend(name)
+    try:
+        yield get_backend()
+    finally:
+        _active = previous
+
+register_backend("python", PythonBackend)
+register_backend("numpy", NumpyBackend)
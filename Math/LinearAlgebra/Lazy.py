@@ -0,0 +1,320 @@
+from typing import Any
+
+from .Matrix import Matrix
+from .Vectors import Number, Vector
+
+# Lazy matrix expressions.
+#
+# A.lazy() (or v.lazy()) wraps a Matrix or Vector in an Expression. Operators on
+# Expressions (+, -, *, / by a number, unary -, .T) do no arithmetic; they build
+# a graph of the expression, which evaluate() then computes with three
+# optimisations the eager operators cannot make, because each of them sees only
+# one operator:
+#
+# - Multiplication order. A product chain A * B * C * v is flattened into its
+#   factors and multiplied in the order with the fewest scalar multiplications,
+#   found by the classic matrix-chain dynamic programme over the shapes. For
+#   n x n matrices and a vector that is right to left, three O(n^2)
+#   matrix-vector products instead of two O(n^3) matrix products.
+# - Fusion. A sum of scaled terms, a*X + b*Y - Z ..., however it was written, is
+#   flattened into one linear combination and computed by a single
+#   Backend.linear_combination call, with no temporary Matrix per operator.
+#   Equal terms are merged, so X + X costs one term.
+# - Common subexpressions. Structurally equal subexpressions (the same operands
+#   combined the same way) are evaluated once per evaluate() call, including
+#   equal sub-chains of different products.
+#
+#   y = (A.lazy() * B * C * v + 2 * (A.lazy() * B * C * w)).evaluate()
+#
+# evaluate() returns a Matrix, a Vector or, for a product of two vectors (a dot
+# product, as with Vector * Vector), a number.
+
+def _wrap(value: Any) -> "Expression":
+    if isinstance(value, Expression):
+        return value
+    if isinstance(value, (Matrix, Vector)):
+        return Expression._leaf(value)
+    raise TypeError(f"Cannot use {type(value).__name__} in a matrix expression")
+
+class Expression:
+    """
+    A node of a lazy matrix expression: a leaf (a Matrix or Vector), a product,
+    a sum, a difference, a multiple or a transpose of other nodes.
+    """
+    __slots__ = ("op", "children", "kind", "shape", "scalar", "value", "key")
+
+    def __init__(self, op: str, children: tuple["Expression", ...], kind: str, shape: tuple[int, int], scalar: Number = 1) -> None:
+        self.op = op
+        self.children = children
+        # "matrix", "vector" (shape (n, 1)) or "scalar" (a dot product)
+        self.kind = kind
+        self.shape = shape
+        self.scalar = scalar
+        self.value = None
+        # Structural key: equal keys mean equal values, which is what lets
+        # evaluate() share common subexpressions
+        self.key = (op, scalar) + tuple(child.key for child in children)
+
+    @classmethod
+    def _leaf(cls, value: "Matrix | Vector") -> "Expression":
+        if isinstance(value, Matrix):
+            node = cls("leaf", (), "matrix", (value.rows, value.cols))
+        else:
+            node = cls("leaf", (), "vector", (value.dimension, 1))
+        node.value = value
+        # The node holds the value, so its id is not reused while the key exists
+        node.key = ("leaf", id(value))
+        return node
+
+    # Building the graph
+
+    def _elementwise(self, op: str, other: Any) -> "Expression":
+        other = _wrap(other)
+        if self.kind == "scalar" or self.kind != other.kind or self.shape != other.shape:
+            raise ValueError(f"Operands of {op} must have the same shape, got {self._describe()} and {other._describe()}")
+        return Expression(op, (self, other), self.kind, self.shape)
+
+    def __add__(self, other: Any) -> "Expression":
+        return self._elementwise("add", other)
+
+    def __radd__(self, other: Any) -> "Expression":
+        return _wrap(other)._elementwise("add", self)
+
+    def __sub__(self, other: Any) -> "Expression":
+        return self._elementwise("sub", other)
+
+    def __rsub__(self, other: Any) -> "Expression":
+        return _wrap(other)._elementwise("sub", self)
+
+    def _scale(self, scalar: Number) -> "Expression":
+        if self.kind == "scalar":
+            raise TypeError("A lazy dot product can only be evaluated")
+        return Expression("scale", (self,), self.kind, self.shape, scalar)
+
+    def __neg__(self) -> "Expression":
+        return self._scale(-1)
+
+    def __truediv__(self, scalar: Number) -> "Expression":
+        if isinstance(scalar, (Expression, Matrix, Vector)):
+            return NotImplemented
+        if scalar == 0:
+            raise ValueError("Division by zero is not allowed")
+        return self._scale(1 / scalar)
+
+    def __mul__(self, other: Any) -> "Expression":
+        if isinstance(other, (int, float)):
+            return self._scale(other)
+        other = _wrap(other)
+        if self.kind == "matrix" and other.kind in ("matrix", "vector"):
+            if self.shape[1] != other.shape[0]:
+                raise ValueError(
+                    f"Matrix dimensions incompatible for multiplication: {self._describe()} * {other._describe()}"
+                )
+            kind = other.kind
+            shape = (self.shape[0], other.shape[1])
+        elif self.kind == "vector" and other.kind == "vector":
+            if self.shape != other.shape:
+                raise ValueError("Vector dimensions must match")
+            kind, shape = "scalar", (1, 1)
+        else:
+            raise TypeError(f"Cannot multiply {self._describe()} by {other._describe()}")
+        return Expression("matmul", (self, other), kind, shape)
+
+    def __rmul__(self, other: Any) -> "Expression":
+        if isinstance(other, (int, float)):
+            return self._scale(other)
+        return _wrap(other) * self
+
+    @property
+    def T(self) -> "Expression":
+        if self.kind != "matrix":
+            raise TypeError("Only matrix expressions can be transposed")
+        if self.op == "T":
+            return self.children[0]
+        return Expression("T", (self,), "matrix", (self.shape[1], self.shape[0]))
+
+    def _describe(self) -> str:
+        if self.kind == "matrix":
+            return f"({self.shape[0]}x{self.shape[1]}) matrix"
+        if self.kind == "vector":
+            return f"{self.shape[0]}-dimensional vector"
+        return "scalar"
+
+    def __repr__(self) -> str:
+        if self.op == "leaf":
+            return "Matrix" if self.kind == "matrix" else "Vector"
+        if self.op == "scale":
+            return f"{self.scalar} * {self.children[0]!r}"
+        if self.op == "T":
+            return f"({self.children[0]!r}).T"
+        symbol = {"add": "+", "sub": "-", "matmul": "*"}[self.op]
+        return f"({self.children[0]!r} {symbol} {self.children[1]!r})"
+
+    # Evaluation
+
+    def evaluate(self) -> "Matrix | Vector | Number":
+        return _Evaluator().evaluate(self)
+
+    def factors(self) -> list["Expression"]:
+        """
+        The operands of a product chain, with nested products flattened.
+        """
+        if self.op != "matmul":
+            return [self]
+        if self.kind == "scalar":
+            # A dot product l . r is the chain l^T r. With l = M1 ... Mk u that
+            # is u^T Mk^T ... M1^T r, which starts with a row vector as a chain must
+            left = self.children[0].factors()
+            return [left[-1]] + [f.T for f in reversed(left[:-1])] + self.children[1].factors()
+        return self.children[0].factors() + self.children[1].factors()
+
+    def terms(self) -> dict[tuple, tuple[Number, "Expression"]]:
+        """
+        The expression as a linear combination: key -> (coefficient, node) over
+        the nodes that are not sums, differences or multiples.
+        """
+        terms: dict[tuple, tuple[Number, Expression]] = {}
+        stack: list[tuple[Number, Expression]] = [(1, self)]
+        while stack:
+            coefficient, node = stack.pop()
+            if node.op == "add":
+                stack.extend((coefficient, child) for child in node.children)
+            elif node.op == "sub":
+                stack.append((coefficient, node.children[0]))
+                stack.append((-coefficient, node.children[1]))
+            elif node.op == "scale":
+                stack.append((coefficient * node.scalar, node.children[0]))
+            else:
+                previous = terms.get(node.key, (0, node))[0]
+                terms[node.key] = (previous + coefficient, node)
+        return terms
+
+    def plan(self) -> str:
+        """
+        The multiplication order evaluate() would use for this product chain.
+        """
+        factors = self.factors()
+        split = _chain_order(_chain_dims(factors))[1]
+        names = [f"{repr(f)}{i}" if f.op == "leaf" else repr(f) for i, f in enumerate(factors)]
+
+        def order(i: int, j: int) -> str:
+            if i == j:
+                return names[i]
+            k = split[i][j]
+            return f"({order(i, k)} * {order(k + 1, j)})"
+
+        return order(0, len(factors) - 1)
+
+def _chain_dims(factors: list[Expression]) -> list[int]:
+    # A vector at the start of a chain is the left side of a dot product, a row
+    if factors[0].kind == "vector" and len(factors) > 1:
+        dims = [1, factors[0].shape[0]]
+    else:
+        dims = [factors[0].shape[0], factors[0].shape[1]]
+    return dims + [f.shape[1] for f in factors[1:]]
+
+def _chain_order(dims: list[int]) -> tuple[list[list[int]], list[list[int]]]:
+    """
+    Minimum number of scalar multiplications for the product of matrices
+    i..j, where matrix i is dims[i] x dims[i + 1], and the best split point.
+    """
+    n = len(dims) - 1
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+    for length in range(1, n):
+        for i in range(n - length):
+            j = i + length
+            best, best_k = None, i
+            for k in range(i, j):
+                c = cost[i][k] + cost[k + 1][j] + dims[i] * dims[k + 1] * dims[j + 1]
+                if best is None or c < best:
+                    best, best_k = c, k
+            cost[i][j] = best
+            split[i][j] = best_k
+    return cost, split
+
+class _Evaluator:
+    """
+    Evaluates expressions, remembering every value by structural key for the
+    duration of one evaluate() call.
+    """
+    def __init__(self) -> None:
+        self.memo: dict[tuple, Any] = {}
+
+    def evaluate(self, node: Expression) -> Any:
+        if node.key in self.memo:
+            return self.memo[node.key]
+        if node.op == "leaf":
+            result = node.value
+        elif node.op == "matmul":
+            result = self._chain(node.factors())
+        elif node.op == "T":
+            result = self.evaluate(node.children[0]).T
+        else:
+            result = self._combine(node)
+        self.memo[node.key] = result
+        return result
+
+    def _chain(self, factors: list[Expression]) -> Any:
+        split = _chain_order(_chain_dims(factors))[1]
+        values = [self.evaluate(f) for f in factors]
+        keys = [f.key for f in factors]
+        last = len(factors) - 1
+        dot = factors[0].kind == "vector"
+
+        def product(i: int, j: int) -> Any:
+            if i == j:
+                return values[i]
+            key = ("chain",) + tuple(keys[i:j + 1])
+            if key in self.memo:
+                return self.memo[key]
+            k = split[i][j]
+            left, right = product(i, k), product(k + 1, j)
+            if dot and i == 0:
+                # left is a row vector, stored as a Vector
+                result = left * right if j == last else right.T * left
+            else:
+                result = left * right
+            self.memo[key] = result
+            return result
+
+        return product(0, last)
+
+    def _combine(self, node: Expression) -> "Matrix | Vector":
+        terms = [(c, n) for c, n in node.terms().values() if c != 0]
+        rows, cols = node.shape
+        if not terms:
+            # Everything cancelled
+            return Matrix((rows, cols)) if node.kind == "matrix" else Vector([0] * rows)
+        values = [self.evaluate(n) for _, n in terms]
+        backend = values[0]._backend
+        if node.kind == "matrix":
+            buffers = [backend.asarray(v._buffer("F")) for v in values]
+        else:
+            buffers = [backend.asarray(v.items) for v in values]
+        # One pass over the elements for the whole sum
+        data = backend.linear_combination(buffers, [c for c, _ in terms])
+        if node.kind == "matrix":
+            return Matrix._from_buffer(data, rows, cols, "F", backend)
+        return Vector._from_buffer(data, backend)
+
+if __name__ == "__main__":
+    A = Matrix([Vector([1, 2]), Vector([3, 4])])
+    B = Matrix([Vector([0, 1]), Vector([1, 0])])
+    v = Vector([1, 1])
+
+    # Multiplied right to left, through the vector
+    expression = A.lazy() * B * A * v
+    assert expression.plan() == "(Matrix0 * (Matrix1 * (Matrix2 * Vector3)))"
+    assert expression.evaluate() == A * B * A * v
+
+    # One linear combination, with the two A terms merged
+    expression = A.lazy() + B - 2 * A.lazy()
+    assert len(expression.terms()) == 2
+    assert expression.evaluate() == B - A
+
+    # Dot products, whichever side the matrices are on
+    w = Vector([2, -1])
+    assert (v.lazy() * (A.lazy() * w)).evaluate() == v * (A * w)
+    assert ((A.lazy() * v) * w).evaluate() == (A * v) * w
+    assert ((A.lazy() * B * v) * (A.lazy() * w)).evaluate() == (A * B * v) * (A * w)
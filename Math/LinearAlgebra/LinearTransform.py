@@ -1,6 +1,9 @@
 
-from Vectors import Number, Vector
-from Matrix import Matrix
+from functools import lru_cache
+from typing import Any, Iterable, Iterator
+from .Vectors import Number, Vector
+from .Matrix import Matrix
+from .VectorArray import VectorArray
 
 # Linear transformation is when metrix is transformed linearly, i.e, after
 # transformation the lines of the plane remain evenly spaced and origin remains same
@@ -11,44 +14,163 @@ from Matrix import Matrix
 # L(V + W) = L(V) + L(W)    -- Additivity, 
 # L(cV) = cL(V)             -- Scalibility
 
+# Number of vectors packed into one matrix product by apply_batch
+DEFAULT_CHUNK_SIZE = 4096
+
+class LinearTransform:
+    """
+    A linear transformation L(x) = A x with its matrix A captured once.
+
+    Many vectors can be pushed through it with apply_batch(), which packs them
+    as the columns of one matrix per chunk, so a chunk costs a single matrix
+    product instead of one Python call per vector.
+    """
+
+    def __init__(self, matrix: Matrix) -> None:
+        self.matrix = matrix
+
+    @property
+    def input_dimension(self) -> int:
+        return self.matrix.cols
+
+    @property
+    def output_dimension(self) -> int:
+        return self.matrix.rows
+
+    def apply(self, vec: Vector) -> Vector:
+        # The number of columns in the matrix must be equal to the dimension of
+        # the input vector.
+        if vec.dimension != self.matrix.cols:
+            raise ValueError("Vector dimension does not match transformation matrix columns.")
+        return self.matrix * vec
+
+    def __call__(self, vec: Vector) -> Vector:
+        return self.apply(vec)
+
+    def apply_batch(self, vectors: "Iterable[Vector] | Any", chunk_size: int = DEFAULT_CHUNK_SIZE) -> "list[Vector] | Any":
+        """
+        Applies the transform to many vectors.
+
+        vectors can be a list or any iterator/generator of Vectors, in which case a
+        list of Vectors is returned, a VectorArray, which gives a VectorArray of
+        the results, or a packed 2-D buffer (anything supporting the buffer
+        protocol, e.g. array('d') or a memoryview of shape (N, d)) holding N
+        float64 vectors one after the other, in which case the results are returned
+        packed the same way in one flat buffer of the matrix's backend.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        if isinstance(vectors, (Vector, Matrix)):
+            raise TypeError("apply_batch expects a collection of vectors, use apply() for one Vector")
+        if isinstance(vectors, VectorArray):
+            if vectors.dimension != self.input_dimension:
+                raise ValueError("Vector dimension does not match transformation matrix columns.")
+            result = self._apply_packed(memoryview(vectors.data), chunk_size)
+            return VectorArray._from_buffer(result, len(vectors), self.output_dimension, self.matrix._backend)
+        try:
+            packed = memoryview(vectors)
+        except TypeError:
+            return [result for chunk in self._vector_chunks(vectors, chunk_size) for result in chunk]
+        return self._apply_packed(packed, chunk_size)
+
+    def _vector_chunks(self, vectors: Iterable[Vector], chunk_size: int) -> Iterator[list[Vector]]:
+        backend = self.matrix._backend
+        d, m = self.matrix.cols, self.matrix.rows
+        iterator = iter(vectors)
+        while True:
+            chunk: list[Vector] = []
+            for vec in iterator:
+                if vec.dimension != d:
+                    raise ValueError("Vector dimension does not match transformation matrix columns.")
+                chunk.append(vec)
+                if len(chunk) == chunk_size:
+                    break
+            if not chunk:
+                return
+
+            # The vectors become the columns of one (d x len(chunk)) matrix
+            data = backend.concat([vec.items for vec in chunk])
+            product = self.matrix * Matrix._from_buffer(data, d, len(chunk), "F", backend)
+            result = product._buffer("F")
+            yield [Vector._from_buffer(result[j * m:(j + 1) * m], backend) for j in range(len(chunk))]
+
+    def _apply_packed(self, packed: memoryview, chunk_size: int) -> Any:
+        backend = self.matrix._backend
+        d = self.matrix.cols
+        if packed.ndim == 2 and packed.shape[1] != d:
+            raise ValueError("Vector dimension does not match transformation matrix columns.")
+        if packed.format != "d":
+            # Reading other formats as raw float64 bytes would give garbage
+            raise TypeError(f"Packed vectors must be float64 (format 'd'), got format {packed.format!r}")
+        # A 2-D buffer is flattened through bytes, which needs no copy
+        flat = packed.cast("B").cast("d") if packed.ndim != 1 else packed
+        if len(flat) % d:
+            raise ValueError(f"Packed buffer length must be a multiple of the vector dimension ({d})")
+
+        # N vectors of dimension d stored one after the other are exactly the
+        # column-major buffer of a (d x N) matrix, so chunks need no re-packing
+        count = len(flat) // d
+        parts = []
+        for start in range(0, count, chunk_size):
+            size = min(chunk_size, count - start)
+            data = backend.asarray(flat[start * d:(start + size) * d])
+            product = self.matrix * Matrix._from_buffer(data, d, size, "F", backend)
+            parts.append(product._buffer("F"))
+        return backend.concat(parts)
+
+    def then(self, other: "LinearTransform") -> "LinearTransform":
+        """
+        Returns the transform that applies self first and other second.
+        Its matrix is precomputed, so applying it costs one multiply per vector.
+        """
+        if other.matrix.cols != self.matrix.rows:
+            raise ValueError("Transforms cannot be chained: output and input dimensions differ")
+        return LinearTransform(other.matrix * self.matrix)
+
+    @staticmethod
+    def compose(*transforms: "LinearTransform") -> "LinearTransform":
+        """
+        Precomputes a pipeline of transforms, applied in the given order:
+        compose(T1, T2, T3)(v) == T3(T2(T1(v)))
+        """
+        if not transforms:
+            raise ValueError("compose needs at least one transform")
+        result = transforms[0]
+        for transform in transforms[1:]:
+            result = result.then(transform)
+        return result
+
+# Represent the transformation matrix A by its columns:
+# A = [[1, 3],
+#      [2, 4]]
+# So, the first column is [1, 2]
+# And the second column is [3, 4]
+# Built on first use, so importing this module does not pick a backend
+@lru_cache(maxsize=None)
+def _example() -> LinearTransform:
+    return LinearTransform(Matrix([Vector([1, 2]), Vector([3, 4])]))
+
 def linear_fx(vec: Vector):
-    # Represent the transformation matrix A as a list of row vectors
-    # A = [[1, 2],
-    #      [3, 4]]
-    # So, a[0] is the first row [1, 2]
-    # And a[1] is the second row [3, 4]
-    a: Matrix = Matrix([Vector([1, 2]), Vector([3, 4])])
-
-    # Check for dimension compatibility:
-    # The number of columns in the matrix (dimension of each row vector in 'a')
-    # must be equal to the dimension of the input vector.
-    if vec.dimension != a.rows:
-        raise ValueError("Vector dimension does not match transformation matrix columns.")
-
-    result_items: list[Number] = []
-    print(a)
-    # Iterate through each row of the transformation matrix 'a'
-    for row_vector in a:
-        print(row_vector)
-        result_items.append(row_vector * vec)
-
-    result = Vector(result_items)
-    print(f"Output {result}")
-    return result
-
-v = Vector([1, 2])
-w = Vector([2, -1])
-c = 3
-
-# Additive
-s = v + w
-additiveLhs = linear_fx(s)
-additiveRhs = linear_fx(v) + linear_fx(w)
-additive = additiveLhs == additiveRhs
-print(f"lhs = {additiveLhs} rhs = {additiveRhs} additive? {additive}")
-
-# Scalable
-scalabilityLhs = linear_fx(c * v)
-scalabilityRhs = c * linear_fx(v)
-scalable = scalabilityLhs == scalabilityRhs
-print(f"lhs = {scalabilityLhs} rhs = {scalabilityRhs} scalable? {scalable}")
+    return _example().apply(vec)
+
+if __name__ == "__main__":
+    v = Vector([1, 2])
+    w = Vector([2, -1])
+    c = 3
+
+    # Additive
+    s = v + w
+    additiveLhs = linear_fx(s)
+    additiveRhs = linear_fx(v) + linear_fx(w)
+    additive = additiveLhs == additiveRhs
+    print(f"lhs = {additiveLhs} rhs = {additiveRhs} additive? {additive}")
+
+    # Scalable
+    scalabilityLhs = linear_fx(c * v)
+    scalabilityRhs = c * linear_fx(v)
+    scalable = scalabilityLhs == scalabilityRhs
+    print(f"lhs = {scalabilityLhs} rhs = {scalabilityRhs} scalable? {scalable}")
+
+    # Batches and composition
+    assert _example().apply_batch([v, w]) == [linear_fx(v), linear_fx(w)]
+    assert LinearTransform.compose(_example(), _example()).apply(v) == linear_fx(linear_fx(v))
@@ -1,10 +1,44 @@
-from typing import Iterator
-from Vectors import Number, Vector
+from math import inf, prod
+from typing import Any, Iterator, Sequence
+from .Backends import get_backend
+from .Vectors import Number, Vector
 
 # Matrix is how we represent the data
 # 
 # Transformation is a function that when applied on a vector returns another vector
 # after moving it in space.
+#
+# Storage: the elements live in one flat buffer owned by the active backend
+# (see Backends.py) instead of a list of column Vectors. `_order` says how the
+# buffer is laid out:
+#   "F" - column-major, element (r, c) is at r + c * rows (the default, because a
+#         Matrix is built from its columns)
+#   "C" - row-major, element (r, c) is at r * cols + c
+# A column-major buffer of an (r x c) matrix is byte-for-byte the row-major buffer
+# of its (c x r) transpose, which is what makes transpose() and the matmul kernel cheap.
+#
+# Views: m.T, m.row(i), m.col(j) and m[r0:r1, c0:c1] share m's buffer instead of
+# copying it, so they cost O(1) and writes through them change m. Element (r, c)
+# is at offset + r * row_stride + c * col_stride. A view whose elements form one
+# contiguous run (a transpose, whole columns of a column-major matrix, whole rows
+# of a row-major one) is an ordinary "F" or "C" matrix over a slice of the buffer.
+# Any other block has order "S" (strided) and keeps the whole parent buffer; its
+# elements are gathered into a contiguous copy only when an operation needs one
+# (see _buffer), and results written into it (out=, +=, axpy) are scattered back.
+# row() and col() return Vectors over a strided slice of the buffer.
+#
+# Writes through views reset the cached LU factorization of every matrix sharing
+# the buffer: they all share one version counter, which the row() and col()
+# Vectors hold too and bump from their in-place operations (+=, out=, axpy).
+# Only raw writes to a buffer (v.items[i] = x) go unnoticed.
+
+def _power(x: float, k: int) -> float:
+    # Float ** raises OverflowError where float multiplication gives inf, which
+    # is what the general path of Matrix.__pow__ returns
+    try:
+        return x ** k
+    except OverflowError:
+        return -inf if x < 0 and k % 2 else inf
 
 class Matrix:
     def __init__(self, columns: list[Vector] | tuple[int, int]) -> None:
@@ -12,17 +46,110 @@ class Matrix:
             rows, cols = columns
             if rows < 1 or cols < 1:
                 raise ValueError("Matrix dimensions must be positive numbers")
-            self.value = [Vector([0.0] * rows) for _ in range(cols)]
+            self._backend = get_backend()
+            self._data = self._backend.zeros(rows * cols)
             self._rows = rows
             self._cols = cols
         else:
             if len(columns) > 0 and any(x.dimension != columns[0].dimension for x in columns):
                 raise ValueError("Matrix cannot have different sized vectors")
             
-            self.value = columns
+            self._backend = get_backend()
+            self._data = self._backend.concat([col.items for col in columns])
             self._rows = columns[0].dimension if len(columns) > 0 else 0
             self._cols = len(columns)
+        self._set_layout("F")
+        self._version = [0]
+        self._lu_factors = None
+
+    @classmethod
+    def _from_buffer(cls, data: Any, rows: int, cols: int, order: str = "F", backend: Any = None) -> "Matrix":
+        """
+        Wraps an existing flat buffer of backend without copying or validating it.
+        """
+        matrix = cls.__new__(cls)
+        matrix._backend = backend or get_backend()
+        matrix._data = data
+        matrix._rows = rows
+        matrix._cols = cols
+        matrix._set_layout(order)
+        matrix._version = [0]
+        matrix._lu_factors = None
+        return matrix
+
+    def _set_layout(self, order: str) -> None:
+        self._order = order
+        self._offset = 0
+        if order == "F":
+            self._row_stride, self._col_stride = 1, self._rows
+        else:
+            self._row_stride, self._col_stride = self._cols, 1
+
+    def _view(self, offset: int, rows: int, cols: int, row_stride: int, col_stride: int) -> "Matrix":
+        """
+        A (rows x cols) matrix over this matrix's buffer, with element (r, c) at
+        offset + r * row_stride + c * col_stride of it.
+        """
+        size = rows * cols
+        if (rows == 1 or row_stride == 1) and (cols == 1 or col_stride == rows):
+            order = "F"
+        elif (cols == 1 or col_stride == 1) and (rows == 1 or row_stride == cols):
+            order = "C"
+        else:
+            order = "S"
+        if order == "S":
+            view = Matrix._from_buffer(self._data, rows, cols, "F", self._backend)
+            view._order = "S"
+            view._offset = offset
+            view._row_stride, view._col_stride = row_stride, col_stride
+        elif offset == 0 and size == len(self._data):
+            view = Matrix._from_buffer(self._data, rows, cols, order, self._backend)
+        else:
+            view = Matrix._from_buffer(self._backend.view(self._data, offset, offset + size), rows, cols, order, self._backend)
+        view._version = self._version
+        return view
+
+    def _changed(self) -> None:
+        # The buffer is about to change, so no cached factorization of a matrix
+        # sharing it describes it any more
+        self._version[0] += 1
+
+    @property
+    def _layout(self) -> str:
+        """
+        The order of this matrix's own contiguous results: its order, or "F" for a strided view.
+        """
+        return "F" if self._order == "S" else self._order
+
+    def _store(self, data: Any, order: str) -> None:
+        """
+        Writes a full buffer of elements in the given order into a strided view.
+        """
+        if order == "F":
+            self._backend.scatter(self._data, self._offset, self.cols, self.rows, self._col_stride, self._row_stride, data)
+        else:
+            self._backend.scatter(self._data, self._offset, self.rows, self.cols, self._row_stride, self._col_stride, data)
         
+    def save(self, path: Any) -> None:
+        """
+        Writes the matrix to path in a binary format (see Storage.py).
+        """
+        # Imported here because Storage imports Matrix
+        from .Storage import save
+        save(self, path)
+
+    @classmethod
+    def load(cls, path: Any, mmap: bool = False, mode: str = "r") -> "Matrix":
+        """
+        Reads a matrix written by save(). With mmap=True the file is memory-mapped
+        and used in place without copying; mode is "r", "r+" or "c" (copy-on-write).
+        """
+        from .Storage import load
+        result = load(path, mmap, mode)
+        if not isinstance(result, Matrix):
+            raise ValueError(f"{path} does not hold a Matrix")
+        return result
+
     @property
     def rows(self):
         return self._rows
@@ -30,39 +157,150 @@ class Matrix:
     @property
     def cols(self):
         return self._cols
+
+    @property
+    def value(self) -> list[Vector]:
+        """
+        Returns the columns of the matrix as Vector objects.
+        These are copies, so changing them does not change the matrix.
+        """
+        data = self._buffer("F")
+        return [Vector(data[c * self.rows:(c + 1) * self.rows]) for c in range(self.cols)]
     
     @staticmethod
     def identity(size: int):
         """
         Returns the identity matrix of size
         """
-        return Matrix([Vector([1 if x == y else 0 for y in range(size)]) for x in range(size)])
+        backend = get_backend()
+        return Matrix._from_buffer(backend.identity(size), size, size, "F", backend)
     
     def __len__(self)-> int:
         return self.rows
+
+    def _index(self, rowIdx: int, colIdx: int) -> int:
+        return self._offset + rowIdx * self._row_stride + colIdx * self._col_stride
+
+    def _buffer(self, order: str) -> Any:
+        """
+        Returns the elements laid out in the requested order ("F" or "C").
+        The internal buffer is returned as is when it already has that layout,
+        otherwise a re-ordered copy is made.
+        """
+        if order == self._order:
+            return self._data
+        if self._order == "S":
+            if order == "F":
+                return self._backend.gather(self._data, self._offset, self.cols, self.rows, self._col_stride, self._row_stride)
+            return self._backend.gather(self._data, self._offset, self.rows, self.cols, self._row_stride, self._col_stride)
+        if self._order == "F":
+            return self._backend.transpose_layout(self._data, self.cols, self.rows)
+        return self._backend.transpose_layout(self._data, self.rows, self.cols)
+
+    def _operand(self, other: "Matrix", order: str) -> Any:
+        """
+        Returns the buffer of other in the requested order as a buffer of this
+        matrix's backend.
+        """
+        return self._backend.asarray(other._buffer(order))
+
+    def _wrap(self, data: Any, rows: int, cols: int, order: str = "F") -> "Matrix":
+        return Matrix._from_buffer(data, rows, cols, order, self._backend)
     
-    # addition
-    def __add__(self, other: "Matrix") -> "Matrix":
+    def _target(self, out: "Matrix | None") -> tuple[Any, str]:
+        """
+        Returns (buffer to write into or None, layout of the result) for an
+        elementwise result of self's shape, checking that out can hold it.
+        """
+        if out is None:
+            return None, self._layout
+        if out.rows != self.rows or out.cols != self.cols:
+            raise ValueError(f"out must be a ({self.rows}x{self.cols}) matrix")
+        if out._backend is not self._backend:
+            raise ValueError("out must use the same backend as the operands")
+        out._changed()
+        if out._order == "S":
+            # Computed into a new buffer, then scattered into the view by _result
+            return None, "F"
+        return out._data, out._order
+
+    def _result(self, data: Any, out: "Matrix | None", order: str) -> "Matrix":
+        if out is None:
+            return self._wrap(data, self.rows, self.cols, order)
+        if out._order == "S":
+            out._store(data, order)
+        return out
+
+    # Elementwise arithmetic with an optional out Matrix. Passing out (which may be
+    # self or the other operand) writes the result into its existing buffer, in its
+    # layout, instead of creating a new Matrix.
+    def add(self, other: "Matrix", out: "Matrix | None" = None) -> "Matrix":
         if self.rows != other.rows or self.cols != other.cols:
             raise ValueError("Matrices must have the same dimensions for addition")
-        
-        result: list[Vector] = []
-        for c_idx in range(self.cols):
-            addedValue = self.value[c_idx] + other.value[c_idx]
-            result.append(addedValue)
-            
-        return Matrix(result)
+        target, order = self._target(out)
+        result = self._backend.add(self._buffer(order), self._operand(other, order), target)
+        return self._result(result, out, order)
+
+    def sub(self, other: "Matrix", out: "Matrix | None" = None) -> "Matrix":
+        if self.rows != other.rows or self.cols != other.cols:
+            raise ValueError("Matrices must have the same dimensions for addition")
+        target, order = self._target(out)
+        result = self._backend.sub(self._buffer(order), self._operand(other, order), target)
+        return self._result(result, out, order)
+
+    def scale(self, scalar: Number, out: "Matrix | None" = None) -> "Matrix":
+        target, order = self._target(out)
+        return self._result(self._backend.scale(self._buffer(order), scalar, target), out, order)
+
+    def divide(self, scalar: Number, out: "Matrix | None" = None) -> "Matrix":
+        if scalar == 0:
+            raise ValueError("Division by zero is not allowed")
+        target, order = self._target(out)
+        return self._result(self._backend.divide(self._buffer(order), scalar, target), out, order)
+
+    def axpy(self, alpha: Number, x: "Matrix") -> "Matrix":
+        """
+        self += alpha * x in place, without building alpha * x. Returns self.
+        """
+        if self.rows != x.rows or self.cols != x.cols:
+            raise ValueError("Matrices must have the same dimensions for addition")
+        self._changed()
+        if self._order == "S":
+            data = self._buffer("F")
+            self._backend.axpy(alpha, self._operand(x, "F"), data)
+            self._store(data, "F")
+        else:
+            self._backend.axpy(alpha, self._operand(x, self._order), self._data)
+        return self
+
+    # addition
+    def __add__(self, other: "Matrix") -> "Matrix":
+        if not isinstance(other, Matrix):
+            # e.g. a lazy Expression (see Lazy.py)
+            return NotImplemented
+        return self.add(other)
     
     # subtraction
     def __sub__(self, other: "Matrix") -> "Matrix":
-        if self.rows != other.rows or self.cols != other.cols:
-            raise ValueError("Matrices must have the same dimensions for addition")
-        
-        result: list[Vector] = []
-        for c_idx in range(self.cols):
-            value = self.value[c_idx] - other.value[c_idx]
-            result.append(value)
-        return Matrix(result)
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return self.sub(other)
+
+    # In-place operators update this Matrix's buffer instead of creating a new one
+    def __iadd__(self, other: "Matrix") -> "Matrix":
+        return self.add(other, out=self)
+
+    def __isub__(self, other: "Matrix") -> "Matrix":
+        return self.sub(other, out=self)
+
+    def __imul__(self, other: Number) -> "Matrix":
+        if isinstance(other, (Matrix, Vector)):
+            # A *= B keeps meaning A = A * B, the matrix product
+            return NotImplemented
+        return self.scale(other, out=self)
+
+    def __itruediv__(self, scalar: Number) -> "Matrix":
+        return self.divide(scalar, out=self)
     
     # Vector or matrix multiplication
     def __mul__(self, other: "Matrix | Vector") -> "Matrix | Vector":
@@ -72,16 +310,16 @@ class Matrix:
                     f"Matrix dimensions incompatible for multiplication: "
                     f"({self.rows}x{self.cols}) * ({other.rows}x{other.cols})"
                 )
-                
-            result_columns: list[Vector] = []
-            for col_vector in other.value:
-                vec_col_list: list[Number] = []
-                
-                for row_vector in self:
-                    vec_col_list.append(row_vector * col_vector)
-                    
-                result_columns.append(Vector(vec_col_list))
-            return Matrix(result_columns)
+            
+            # Rows of self and columns of other both need to be contiguous
+            result = self._backend.matmul(
+                self._buffer("C"), self._operand(other, "F"), self.rows, self.cols, other.cols
+            )
+            return self._wrap(result, self.rows, other.cols)
+
+        if not isinstance(other, Vector):
+            # Let the other operand (e.g. a SparseMatrix) handle the product
+            return NotImplemented
 
         if self.cols != other.dimension:
             raise ValueError(
@@ -89,20 +327,96 @@ class Matrix:
                 f"Matrix cols ({self.cols}) != Vector dimension ({other.dimension})"
             )
             
-        result: list[Number] = []        
-        for row_vector in self:
-            result.append(row_vector * other)
-            
-        return Vector(result)
+        result = self._backend.matvec(
+            self._buffer("C"), self._backend.asarray(other.items), self.rows, self.cols
+        )
+        return Vector._from_buffer(result, self._backend)
+
+    def lazy(self) -> Any:
+        """
+        This matrix as a lazy Expression, whose operators build an expression
+        that is optimised and computed by evaluate() (see Lazy.py).
+        """
+        # Imported here because Lazy imports Matrix
+        from .Lazy import Expression
+        return Expression._leaf(self)
+
+    def matmul(self, other: "Matrix | Vector", workers: int | None = None, executor: Any = None) -> "Matrix | Vector":
+        """
+        self * other, optionally split across worker processes (see Parallel.py).
+        Pass workers to run on a temporary pool of that size, or a ParallelExecutor
+        to reuse its pool across products.
+        """
+        if isinstance(other, Vector) or (executor is None and (workers is None or workers <= 1)):
+            return self * other
+        if executor is not None:
+            return executor.matmul(self, other)
+        # Imported here so that importing Matrix does not load multiprocessing
+        from .Parallel import ParallelExecutor
+        with ParallelExecutor(workers) as pool:
+            return pool.matmul(self, other)
+
+    def _diagonal(self) -> Any:
+        """
+        The diagonal of a square matrix if every other element is 0, else None.
+        Checked a column at a time, stopping at the first nonzero element,
+        without building an n x n matrix to compare against.
+        """
+        n = self.rows
+        data = self._buffer("F")
+        for c in range(n):
+            start = c * n
+            if any(data[start:start + c]) or any(data[start + c + 1:start + n]):
+                return None
+        return self._backend.array(data[::n + 1])
+
+    # Matrix power
+    def __pow__(self, k: int) -> "Matrix":
+        """
+        self ** k for an integer k, by repeated squaring: O(log k) products
+        instead of k - 1. A negative k raises the inverse to -k.
+        """
+        if not isinstance(k, int):
+            return NotImplemented
+        if self.rows != self.cols:
+            raise ValueError("Matrix must be square to be raised to a power")
+        if k < 0:
+            return self.inverse() ** -k
+        n = self.rows
+        if k == 0:
+            return Matrix.identity(n)
+
+        # A diagonal matrix (the identity included) is raised elementwise: n
+        # powers instead of O(log k) products
+        diagonal = self._diagonal()
+        if diagonal is not None:
+            result = self._backend.zeros(n * n)
+            if any(d != 1 for d in diagonal):
+                # float() so that numpy scalars overflow like Python floats
+                result[::n + 1] = self._backend.array([_power(float(d), k) for d in diagonal])
+            else:
+                result[::n + 1] = diagonal
+            return self._wrap(result, n, n)
+
+        # Binary powering: walk the bits of k from the lowest, multiplying the
+        # result by self^(2^i) for every set bit i
+        result = None
+        base = self
+        while True:
+            if k & 1:
+                result = base.copy() if result is None else result * base
+            k >>= 1
+            if not k:
+                return result
+            base = base * base
 
-    
     # Scalar multiplication or scaling transformation
     def __rmul__(self, other: Number) -> "Matrix":
-        return Matrix([other * col for col in self.value ])
+        return self.scale(other)
     
     # Scalar division
     def __truediv__(self, scalar: Number) -> "Matrix":
-        return Matrix([ col / scalar for col in self.value ])
+        return self.divide(scalar)
     
     # Equality
     def __eq__(self, other: object) -> bool:
@@ -110,7 +424,7 @@ class Matrix:
             isinstance(other, Matrix) and 
             self.rows == other.rows and 
             self.cols == other.cols and 
-            self.value == other.value
+            self._backend.equal(self._buffer(self._layout), self._operand(other, self._layout))
         )
 
     
@@ -124,13 +438,11 @@ class Matrix:
 
         # Create a list of lists where each inner list is a row
         # This makes it easier to print row by row
-        rows_data: list[list[str]] = []
-        for r_idx in range(self.rows):
-            current_row: list[str] = []
-            for c_idx in range(self.cols):
-                # Assuming Vector objects have a 'value' attribute which is a list of numbers
-                current_row.append(str(self.value[c_idx].items[r_idx]))
-            rows_data.append(current_row)
+        data = self._backend.tolist(self._buffer("C"))
+        rows_data: list[list[str]] = [
+            [str(x) for x in data[r_idx * self.cols:(r_idx + 1) * self.cols]]
+            for r_idx in range(self.rows)
+        ]
 
         # Determine the maximum width needed for each column to align them
         column_widths = [0] * self.cols
@@ -159,38 +471,113 @@ class Matrix:
         return self.rows == self.cols
 
     def copy(self) -> "Matrix":
-        return Matrix([Vector(col.items[:]) for col in self.value])
+        """
+        A matrix with its own contiguous buffer, also for a view.
+        """
+        if self._order == "S":
+            # Gathering the elements already copies them
+            return self._wrap(self._buffer("F"), self.rows, self.cols, "F")
+        return self._wrap(self._backend.array(self._data), self.rows, self.cols, self._order)
 
-    
-    def __getitem__(self, index: tuple[int, int]) -> Number:
-        rowIdx, colIdx = index
-        if rowIdx < 0 or rowIdx >= self.rows or colIdx < 0 or colIdx >= self.cols:
+    @property
+    def is_view(self) -> bool:
+        """
+        True for a strided view, whose elements are not one contiguous run.
+        """
+        return self._order == "S"
+
+    @staticmethod
+    def _range(index: int | slice, size: int) -> tuple[int, int, int]:
+        """
+        (start, count, step) of a row or column index or slice.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(size)
+            if step < 1:
+                raise ValueError("Matrix slices must have a positive step")
+            count = len(range(start, stop, step))
+            if count == 0:
+                raise ValueError("Matrix slices must not be empty")
+            return start, count, step
+        if index < 0 or index >= size:
             raise IndexError("Index out of bounds for the matrix")
-        return self.value[colIdx].items[rowIdx]
-    
-    def __setitem__(self, index: tuple[int, int], value: Number) -> None:
+        return index, 1, 1
+
+    def __getitem__(self, index: tuple[int | slice, int | slice]) -> "Number | Matrix | Vector":
+        """
+        m[r, c] is an element. With slices the result is a view sharing m's
+        buffer: m[r0:r1, c0:c1] a Matrix, m[r, c0:c1] and m[r0:r1, c] a Vector.
+        """
         rowIdx, colIdx = index
+        if not isinstance(rowIdx, slice) and not isinstance(colIdx, slice):
+            if rowIdx < 0 or rowIdx >= self.rows or colIdx < 0 or colIdx >= self.cols:
+                raise IndexError("Index out of bounds for the matrix")
+            return self._data[self._index(rowIdx, colIdx)]
+
+        r0, rows, r_step = self._range(rowIdx, self.rows)
+        c0, cols, c_step = self._range(colIdx, self.cols)
+        offset = self._index(r0, c0)
+        if isinstance(rowIdx, slice) and isinstance(colIdx, slice):
+            return self._view(offset, rows, cols, self._row_stride * r_step, self._col_stride * c_step)
+        # One row or one column of the block, as a Vector
+        count, stride = (cols, self._col_stride * c_step) if isinstance(colIdx, slice) else (rows, self._row_stride * r_step)
+        data = self._backend.view(self._data, offset, offset + (count - 1) * stride + 1, stride)
+        return Vector._from_buffer(data, self._backend, self._version)
+
+    def __setitem__(self, index: tuple[int | slice, int | slice], value: "Number | Matrix") -> None:
+        """
+        m[r, c] = x sets an element, m[r0:r1, c0:c1] = other copies a matrix of
+        the same shape into the block.
+        """
+        rowIdx, colIdx = index
+        if isinstance(rowIdx, slice) or isinstance(colIdx, slice):
+            block = self[rowIdx, colIdx]
+            if not isinstance(block, Matrix) or not isinstance(value, Matrix):
+                raise TypeError("Only a Matrix can be assigned to a block m[r0:r1, c0:c1]")
+            if value.rows != block.rows or value.cols != block.cols:
+                raise ValueError(f"Expected a ({block.rows}x{block.cols}) matrix")
+            block._changed()
+            if block._order == "S":
+                block._store(self._backend.asarray(value._buffer("F")), "F")
+            else:
+                block._data[:] = self._operand(value, block._order)
+            return
         if rowIdx < 0 or rowIdx >= self.rows or colIdx < 0 or colIdx >= self.cols:
             raise IndexError("Index out of bounds for the matrix")
-        self.value[colIdx].items[rowIdx] = value
-    
+        self._data[self._index(rowIdx, colIdx)] = value
+        self._changed()
+
+    @property
+    def T(self) -> "Matrix":
+        """
+        The transpose as a view sharing this matrix's buffer (use transpose() for a copy).
+        """
+        return self._view(self._offset, self.cols, self.rows, self._col_stride, self._row_stride)
+
+    def row(self, i: int) -> Vector:
+        """
+        Row i as a Vector view of the buffer.
+        """
+        return self[i, :]
+
+    def col(self, j: int) -> Vector:
+        """
+        Column j as a Vector view of the buffer.
+        """
+        return self[:, j]
+
     def transpose(self) -> "Matrix":
-        # Swapped cols and rows for transpose
-        result: Matrix = Matrix((self.cols, self.rows))
-        for r_idx in range(self.rows):
-            for c_idx in range(self.cols):
-                result[c_idx, r_idx] = self[r_idx, c_idx]
-        return result
+        # The buffer of a column-major matrix read as row-major is its transpose,
+        # so .T only flips the layout flag and copy() copies the elements as one block
+        return self.T.copy()
     
     def rows_iter(self) -> Iterator['Vector']:
         """
         Yields each row of the matrix as a Vector object.
         """
+        data = self._buffer("C")
         for r_idx in range(self.rows): # Iterate through each row index
-            current_row_items: list[Number] = []
-            for c_idx in range(self.cols): # For each row, iterate through columns to build the row Vector
-                current_row_items.append(self[r_idx, c_idx])
-            yield Vector(current_row_items) # Yield a new Vector object for the current row
+            yield Vector(data[r_idx * self.cols:(r_idx + 1) * self.cols]) # Yield a new Vector object for the current row
 
     # Make the Matrix object itself iterable, yielding its rows
     def __iter__(self) -> Iterator['Vector']:
@@ -200,26 +587,100 @@ class Matrix:
         """
         return self.rows_iter()
     
+    def _lu_factorization(self) -> tuple[Any, int]:
+        """
+        Returns the LU decomposition with partial pivoting (PA = LU) of the matrix
+        and the sign of the permutation P.
+        It is computed once in O(n^3) and cached until the matrix is changed, so det(),
+        inverse() and solve() on the same matrix only pay for the substitutions.
+        """
+        version = self._version[0]
+        if self._lu_factors is None or self._lu_factors[0] != version:
+            self._lu_factors = (version, self._backend.lu_factor(self._buffer("C"), self.rows))
+        return self._lu_factors[1]
+
+    def _nonsingular_factorization(self) -> Any:
+        factor, _ = self._lu_factorization()
+        if any(x == 0 for x in self._backend.lu_diagonal(factor)):
+            raise ValueError("Matrix is singular")
+        return factor
+
     # Determinant
     def det(self) -> Number:
-        
-        raise NotImplementedError("Determinant calculation not yet implemented.")
+        if self.rows != self.cols:
+            raise ValueError("Matrix must be square to have a determinant")
+        # det(A) = det(P) * det(L) * det(U), where det(P) is +-1, L has a unit
+        # diagonal and U is triangular, so only the diagonal of U is multiplied
+        factor, sign = self._lu_factorization()
+        return sign * prod(self._backend.lu_diagonal(factor))
     
     def inverse(self) -> "Matrix":
         # For now, don't consider non-square matrices as they require full rank
         # and other edge cases to be handled
         if self.rows != self.cols:
             raise ValueError("Matrix must be square to have an inverse")
-        raise NotImplementedError("Inverse calculation not yet implemented.")
+        # The columns of the inverse are the solutions of A x = e_i
+        factor = self._nonsingular_factorization()
+        identity = self._backend.identity(self.rows)
+        return self._wrap(self._backend.lu_solve(factor, identity, self.rows, self.rows), self.rows, self.cols)
+
+    def solve(self, b: "Vector | Sequence[Vector]") -> "Vector | list[Vector]":
+        """
+        Solves A x = b for x.
+        b can be a single Vector, or a sequence of Vectors to solve for many
+        right-hand sides in one call (returning a list of solutions).
+        """
+        if self.rows != self.cols:
+            raise ValueError("Matrix must be square to solve a linear system")
+        single = isinstance(b, Vector)
+        right_sides: list[Vector] = [b] if single else list(b)
+        if any(v.dimension != self.rows for v in right_sides):
+            raise ValueError(
+                f"Vector dimension must match the matrix rows ({self.rows}) to solve"
+            )
+
+        factor = self._nonsingular_factorization()
+        n = self.rows
+        data = self._backend.concat([v.items for v in right_sides])
+        solution = self._backend.lu_solve(factor, data, n, len(right_sides))
+        results = [Vector._from_buffer(solution[j * n:(j + 1) * n], self._backend) for j in range(len(right_sides))]
+        return results[0] if single else results
+
+if __name__ == "__main__":
+    # Addition
+    A = Matrix([Vector([1, 2]), Vector([3, 4])])
+    B = Matrix([Vector([5, 6]), Vector([7, 8])])
+    assert A + B == Matrix([Vector([6, 8]), Vector([10, 12])])
+
+    # Transpose
+    assert A.transpose() == Matrix([Vector([1, 3]), Vector([2, 4])])
+    assert A.T == A.transpose()
+
+    # Views share the buffer
+    M = Matrix([Vector([1, 2, 3]), Vector([4, 5, 6]), Vector([7, 8, 9])])
+    assert M[0:2, 1:3] == Matrix([Vector([4, 5]), Vector([7, 8])])
+    assert M.row(1) == Vector([2, 5, 8]) and M.col(2) == Vector([7, 8, 9])
+    M.T[0:2, 1:3] *= 10
+    assert M.row(1) == Vector([20, 50, 8])
+
+    # Identity
+    I = Matrix.identity(2)
+    assert I * Vector([3, 4]) == Vector([3, 4])
 
-# Addition
-A = Matrix([Vector([1, 2]), Vector([3, 4])])
-B = Matrix([Vector([5, 6]), Vector([7, 8])])
-assert A + B == Matrix([Vector([6, 8]), Vector([10, 12])])
+    # Powers
+    assert A ** 3 == A * A * A
+    assert A ** 0 == I and I ** 5 == I
+    assert Matrix([Vector([2, 0]), Vector([0, 3])]) ** 3 == Matrix([Vector([8, 0]), Vector([0, 27])])
+    assert (Matrix([Vector([2, 0]), Vector([0, -3])]) ** 2001)[1, 1] == -inf
 
-# Transpose
-assert A.transpose() == Matrix([Vector([1, 3]), Vector([2, 4])])
+    # Determinant, inverse and solve
+    assert A.det() == -2
+    assert A * A.inverse() == I
+    assert A * A.solve(Vector([5, 6])) == Vector([5, 6])
 
-# Identity
-I = Matrix.identity(2)
-assert I * Vector([3, 4]) == Vector([3, 4])
+    # Writes through a column view invalidate the cached factorization
+    C = A.copy()
+    assert C.det() == -2
+    column = C.col(0)
+    column += Vector([10, 0])
+    assert C.det() == C.copy().det() == 38
@@ -0,0 +1,141 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+from .Backends import get_backend
+from .Matrix import Matrix
+
+# Parallel matrix multiplication on a pool of worker processes.
+#
+# The interpreter runs one thread of Python at a time, so the pure Python kernels
+# only use more than one core from separate processes. The product is split into
+# blocks of output columns (or rows), one block per worker:
+#
+#   A * [B1 B2 B3] = [A*B1 A*B2 A*B3]
+#
+# The operands and the result live in shared memory segments, so instead of
+# pickling the matrices into every task the workers only receive the segment
+# names and copy the part they need straight out of shared memory.
+#
+# Example:
+#   with ParallelExecutor(workers=8) as pool:
+#       C = pool.matmul(A, B)      # or A.matmul(B, executor=pool)
+
+def _segment(data: Any) -> SharedMemory:
+    """
+    Returns a new shared memory segment holding a copy of a float64 buffer.
+    """
+    raw = memoryview(data).cast("B")
+    segment = SharedMemory(create=True, size=max(raw.nbytes, 1))
+    segment.buf[:raw.nbytes] = raw
+    raw.release()
+    return segment
+
+def _read(backend: Any, segment: SharedMemory, start: int, stop: int) -> Any:
+    """
+    Copies the float64 elements start:stop of segment into a buffer of backend.
+    The copy means nothing refers to the segment once this returns, so it can be closed.
+    """
+    view = segment.buf.cast("d")
+    try:
+        return backend.concat([view[start:stop]])
+    finally:
+        view.release()
+
+def _multiply_block(task: tuple) -> None:
+    """
+    Worker: multiplies the row-major (p_rows x k) operand P by columns lo:hi of the
+    column-major (k x q_cols) operand Q, and writes the column-major result into
+    the same columns of the output segment.
+    """
+    backend_name, p_name, q_name, out_name, p_rows, k, lo, hi = task
+    backend = get_backend(backend_name)
+    segments = [SharedMemory(name=name) for name in (p_name, q_name, out_name)]
+    try:
+        p = _read(backend, segments[0], 0, p_rows * k)
+        q = _read(backend, segments[1], lo * k, hi * k)
+        block = backend.matmul(p, q, p_rows, k, hi - lo)
+        out = segments[2].buf.cast("d")
+        out[lo * p_rows:hi * p_rows] = memoryview(block)
+        out.release()
+    finally:
+        for segment in segments:
+            segment.close()
+
+def _blocks(size: int, count: int) -> list[tuple[int, int]]:
+    """
+    Splits range(size) into count nearly equal (lo, hi) ranges.
+    """
+    count = max(1, min(count, size))
+    bounds = [size * i // count for i in range(count + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+class ParallelExecutor:
+    """
+    A reusable pool of worker processes for large matrix products.
+
+    Starting processes costs far more than a small product, so keep one executor
+    for many products, preferably as a context manager that shuts the pool down.
+    """
+    def __init__(self, workers: int | None = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError("workers must be a positive number")
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "ParallelExecutor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def matmul(self, a: Matrix, b: Matrix) -> Matrix:
+        """
+        Returns a * b computed by the workers. It equals the serial product up
+        to rounding: a BLAS backend may sum a block in a different order than
+        the whole product, so results can differ in the last bits.
+        """
+        if a.cols != b.rows:
+            raise ValueError(
+                f"Matrix dimensions incompatible for multiplication: "
+                f"({a.rows}x{a.cols}) * ({b.rows}x{b.cols})"
+            )
+        m, k, n = a.rows, a.cols, b.cols
+        if self.workers == 1:
+            return a * b
+
+        backend = a._backend
+        a_rows = a._buffer("C")
+        b_cols = a._operand(b, "F")
+        # Split the longer side of the output. Columns of a column-major product
+        # are contiguous, and so are the rows of a row-major one, which is the
+        # column-major product B^T A^T with the operands swapped.
+        if n >= m:
+            p, q, p_rows, q_cols, order = a_rows, b_cols, m, n, "F"
+        else:
+            p, q, p_rows, q_cols, order = b_cols, a_rows, n, m, "C"
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        segments = [_segment(p), _segment(q), SharedMemory(create=True, size=8 * m * n)]
+        try:
+            names = [segment.name for segment in segments]
+            tasks = [
+                (backend.name, *names, p_rows, k, lo, hi)
+                for lo, hi in _blocks(q_cols, self.workers)
+            ]
+            # list() waits for every block and re-raises the first worker error
+            list(self._pool.map(_multiply_block, tasks))
+            result = _read(backend, segments[2], 0, m * n)
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+        return a._wrap(result, m, n, order)
@@ -0,0 +1,333 @@
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from operator import add, mul
+from typing import Iterable, Sequence
+from .Backends import get_backend
+from .Matrix import Matrix
+from .Vectors import Number, Vector
+
+try:
+    from math import sumprod as _dot
+except ImportError:  # Python < 3.12
+    def _dot(x, y) -> float:
+        return sum(map(mul, x, y))
+
+# A sparse matrix only stores its nonzero entries, in one of two compressed layouts:
+#
+# CSR (compressed sparse row) - the entries are grouped by row:
+#   values[k]  - the k-th stored number
+#   indices[k] - its column
+#   indptr[r]:indptr[r + 1] - the range of k that belongs to row r
+#
+# CSC (compressed sparse column) - the same, grouped by column with `indices`
+# holding row numbers.
+#
+# Every product below walks the stored entries only, so it costs O(nnz) plus the
+# size of the output instead of O(rows * cols).
+#
+# A CSR matrix read as CSC is its transpose, so transpose() just swaps the
+# shape and the layout name.
+
+_FORMATS = ("csr", "csc")
+
+def _compress(n_major: int, major: Sequence[int], minor: Sequence[int], values: Sequence[Number]) -> tuple[array, array, array]:
+    """
+    Builds (indptr, indices, values) from COO triples grouped by `major`.
+    Duplicate entries are summed and zeros are dropped.
+    """
+    indptr = array("q", bytes(8 * (n_major + 1)))
+    indices = array("q")
+    data = array("d")
+    previous = None
+    for m, n, v in sorted(zip(major, minor, values)):
+        if (m, n) == previous:
+            data[-1] += v
+            continue
+        indices.append(n)
+        data.append(v)
+        indptr[m + 1] += 1
+        previous = (m, n)
+
+    # Turn the per-row counts into offsets
+    for m in range(n_major):
+        indptr[m + 1] += indptr[m]
+    return _drop_zeros(n_major, indptr, indices, data)
+
+def _drop_zeros(n_major: int, indptr: array, indices: array, values: array) -> tuple[array, array, array]:
+    if all(values):
+        return indptr, indices, values
+    new_indptr = array("q", [0])
+    new_indices = array("q")
+    new_values = array("d")
+    for m in range(n_major):
+        for k in range(indptr[m], indptr[m + 1]):
+            if values[k]:
+                new_indices.append(indices[k])
+                new_values.append(values[k])
+        new_indptr.append(len(new_values))
+    return new_indptr, new_indices, new_values
+
+def _swap_layout(n_major: int, n_minor: int, indptr: array, indices: array, values: array) -> tuple[array, array, array]:
+    """
+    Converts between CSR and CSC in O(nnz + n_minor) with a counting sort on the
+    minor index. Entries stay sorted within each new group.
+    """
+    counts = array("q", bytes(8 * (n_minor + 1)))
+    for n in indices:
+        counts[n + 1] += 1
+    for n in range(n_minor):
+        counts[n + 1] += counts[n]
+    new_indptr = array("q", counts)
+
+    new_indices = array("q", bytes(8 * len(indices)))
+    new_values = array("d", bytes(8 * len(values)))
+    position = counts[:-1]
+    for m in range(n_major):
+        for k in range(indptr[m], indptr[m + 1]):
+            n = indices[k]
+            target = position[n]
+            new_indices[target] = m
+            new_values[target] = values[k]
+            position[n] = target + 1
+    return new_indptr, new_indices, new_values
+
+
+class SparseMatrix:
+    def __init__(self, shape: tuple[int, int], entries: Iterable[tuple[int, int, Number]] = (), format: str = "csr") -> None:
+        """
+        Builds a rows x cols sparse matrix from COO (row, col, value) triples.
+        Entries with the same position are summed.
+        """
+        rows, cols = shape
+        if rows < 1 or cols < 1:
+            raise ValueError("Matrix dimensions must be positive numbers")
+        if format not in _FORMATS:
+            raise ValueError(f"Unknown sparse format '{format}', expected one of {_FORMATS}")
+
+        triples = list(entries)
+        row_idx = [r for r, _, _ in triples]
+        col_idx = [c for _, c, _ in triples]
+        if any(r < 0 or r >= rows for r in row_idx) or any(c < 0 or c >= cols for c in col_idx):
+            raise IndexError("Index out of bounds for the matrix")
+        values = [v for _, _, v in triples]
+
+        self._rows = rows
+        self._cols = cols
+        self._format = format
+        if format == "csr":
+            self._indptr, self._indices, self._values = _compress(rows, row_idx, col_idx, values)
+        else:
+            self._indptr, self._indices, self._values = _compress(cols, col_idx, row_idx, values)
+
+    @classmethod
+    def _from_arrays(cls, rows: int, cols: int, format: str, indptr: array, indices: array, values: array) -> "SparseMatrix":
+        """
+        Wraps already compressed arrays without copying or validating them.
+        """
+        matrix = cls.__new__(cls)
+        matrix._rows = rows
+        matrix._cols = cols
+        matrix._format = format
+        matrix._indptr = indptr
+        matrix._indices = indices
+        matrix._values = values
+        return matrix
+
+    @classmethod
+    def from_coo(cls, shape: tuple[int, int], rows: Sequence[int], cols: Sequence[int], values: Sequence[Number], format: str = "csr") -> "SparseMatrix":
+        """
+        Builds a sparse matrix from parallel sequences of row indices, column
+        indices and values.
+        """
+        if not (len(rows) == len(cols) == len(values)):
+            raise ValueError("rows, cols and values must have the same length")
+        return cls(shape, zip(rows, cols, values), format)
+
+    @classmethod
+    def from_dense(cls, matrix: Matrix, format: str = "csr") -> "SparseMatrix":
+        """
+        Keeps the nonzero entries of a dense Matrix.
+        """
+        if format not in _FORMATS:
+            raise ValueError(f"Unknown sparse format '{format}', expected one of {_FORMATS}")
+        # Read the dense buffer in the order of the sparse layout so the entries
+        # come out already grouped
+        csr = format == "csr"
+        n_major, n_minor = (matrix.rows, matrix.cols) if csr else (matrix.cols, matrix.rows)
+        data = matrix._backend.tolist(matrix._buffer("C" if csr else "F"))
+
+        indptr = array("q", [0])
+        indices = array("q")
+        values = array("d")
+        for m in range(n_major):
+            row = data[m * n_minor:(m + 1) * n_minor]
+            for n, v in enumerate(row):
+                if v:
+                    indices.append(n)
+                    values.append(v)
+            indptr.append(len(values))
+        return cls._from_arrays(matrix.rows, matrix.cols, format, indptr, indices, values)
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def cols(self) -> int:
+        return self._cols
+
+    @property
+    def format(self) -> str:
+        return self._format
+
+    @property
+    def nnz(self) -> int:
+        """
+        Number of stored (nonzero) entries.
+        """
+        return len(self._values)
+
+    def _major_minor(self) -> tuple[int, int]:
+        if self._format == "csr":
+            return self._rows, self._cols
+        return self._cols, self._rows
+
+    def to_csr(self) -> "SparseMatrix":
+        if self._format == "csr":
+            return self
+        arrays = _swap_layout(self._cols, self._rows, self._indptr, self._indices, self._values)
+        return SparseMatrix._from_arrays(self._rows, self._cols, "csr", *arrays)
+
+    def to_csc(self) -> "SparseMatrix":
+        if self._format == "csc":
+            return self
+        arrays = _swap_layout(self._rows, self._cols, self._indptr, self._indices, self._values)
+        return SparseMatrix._from_arrays(self._rows, self._cols, "csc", *arrays)
+
+    def to_dense(self) -> Matrix:
+        backend = get_backend()
+        data = [0.0] * (self._rows * self._cols)
+        n_major, n_minor = self._major_minor()
+        # Row-major for CSR and column-major for CSC, so each group is one run
+        for m in range(n_major):
+            base = m * n_minor
+            for k in range(self._indptr[m], self._indptr[m + 1]):
+                data[base + self._indices[k]] = self._values[k]
+        order = "C" if self._format == "csr" else "F"
+        return Matrix._from_buffer(backend.array(data), self._rows, self._cols, order, backend)
+
+    def transpose(self) -> "SparseMatrix":
+        # The compressed arrays of A in one layout are those of A^T in the other
+        format = "csc" if self._format == "csr" else "csr"
+        return SparseMatrix._from_arrays(self._cols, self._rows, format, self._indptr, self._indices, self._values)
+
+    def __getitem__(self, index: tuple[int, int]) -> Number:
+        rowIdx, colIdx = index
+        if rowIdx < 0 or rowIdx >= self.rows or colIdx < 0 or colIdx >= self.cols:
+            raise IndexError("Index out of bounds for the matrix")
+        major, minor = (rowIdx, colIdx) if self._format == "csr" else (colIdx, rowIdx)
+        start, end = self._indptr[major], self._indptr[major + 1]
+        # The minor indices of a group are sorted, so the entry can be bisected
+        k = bisect_left(self._indices, minor, start, end)
+        if k < end and self._indices[k] == minor:
+            return self._values[k]
+        return 0.0
+
+    def _matvec(self, x: list[float]) -> list[float]:
+        """
+        Multiplies by a dense vector given as a list, in O(nnz + rows + cols).
+        """
+        indptr, indices, values = self._indptr, self._indices, self._values
+        if self._format == "csr":
+            # y[r] = sum of values[k] * x[indices[k]] over the entries of row r
+            lookup = x.__getitem__
+            return [
+                _dot(values[indptr[r]:indptr[r + 1]], map(lookup, indices[indptr[r]:indptr[r + 1]]))
+                for r in range(self._rows)
+            ]
+        # CSC: scatter x[c] * column c into y, skipping columns where x[c] is 0
+        y = [0.0] * self._rows
+        for c in range(self._cols):
+            xc = x[c]
+            if not xc:
+                continue
+            for k in range(indptr[c], indptr[c + 1]):
+                y[indices[k]] += values[k] * xc
+        return y
+
+    def __mul__(self, other: "Vector | Matrix") -> "Vector | Matrix":
+        if isinstance(other, Vector):
+            if self.cols != other.dimension:
+                raise ValueError(
+                    f"Matrix and Vector dimensions incompatible for multiplication: "
+                    f"Matrix cols ({self.cols}) != Vector dimension ({other.dimension})"
+                )
+            return Vector(self._matvec(other._backend.tolist(other.items)))
+
+        if isinstance(other, Matrix):
+            if self.cols != other.rows:
+                raise ValueError(
+                    f"Matrix dimensions incompatible for multiplication: "
+                    f"({self.rows}x{self.cols}) * ({other.rows}x{other.cols})"
+                )
+            # Every column of the product is this matrix times a column of other
+            k = other.rows
+            columns = other._backend.tolist(other._buffer("F"))
+            result: list[float] = []
+            for j in range(other.cols):
+                result.extend(self._matvec(columns[j * k:(j + 1) * k]))
+            backend = get_backend()
+            return Matrix._from_buffer(backend.array(result), self.rows, other.cols, "F", backend)
+
+        return NotImplemented
+
+    def __rmul__(self, other: "Number | Matrix") -> "SparseMatrix | Matrix":
+        if isinstance(other, Matrix):
+            # dense (m x k) * sparse (k x n): column j of the product is the sum of
+            # the dense columns picked out by the entries of sparse column j
+            if other.cols != self.rows:
+                raise ValueError(
+                    f"Matrix dimensions incompatible for multiplication: "
+                    f"({other.rows}x{other.cols}) * ({self.rows}x{self.cols})"
+                )
+            m = other.rows
+            dense = other._backend.tolist(other._buffer("F"))
+            csc = self.to_csc()
+            result: list[float] = []
+            for j in range(self.cols):
+                column = [0.0] * m
+                for k in range(csc._indptr[j], csc._indptr[j + 1]):
+                    i = csc._indices[k]
+                    column = list(map(add, column, map(mul, dense[i * m:(i + 1) * m], repeat(csc._values[k]))))
+                result.extend(column)
+            backend = get_backend()
+            return Matrix._from_buffer(backend.array(result), m, self.cols, "F", backend)
+
+        # Scalar multiplication only touches the stored entries
+        values = array("d", map(mul, self._values, repeat(other)))
+        return SparseMatrix._from_arrays(self._rows, self._cols, self._format, self._indptr, self._indices, values)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SparseMatrix):
+            return False
+        other = other.to_csr() if self._format == "csr" else other.to_csc()
+        return (
+            self.rows == other.rows and
+            self.cols == other.cols and
+            self._indptr == other._indptr and
+            self._indices == other._indices and
+            self._values == other._values
+        )
+
+    def __str__(self) -> str:
+        return str(self.to_dense())
+
+    def __repr__(self) -> str:
+        entries: list[tuple[int, int, Number]] = []
+        n_major, _ = self._major_minor()
+        for m in range(n_major):
+            for k in range(self._indptr[m], self._indptr[m + 1]):
+                n = self._indices[k]
+                entries.append((m, n, self._values[k]) if self._format == "csr" else (n, m, self._values[k]))
+        return f"SparseMatrix(({self.rows}, {self.cols}), {entries}, format='{self._format}')"
@@ -0,0 +1,131 @@
+import mmap as _mmap
+import struct
+import sys
+from array import array
+from os import PathLike, fstat
+from typing import Any, BinaryIO
+
+from .Backends import get_backend
+from .Matrix import Matrix
+from .VectorArray import VectorArray
+from .Vectors import Vector
+
+# Binary file format for Matrix, Vector and VectorArray.
+#
+# A fixed 32 byte header followed by the elements as raw little-endian float64,
+# in the object's own buffer order:
+#
+#   offset  size  field
+#        0     4  magic b"LAMX"
+#        4     1  format version (1)
+#        5     2  dtype, b"<d" (little-endian float64)
+#        7     1  kind: b"M" Matrix, b"V" Vector, b"A" VectorArray
+#        8     1  order: b"F" column-major or b"C" row-major (b"F" for the others)
+#        9     7  padding
+#       16     8  rows (Matrix), dimension (Vector) or vector count (VectorArray)
+#       24     8  cols (Matrix), 1 (Vector) or dimension (VectorArray)
+#
+# The header size keeps the payload 8-byte aligned, so a memory-mapped file can
+# be read as float64 in place: load(path, mmap=True) maps the file and hands the
+# mapping to the backend without copying, so even a very large matrix opens
+# instantly, its pages are read on first use, and processes that map the same
+# file share one copy of it in the OS page cache.
+
+_HEADER = struct.Struct("<4sB2scc7xQQ")
+_MAGIC = b"LAMX"
+_VERSION = 1
+_DTYPE = b"<d"
+_KINDS = (b"M", b"V", b"A")
+_ORDERS = (b"F", b"C")
+# Payload bytes are little-endian; big-endian machines swap them on the way in and out
+_SWAP = sys.byteorder != "little"
+
+# mode of load(..., mmap=True), as for numpy.memmap
+_ACCESS = {
+    "r": _mmap.ACCESS_READ,    # read-only
+    "r+": _mmap.ACCESS_WRITE,  # changes are written back to the file
+    "c": _mmap.ACCESS_COPY,    # copy-on-write, changes stay in memory
+}
+
+def _describe(obj: Any) -> tuple[bytes, bytes, int, int, Any]:
+    """
+    Returns (kind, order, first size, second size, buffer) for obj.
+    """
+    if isinstance(obj, Matrix):
+        # A strided view is gathered into a contiguous copy first
+        return b"M", obj._layout.encode(), obj.rows, obj.cols, obj._buffer(obj._layout)
+    if isinstance(obj, Vector):
+        return b"V", b"F", obj.dimension, 1, obj.items
+    if isinstance(obj, VectorArray):
+        return b"A", b"F", len(obj), obj.dimension, obj.data
+    raise TypeError(f"Cannot save {type(obj).__name__}, expected a Matrix, Vector or VectorArray")
+
+def save(obj: "Matrix | Vector | VectorArray", path: str | PathLike) -> None:
+    """
+    Writes obj to path in the binary format described above.
+    """
+    kind, order, first, second, data = _describe(obj)
+    payload = memoryview(data)
+    if _SWAP or not payload.c_contiguous:
+        swapped = array("d", payload)
+        if _SWAP:
+            swapped.byteswap()
+        payload = memoryview(swapped)
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, _DTYPE, kind, order, first, second))
+        file.write(payload.cast("B"))
+
+def _read_header(file: BinaryIO, path: Any) -> tuple[bytes, str, int, int]:
+    header = file.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError(f"{path} is too short to be a saved matrix or vector")
+    magic, version, dtype, kind, order, first, second = _HEADER.unpack(header)
+    if magic != _MAGIC:
+        raise ValueError(f"{path} is not a saved matrix or vector")
+    if version != _VERSION or dtype != _DTYPE:
+        raise ValueError(f"{path} uses an unsupported format (version {version}, dtype {dtype!r})")
+    if kind not in _KINDS:
+        raise ValueError(f"{path} holds an unknown kind of object {kind!r}")
+    if order not in _ORDERS or (kind != b"M" and order != b"F"):
+        raise ValueError(f"{path} has an invalid element order {order!r}")
+    return kind, order.decode(), first, second
+
+def load(path: str | PathLike, mmap: bool = False, mode: str = "r") -> "Matrix | Vector | VectorArray":
+    """
+    Reads a Matrix, Vector or VectorArray written by save().
+
+    With mmap=True the file is memory-mapped and its elements are used in place
+    instead of being read; mode is "r" (read-only), "r+" (writes go to the file)
+    or "c" (copy-on-write).
+    """
+    if mode not in _ACCESS:
+        raise ValueError(f"Unknown mode '{mode}', expected one of {sorted(_ACCESS)}")
+    backend = get_backend()
+    with open(path, "rb" if mode != "r+" else "r+b") as file:
+        kind, order, first, second = _read_header(file, path)
+        count = first * second
+        # Checked before anything is allocated, so a corrupt header cannot ask
+        # for an arbitrarily large buffer
+        if fstat(file.fileno()).st_size < _HEADER.size + 8 * count:
+            raise ValueError(f"{path} is truncated")
+        if mmap and count and not _SWAP:
+            # The mapping stays alive as long as the buffer that views it, even
+            # after the file is closed
+            mapping = _mmap.mmap(file.fileno(), 0, access=_ACCESS[mode])
+            view = memoryview(mapping)[_HEADER.size:_HEADER.size + 8 * count]
+            data = backend.frombuffer(view)
+        else:
+            # Read straight into the final buffer (array.fromfile would go
+            # through a temporary bytes object of the same size)
+            elements = array("d", [0.0]) * count
+            if file.readinto(elements) != 8 * count:
+                raise ValueError(f"{path} is truncated")
+            if _SWAP:
+                elements.byteswap()
+            data = backend.asarray(elements)
+
+    if kind == b"M":
+        return Matrix._from_buffer(data, first, second, order, backend)
+    if kind == b"V":
+        return Vector._from_buffer(data, backend)
+    return VectorArray._from_buffer(data, first, second, backend)
@@ -0,0 +1,210 @@
+import csv
+from array import array
+from os import PathLike
+from typing import Any, Iterable, Iterator
+
+from ..Statistics.RandomVariables import MomentAccumulator
+from .Backends import get_backend
+from .Matrix import Matrix
+from .Storage import _MAGIC, _SWAP, _read_header, load
+from .VectorArray import VectorArray
+from .Vectors import Vector
+
+# Streaming readers and consumers for datasets too large to load at once.
+#
+# The readers are generators: they read a file a batch at a time and yield it as
+# a VectorArray (one vector per CSV row / per run of the binary file) or as a
+# Matrix row block, so only one batch is in memory at any moment. The consumers
+# below fold such a stream into a result without keeping the batches:
+#
+#   blocks = read_csv_blocks("A.csv", max_bytes=64 << 20)
+#   y = chunked_matvec(blocks, x)                  # A x, one row block at a time
+#
+#   moments = column_moments(read_binary_batches("points.bin", dimension=3))
+#
+# Memory is bounded by the batch size, given either as a number of rows
+# (batch_size) or as a ceiling in bytes on the float64 data of one batch
+# (max_bytes), whatever the size of the input.
+
+# Default ceiling on the float64 payload of one batch
+DEFAULT_MAX_BYTES = 64 << 20
+
+def _batch_rows(batch_size: int | None, max_bytes: int, dimension: int) -> int:
+    if batch_size is not None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        return batch_size
+    if max_bytes < 8 * dimension:
+        raise ValueError(f"max_bytes must fit at least one row ({8 * dimension} bytes)")
+    return max_bytes // (8 * dimension)
+
+def _csv_rows(path: str | PathLike, delimiter: str, skip_rows: int) -> Iterator[list[str]]:
+    with open(path, newline="") as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        for line, row in enumerate(reader):
+            if line >= skip_rows and row:
+                yield row
+
+def _csv_buffers(
+    path: str | PathLike, batch_size: int | None, max_bytes: int, delimiter: str, skip_rows: int
+) -> Iterator[tuple[array, int, int]]:
+    """
+    Yields (row-major buffer, row count, column count) batches of a CSV file of numbers.
+    """
+    buffer = array("d")
+    count = 0
+    width = 0
+    limit = 0
+    for row in _csv_rows(path, delimiter, skip_rows):
+        if not width:
+            width = len(row)
+            limit = _batch_rows(batch_size, max_bytes, width)
+        elif len(row) != width:
+            raise ValueError(f"Every row of {path} must have {width} values, found {len(row)}")
+        buffer.extend(map(float, row))
+        count += 1
+        if count == limit:
+            yield buffer, count, width
+            buffer = array("d")
+            count = 0
+    if count:
+        yield buffer, count, width
+
+def read_csv_batches(
+    path: str | PathLike,
+    batch_size: int | None = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    delimiter: str = ",",
+    skip_rows: int = 0,
+) -> Iterator[VectorArray]:
+    """
+    Yields the rows of a CSV file of numbers as VectorArray batches, each row
+    being one vector. skip_rows skips header lines.
+    """
+    backend = get_backend()
+    for buffer, count, width in _csv_buffers(path, batch_size, max_bytes, delimiter, skip_rows):
+        yield VectorArray._from_buffer(backend.asarray(buffer), count, width, backend)
+
+def read_csv_blocks(
+    path: str | PathLike,
+    batch_size: int | None = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    delimiter: str = ",",
+    skip_rows: int = 0,
+) -> Iterator[Matrix]:
+    """
+    Yields a CSV file of numbers as Matrix blocks of consecutive rows.
+    """
+    backend = get_backend()
+    for buffer, count, width in _csv_buffers(path, batch_size, max_bytes, delimiter, skip_rows):
+        yield Matrix._from_buffer(backend.asarray(buffer), count, width, "C", backend)
+
+def read_binary_batches(
+    path: str | PathLike,
+    dimension: int | None = None,
+    batch_size: int | None = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> Iterator[VectorArray]:
+    """
+    Yields the vectors of a binary file as VectorArray batches.
+
+    The file is either raw little-endian float64 holding vectors of the given
+    dimension one after the other, or a file written by save() (see Storage.py),
+    whose header gives the dimension: the vectors of a VectorArray, a Vector, or
+    the contiguous runs of a Matrix (its columns if column-major, else its rows).
+    """
+    backend = get_backend()
+    with open(path, "rb") as file:
+        if file.read(len(_MAGIC)) == _MAGIC:
+            file.seek(0)
+            kind, order, first, second = _read_header(file, path)
+            if kind == b"A" or (kind == b"M" and order == "C"):
+                total, dimension = first, second
+            else:
+                total, dimension = second, first
+        else:
+            if dimension is None:
+                raise ValueError(f"{path} has no header, so dimension is required")
+            file.seek(0, 2)
+            size = file.tell()
+            if size % (8 * dimension):
+                raise ValueError(f"The size of {path} is not a multiple of {dimension} float64 values")
+            total = size // (8 * dimension)
+            file.seek(0)
+        if dimension < 2:
+            raise ValueError("Dimension must be an integer >= 2 (e.g., 2 for 2D, 3 for 3D)")
+
+        limit = _batch_rows(batch_size, max_bytes, dimension)
+        for start in range(0, total, limit):
+            count = min(limit, total - start)
+            # A new buffer per batch, since the caller may keep the batches it is given
+            buffer = array("d", [0.0]) * (count * dimension)
+            if file.readinto(buffer) != 8 * count * dimension:
+                raise ValueError(f"{path} is truncated")
+            if _SWAP:
+                buffer.byteswap()
+            yield VectorArray._from_buffer(backend.asarray(buffer), count, dimension, backend)
+
+def iter_row_blocks(matrix: Matrix, batch_size: int | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> Iterator[Matrix]:
+    """
+    Yields copies of consecutive row blocks of matrix. With a memory-mapped
+    matrix (Matrix.load(path, mmap=True)) only the current block is read into memory.
+    """
+    rows, cols = matrix.rows, matrix.cols
+    limit = _batch_rows(batch_size, max_bytes, cols)
+    for r0 in range(0, rows, limit):
+        # A row block is a view (contiguous for a row-major matrix, strided
+        # otherwise) and copy() reads just its elements
+        yield matrix[r0:min(r0 + limit, rows), :].copy()
+
+def read_binary_blocks(path: str | PathLike, batch_size: int | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> Iterator[Matrix]:
+    """
+    Yields a Matrix written by Matrix.save() as blocks of consecutive rows,
+    reading the file through a memory map one block at a time.
+    """
+    matrix = load(path, mmap=True)
+    if not isinstance(matrix, Matrix):
+        raise ValueError(f"{path} does not hold a Matrix")
+    return iter_row_blocks(matrix, batch_size, max_bytes)
+
+def streaming_matvec(blocks: Iterable[Matrix], x: Vector) -> Iterator[Any]:
+    """
+    Yields block * x for each row block of a matrix, as a backend buffer.
+    """
+    for block in blocks:
+        if block.cols != x.dimension:
+            raise ValueError(
+                f"Matrix and Vector dimensions incompatible for multiplication: "
+                f"Matrix cols ({block.cols}) != Vector dimension ({x.dimension})"
+            )
+        yield block._backend.matvec(block._buffer("C"), block._backend.asarray(x.items), block.rows, block.cols)
+
+def chunked_matvec(blocks: Iterable[Matrix], x: Vector) -> Vector:
+    """
+    A x for a matrix A given as a stream of row blocks. Only one block and the
+    result (one number per row of A) are held in memory.
+    """
+    backend = x._backend
+    result = backend.concat(list(streaming_matvec(blocks, x)))
+    if len(result) < 2:
+        raise ValueError("The product has fewer than 2 rows")
+    return Vector._from_buffer(result, backend)
+
+def column_moments(batches: Iterable[VectorArray]) -> list[MomentAccumulator]:
+    """
+    Mean, variance, skewness and kurtosis of every component over a stream of
+    VectorArray batches, e.g. from read_csv_batches(). Each batch is folded into
+    one MomentAccumulator per component and then dropped.
+    """
+    moments: list[MomentAccumulator] = []
+    for batch in batches:
+        d = batch.dimension
+        if not moments:
+            moments = [MomentAccumulator() for _ in range(d)]
+        elif len(moments) != d:
+            raise ValueError("All batches must have the same dimension")
+        data = batch.data
+        for component, accumulator in enumerate(moments):
+            # Component j of every vector is the strided slice j::d of the batch
+            accumulator.update_batch(data[component::d])
+    return moments
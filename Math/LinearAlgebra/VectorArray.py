@@ -0,0 +1,175 @@
+from array import array
+from typing import Any, Iterable, Iterator, Sequence
+
+from .Backends import get_backend
+from .Matrix import Matrix
+from .Vectors import Number, Vector
+
+# A VectorArray holds N vectors of the same dimension d one after the other in a
+# single flat buffer of the active backend, i.e. 8 * d bytes per vector, instead
+# of one Vector object (and its own buffer) per vector.
+#
+# Indexing hands out views: arr[i] is a Vector whose items are elements
+# i*d:(i+1)*d of the shared buffer, and arr[i:j] is a VectorArray over a part of
+# it. Nothing is copied, so views are cheap to create and writes through them
+# (e.g. arr[i] = Vector(...), or Matrix.__setitem__ on as_matrix()) change the
+# array itself. The array, its views and as_matrix() share one version counter,
+# which every write through them bumps, so a matrix over the buffer never keeps
+# a stale LU factorization (see Matrix.py).
+#
+# The buffer is also exactly the column-major buffer of the (d x N) matrix whose
+# columns are the vectors, which is what as_matrix() and
+# LinearTransform.apply_batch() use.
+
+class VectorArray:
+    __slots__ = ("_backend", "_data", "_count", "_dimension", "_version")
+
+    def __init__(self, vectors: Iterable[Vector | Sequence[Number]], dimension: int | None = None) -> None:
+        buffer = array("d")
+        count = 0
+        for vector in vectors:
+            items = vector.items if isinstance(vector, Vector) else vector
+            if dimension is None:
+                dimension = len(items)
+            if len(items) != dimension:
+                raise ValueError(f"Every vector must have {dimension} components")
+            buffer.extend(items)
+            count += 1
+        if dimension is None:
+            raise ValueError("dimension is required for an empty VectorArray")
+        if dimension < 2:
+            raise ValueError("Dimension must be an integer >= 2 (e.g., 2 for 2D, 3 for 3D)")
+        self._backend = get_backend()
+        self._data = self._backend.asarray(buffer)
+        self._count = count
+        self._dimension = dimension
+        self._version = [0]
+
+    @classmethod
+    def _from_buffer(cls, data: Any, count: int, dimension: int, backend: Any, version: list[int] | None = None) -> "VectorArray":
+        """
+        Wraps a backend buffer of count * dimension numbers without copying or validating it.
+        """
+        result = cls.__new__(cls)
+        result._backend = backend
+        result._data = data
+        result._count = count
+        result._dimension = dimension
+        result._version = version if version is not None else [0]
+        return result
+
+    @classmethod
+    def from_buffer(cls, data: Any, dimension: int) -> "VectorArray":
+        """
+        Wraps packed float64 data (e.g. an array('d')) holding vectors one after the
+        other. Buffers that already belong to the active backend are not copied.
+        """
+        if dimension < 2:
+            raise ValueError("Dimension must be an integer >= 2 (e.g., 2 for 2D, 3 for 3D)")
+        backend = get_backend()
+        data = backend.asarray(data)
+        if len(data) % dimension:
+            raise ValueError(f"Buffer length must be a multiple of the vector dimension ({dimension})")
+        return cls._from_buffer(data, len(data) // dimension, dimension, backend)
+
+    @staticmethod
+    def zeros(count: int, dimension: int) -> "VectorArray":
+        if count < 0 or dimension < 2:
+            raise ValueError("count must be >= 0 and dimension >= 2")
+        backend = get_backend()
+        return VectorArray._from_buffer(backend.zeros(count * dimension), count, dimension, backend)
+
+    def save(self, path: Any) -> None:
+        """
+        Writes the vectors to path in a binary format (see Storage.py).
+        """
+        # Imported here because Storage imports VectorArray
+        from .Storage import save
+        save(self, path)
+
+    @classmethod
+    def load(cls, path: Any, mmap: bool = False, mode: str = "r") -> "VectorArray":
+        """
+        Reads vectors written by save(), memory-mapped in place with mmap=True.
+        """
+        from .Storage import load
+        result = load(path, mmap, mode)
+        if not isinstance(result, VectorArray):
+            raise ValueError(f"{path} does not hold a VectorArray")
+        return result
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    @property
+    def data(self) -> Any:
+        """
+        The flat buffer holding all the vectors.
+        """
+        return self._data
+
+    @property
+    def nbytes(self) -> int:
+        return 8 * self._count * self._dimension
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int | slice) -> "Vector | VectorArray":
+        d = self._dimension
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if step != 1:
+                raise ValueError("VectorArray slices must be contiguous (step 1)")
+            stop = max(start, stop)
+            data = self._backend.view(self._data, start * d, stop * d)
+            return VectorArray._from_buffer(data, stop - start, d, self._backend, self._version)
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("VectorArray index out of range")
+        return Vector._from_buffer(self._backend.view(self._data, index * d, (index + 1) * d), self._backend, self._version)
+
+    def __setitem__(self, index: int, vector: Vector | Sequence[Number]) -> None:
+        items = vector.items if isinstance(vector, Vector) else vector
+        if len(items) != self._dimension:
+            raise ValueError(f"Vector must have {self._dimension} components")
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("VectorArray index out of range")
+        d = self._dimension
+        self._version[0] += 1
+        self._data[index * d:(index + 1) * d] = self._backend.asarray(items)
+
+    def __iter__(self) -> Iterator[Vector]:
+        for index in range(self._count):
+            yield self[index]
+
+    def as_matrix(self) -> Matrix:
+        """
+        Returns the (dimension x N) matrix whose columns are the vectors, sharing
+        this array's buffer and its version counter, so writes through the
+        array reset the matrix's cached LU factorization and the other way round.
+        """
+        matrix = Matrix._from_buffer(self._data, self._dimension, self._count, "F", self._backend)
+        matrix._version = self._version
+        return matrix
+
+    def tolist(self) -> list[list[float]]:
+        flat = self._backend.tolist(self._data)
+        d = self._dimension
+        return [flat[i * d:(i + 1) * d] for i in range(self._count)]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VectorArray):
+            return False
+        return (
+            self._dimension == other._dimension
+            and self._count == other._count
+            and self._backend.equal(self._data, self._backend.asarray(other._data))
+        )
+
+    def __repr__(self) -> str:
+        return f"VectorArray({self.tolist()}, dimension={self._dimension})"
@@ -1,4 +1,5 @@
-from typing import Union
+from typing import Any, Union
+from .Backends import get_backend
 
 Number = Union[int, float]
 
@@ -9,8 +10,15 @@ Number = Union[int, float]
 # An advantage of vectors is that we can switch between the two notations
 # of lists and geometric projections easily allowing us to model the data in
 # lists and also visualize them in graphs.
+#
+# The numbers are stored in a buffer owned by the active backend (see Backends.py):
+# an array('d') for the pure Python backend or a float64 ndarray for NumPy.
+# __slots__ keeps each Vector to a small fixed-size object without an instance
+# __dict__; to store many vectors compactly use VectorArray (see VectorArray.py).
 
 class Vector:
+  __slots__ = ("_backend", "items", "_dimension", "_version")
+
   def __init__(self, items: list[Number] | tuple[Number, ...], dimension: int = -1):
     if dimension == -1: dimension = len(items)
     
@@ -19,9 +27,56 @@ class Vector:
     if len(items) != dimension:
       raise ValueError(f"Items must be a list or tuple with {dimension} components")
   
-    self.items = list(items)
+    self._backend = get_backend()
+    self.items = self._backend.array(items)
     self._dimension = dimension
+    self._version = None
+
+  @classmethod
+  def _from_buffer(cls, data: Any, backend: Any, version: list[int] | None = None) -> "Vector":
+    """
+    Wraps a backend buffer without copying or validating it. A view of a
+    Matrix buffer passes the matrix's version counter, which writes through
+    the Vector then bump (see _changed).
+    """
+    vector = cls.__new__(cls)
+    vector._backend = backend
+    vector.items = data
+    vector._dimension = len(data)
+    vector._version = version
+    return vector
+
+  def _changed(self) -> None:
+    # The buffer is about to change; when it is shared with a Matrix, that
+    # matrix's cached LU factorization no longer describes it
+    if self._version is not None:
+      self._version[0] += 1
+
+  def _operand(self, other: "Vector") -> Any:
+    """
+    Returns the items of other as a buffer of this vector's backend.
+    """
+    return self._backend.asarray(other.items)
     
+  def save(self, path: Any) -> None:
+    """
+    Writes the vector to path in a binary format (see Storage.py).
+    """
+    # Imported here because Storage imports Vector
+    from .Storage import save
+    save(self, path)
+
+  @classmethod
+  def load(cls, path: Any, mmap: bool = False, mode: str = "r") -> "Vector":
+    """
+    Reads a vector written by save(), memory-mapped in place with mmap=True.
+    """
+    from .Storage import load
+    result = load(path, mmap, mode)
+    if not isinstance(result, Vector):
+      raise ValueError(f"{path} does not hold a Vector")
+    return result
+
   @property
   def dimension(self) -> int:
     """
@@ -35,7 +90,7 @@ class Vector:
       Returns a human-readable string representation of the Vector.
       Example: "3D Vector:[1, 2, 3]"
       """
-      return f"{self.dimension}D Vector:{self.items}"
+      return f"{self.dimension}D Vector:{self._backend.tolist(self.items)}"
 
   def __repr__(self) -> str:
       """
@@ -43,45 +98,115 @@ class Vector:
       ideally allowing it to be recreated using eval().
       Example: "Vector([1, 2, 3])" or "Vector((1, 2, 3), dimension=3)"
       """
-      return f"{self.__class__.__name__}({self.items})"
+      return f"{self.__class__.__name__}({self._backend.tolist(self.items)})"
    
-  def __add__(self, other: "Vector") -> "Vector":
+  def _out(self, out: "Vector | None") -> Any:
+    """
+    Returns the buffer a result should be written into: None for a new Vector,
+    else the items of out after checking that they can hold the result.
+    """
+    if out is None:
+      return None
+    if out.dimension != self.dimension:
+      raise ValueError("out must have the same dimension as the result")
+    if out._backend is not self._backend:
+      raise ValueError("out must use the same backend as the operands")
+    out._changed()
+    return out.items
+
+  def _result(self, data: Any, out: "Vector | None") -> "Vector":
+    return out if out is not None else Vector._from_buffer(data, self._backend)
+
+  # Arithmetic with an optional out Vector. Passing out (which may be self or the
+  # other operand) writes the result into its existing buffer instead of creating
+  # a new Vector, which is what the in-place operators below use.
+  def add(self, other: "Vector", out: "Vector | None" = None) -> "Vector":
     if (self.dimension != other.dimension):
       raise ValueError("Vector dimensions must match")
-    result = [x + y for x, y in zip(self, other)]
-    return Vector(result)
-  
-  def __sub__(self, other: "Vector") -> "Vector":
+    return self._result(self._backend.add(self.items, self._operand(other), self._out(out)), out)
+
+  def sub(self, other: "Vector", out: "Vector | None" = None) -> "Vector":
     if (self.dimension != other.dimension):
       raise ValueError("Vector dimensions must match")
-    result = [x - y for x, y in zip(self, other)]
-    return Vector(result)
+    return self._result(self._backend.sub(self.items, self._operand(other), self._out(out)), out)
+
+  def scale(self, scalar: Number, out: "Vector | None" = None) -> "Vector":
+    return self._result(self._backend.scale(self.items, scalar, self._out(out)), out)
+
+  def divide(self, scalar: Number, out: "Vector | None" = None) -> "Vector":
+    if (scalar == 0):
+      raise ValueError("Division by zero is not allowed")
+    return self._result(self._backend.divide(self.items, scalar, self._out(out)), out)
+
+  def axpy(self, alpha: Number, x: "Vector") -> "Vector":
+    """
+    self += alpha * x in place (the BLAS "axpy"), without building alpha * x.
+    Returns self.
+    """
+    if (self.dimension != x.dimension):
+      raise ValueError("Vector dimensions must match")
+    self._changed()
+    self._backend.axpy(alpha, self._operand(x), self.items)
+    return self
+
+  def __add__(self, other: "Vector") -> "Vector":
+    if not isinstance(other, Vector):
+      # e.g. a lazy Expression (see Lazy.py)
+      return NotImplemented
+    return self.add(other)
+  
+  def __sub__(self, other: "Vector") -> "Vector":
+    if not isinstance(other, Vector):
+      return NotImplemented
+    return self.sub(other)
   
   def __mul__(self, other: "Vector") -> Number:
+    if not isinstance(other, Vector):
+      return NotImplemented
     if (self.dimension != other.dimension):
       raise ValueError("Vector dimensions must match")
-    return sum(x * y for x, y in zip(self, other))
+    return self._backend.dot(self.items, self._operand(other))
   
   def __rmul__(self, scalar: Number) -> "Vector":
-    result = [x * scalar for x in self.items]
-    return Vector(result)
+    return self.scale(scalar)
   
   def __truediv__(self, scalar: Number) -> "Vector":
-    if (scalar == 0):
-      raise ValueError("Division by zero is not allowed")
-    
-    result = [x / scalar for x in self.items]
-    return Vector(result)
+    return self.divide(scalar)
+
+  def lazy(self) -> Any:
+    """
+    This vector as a lazy Expression (see Lazy.py).
+    """
+    # Imported here because Lazy imports Vector
+    from .Lazy import Expression
+    return Expression._leaf(self)
+
+  # In-place operators update this Vector's buffer, so `v += w` creates no new
+  # Vector and every other reference to v (e.g. a VectorArray view) sees the change
+  def __iadd__(self, other: "Vector") -> "Vector":
+    return self.add(other, out=self)
+
+  def __isub__(self, other: "Vector") -> "Vector":
+    return self.sub(other, out=self)
+
+  def __imul__(self, scalar: Number) -> "Vector":
+    if isinstance(scalar, Vector):
+      # v *= w keeps meaning v = v * w, the dot product
+      return NotImplemented
+    return self.scale(scalar, out=self)
+
+  def __itruediv__(self, scalar: Number) -> "Vector":
+    return self.divide(scalar, out=self)
   
   def __eq__(self, other: object) -> bool:
     if not isinstance(other, Vector): return False
-    return self.items == other.items and self.dimension == other.dimension
+    return self.dimension == other.dimension and self._backend.equal(self.items, self._operand(other))
   
   def __getitem__(self, index: int) -> Number:
     return self.items[index]
   
   def magnitude(self) -> float:
-    return sum(x * x for x in self.items) ** 0.5
+    return self._backend.norm(self.items)
   
   def normalize(self) -> "Vector":
     mag = self.magnitude()
@@ -96,7 +221,27 @@ class Vector:
     return self.dimension
   
   @staticmethod
-  def linear_combination(vectors: list["Vector"], scalars: list[Number]) -> "Vector":
-    result = (s * v for s, v in zip(scalars, vectors))
-    return sum(result, Vector([0.0] * vectors[0].dimension))
+  def linear_combination(vectors: list["Vector"], scalars: list[Number], out: "Vector | None" = None) -> "Vector":
+    """
+    scalars[0] * vectors[0] + scalars[1] * vectors[1] + ..., accumulated into a
+    single buffer (out's, when given) with no intermediate Vectors.
+    """
+    backend = out._backend if out is not None else get_backend()
+    pairs = list(zip(scalars, vectors))
+    if any(v.dimension != vectors[0].dimension for _, v in pairs):
+      raise ValueError("Vector dimensions must match")
+    if out is not None and out.dimension != vectors[0].dimension:
+      raise ValueError("out must have the same dimension as the result")
+    if out is not None:
+      out._changed()
+    if not pairs:
+      if out is not None:
+        out.items[:] = backend.zeros(out.dimension)
+        return out
+      return Vector._from_buffer(backend.zeros(vectors[0].dimension), backend)
+    result = backend.linear_combination(
+      [backend.asarray(v.items) for _, v in pairs], [s for s, _ in pairs],
+      out.items if out is not None else None,
+    )
+    return out if out is not None else Vector._from_buffer(result, backend)
 
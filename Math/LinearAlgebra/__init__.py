@@ -0,0 +1,5 @@
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__, ["Backends", "Lazy", "LinearTransform", "Matrix", "Parallel", "SparseMatrix", "Storage", "Streaming", "VectorArray", "Vectors"]
+)
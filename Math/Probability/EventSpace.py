@@ -0,0 +1,292 @@
+from array import array
+from itertools import compress
+from math import fsum
+from typing import Callable, Hashable, Iterable, Iterator, Sequence
+
+from .Probability import bayes_theorem
+
+# Events of a finite sample space as bit sets.
+#
+# An EventSpace numbers its outcomes 0..n-1 and holds their probabilities in one
+# array('d'). An event (a subset of the outcomes) is a BitSet: a Python int whose
+# bit i is set when outcome i belongs to the event. An event of a million
+# outcomes takes 125 KB, against tens of MB for a set of a million objects, and
+# the set operations are single int operations (|, &, ^ ...), which CPython runs
+# over the whole machine words of the int in C:
+#
+#   dice = EventSpace([(a, b) for a in range(1, 7) for b in range(1, 7)])
+#   doubles = dice.where(lambda o: o[0] == o[1])
+#   high = dice.where(lambda o: o[0] + o[1] >= 10)
+#   dice.probability(doubles | high), dice.conditional(doubles, given=high)
+#
+# P(event) is a weighted popcount. The int is expanded into one 0/1 byte per
+# outcome through a 256 entry table (one lookup per 8 outcomes), and
+# itertools.compress picks the probabilities of the set bits for math.fsum, so
+# every loop runs in C. With equally likely outcomes it is just the popcount
+# divided by n.
+
+# _BYTE_BITS[b] is the 8 bits of the byte b, least significant first, one per byte
+_BYTE_BITS = [bytes((b >> j) & 1 for j in range(8)) for b in range(256)]
+_FLAGS_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+def _selectors(bits: int, size: int) -> bytes:
+  """
+  The bits of an event as one 0 or 1 byte per outcome (plus up to 7 zero bytes).
+  """
+  return b"".join(map(_BYTE_BITS.__getitem__, bits.to_bytes((size + 7) // 8, "little")))
+
+def _from_flags(flags: bytes | bytearray) -> int:
+  """
+  Packs one 0 or 1 byte per outcome into the bits of an int.
+  """
+  if not flags:
+    return 0
+  # Bit i of the int is the i-th flag, so the binary digits are the flags reversed
+  return int(flags.translate(_FLAGS_TO_DIGITS)[::-1], 2)
+
+class BitSet:
+  """
+  An event of an EventSpace, with the operators of set: | (union),
+  & (intersection), - (difference), ^ (symmetric difference), ~ (complement),
+  <, <=, >, >= (subset and superset tests) and isdisjoint.
+  """
+  __slots__ = ("_space", "_bits")
+
+  def __init__(self, space: "EventSpace", bits: int = 0) -> None:
+    if bits < 0 or bits >> len(space):
+      raise ValueError(f"bits must be a non-negative int of at most {len(space)} bits")
+    self._space = space
+    self._bits = bits
+
+  def _new(self, bits: int) -> "BitSet":
+    result = BitSet.__new__(BitSet)
+    result._space = self._space
+    result._bits = bits
+    return result
+
+  def _other(self, other: object) -> int:
+    if not isinstance(other, BitSet):
+      raise TypeError(f"Expected a BitSet, got {type(other).__name__}")
+    if other._space is not self._space:
+      raise ValueError("Events belong to different event spaces")
+    return other._bits
+
+  @property
+  def bits(self) -> int:
+    return self._bits
+
+  @property
+  def space(self) -> "EventSpace":
+    return self._space
+
+  def probability(self) -> float:
+    return self._space.probability(self)
+
+  def __len__(self) -> int:
+    return self._bits.bit_count()
+
+  def __bool__(self) -> bool:
+    return self._bits != 0
+
+  def __contains__(self, outcome: Hashable) -> bool:
+    index = self._space.index(outcome)
+    return index is not None and (self._bits >> index) & 1 == 1
+
+  def __iter__(self) -> Iterator[Hashable]:
+    return compress(self._space.outcomes, _selectors(self._bits, len(self._space)))
+
+  def __or__(self, other: "BitSet") -> "BitSet":
+    return self._new(self._bits | self._other(other))
+
+  def __and__(self, other: "BitSet") -> "BitSet":
+    return self._new(self._bits & self._other(other))
+
+  def __sub__(self, other: "BitSet") -> "BitSet":
+    return self._new(self._bits & ~self._other(other))
+
+  def __xor__(self, other: "BitSet") -> "BitSet":
+    return self._new(self._bits ^ self._other(other))
+
+  def __invert__(self) -> "BitSet":
+    return self._new(self._bits ^ self._space._mask)
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, BitSet):
+      return NotImplemented
+    return self._space is other._space and self._bits == other._bits
+
+  def __hash__(self) -> int:
+    return hash((id(self._space), self._bits))
+
+  def __le__(self, other: "BitSet") -> bool:
+    return self._bits & ~self._other(other) == 0
+
+  def __lt__(self, other: "BitSet") -> bool:
+    return self <= other and self._bits != other._bits
+
+  def __ge__(self, other: "BitSet") -> bool:
+    return self._other(other) & ~self._bits == 0
+
+  def __gt__(self, other: "BitSet") -> bool:
+    return self >= other and self._bits != other._bits
+
+  def isdisjoint(self, other: "BitSet") -> bool:
+    return self._bits & self._other(other) == 0
+
+  def issubset(self, other: "BitSet") -> bool:
+    return self <= other
+
+  def issuperset(self, other: "BitSet") -> bool:
+    return self >= other
+
+  def __repr__(self) -> str:
+    return f"BitSet({len(self)} of {len(self._space)} outcomes)"
+
+class EventSpace:
+  """
+  A finite sample space: outcomes numbered 0..n-1 with their probabilities.
+
+  outcomes is either a sequence of distinct hashable outcomes or an int n for
+  the outcomes 0..n-1. probabilities defaults to equally likely outcomes; other
+  non-negative weights are normalised by their sum.
+  """
+  __slots__ = ("_outcomes", "_index", "_weights", "_total", "_mask")
+
+  def __init__(self, outcomes: int | Sequence[Hashable], probabilities: Iterable[float] | None = None) -> None:
+    if isinstance(outcomes, int):
+      self._outcomes = range(outcomes)
+      self._index = None
+    else:
+      self._outcomes = list(outcomes)
+      self._index = {outcome: i for i, outcome in enumerate(self._outcomes)}
+      if len(self._index) != len(self._outcomes):
+        raise ValueError("Outcomes must be distinct")
+    size = len(self._outcomes)
+    if size < 1:
+      raise ValueError("An event space needs at least one outcome")
+    self._mask = (1 << size) - 1
+
+    if probabilities is None:
+      self._weights = None
+      self._total = float(size)
+    else:
+      self._weights = array("d", probabilities)
+      if len(self._weights) != size:
+        raise ValueError("Outcomes and probabilities must have the same length")
+      if min(self._weights) < 0:
+        raise ValueError("Probabilities must be non-negative")
+      self._total = fsum(self._weights)
+      if self._total <= 0:
+        raise ValueError("Probabilities must have a positive sum")
+
+  def __len__(self) -> int:
+    return len(self._outcomes)
+
+  @property
+  def outcomes(self) -> Sequence[Hashable]:
+    return self._outcomes
+
+  def index(self, outcome: Hashable) -> int | None:
+    """
+    Bit position of outcome, or None if it is not in the space.
+    """
+    if self._index is None:
+      return outcome if isinstance(outcome, int) and 0 <= outcome < len(self._outcomes) else None
+    return self._index.get(outcome)
+
+  def empty(self) -> BitSet:
+    return BitSet(self, 0)
+
+  def full(self) -> BitSet:
+    return BitSet(self, self._mask)
+
+  def event(self, outcomes: Iterable[Hashable]) -> BitSet:
+    """
+    The event made of the given outcomes.
+    """
+    flags = bytearray(len(self._outcomes))
+    for outcome in outcomes:
+      index = self.index(outcome)
+      if index is None:
+        raise KeyError(f"{outcome!r} is not an outcome of this event space")
+      flags[index] = 1
+    return BitSet(self, _from_flags(flags))
+
+  def where(self, predicate: Callable[[Hashable], bool]) -> BitSet:
+    """
+    The event made of the outcomes for which predicate is true.
+    """
+    return BitSet(self, _from_flags(bytes(map(bool, map(predicate, self._outcomes)))))
+
+  def _check(self, event: BitSet) -> int:
+    if event._space is not self:
+      raise ValueError("The event belongs to a different event space")
+    return event._bits
+
+  def probability(self, event: BitSet) -> float:
+    """
+    P(event), the sum of the probabilities of its outcomes.
+    """
+    bits = self._check(event)
+    if not bits:
+      return 0.0
+    if self._weights is None:
+      return bits.bit_count() / self._total
+    return fsum(compress(self._weights, _selectors(bits, len(self._outcomes)))) / self._total
+
+  def conditional(self, event: BitSet, given: BitSet) -> float:
+    """
+    P(event | given) = P(event and given) / P(given).
+    """
+    return self.conditionals([event], given)[0]
+
+  def conditionals(self, events: Iterable[BitSet], given: BitSet) -> list[float]:
+    """
+    P(A | given) for every event A, computing P(given) once.
+    """
+    p_given = self.probability(given)
+    if p_given == 0:
+      raise ValueError("The conditioning event has probability 0")
+    return [self.probability(event & given) / p_given for event in events]
+
+  def bayes(self, hypotheses: Iterable[BitSet], evidence: BitSet) -> list[float]:
+    """
+    P(H | evidence) for every hypothesis H by Bayes' theorem, i.e.
+    bayes_theorem(P(H), P(evidence), P(evidence | H)) with all three
+    probabilities measured on the space.
+    """
+    p_evidence = self.probability(evidence)
+    if p_evidence == 0:
+      raise ValueError("The evidence has probability 0")
+    posteriors = []
+    for hypothesis in hypotheses:
+      p_hypothesis = self.probability(hypothesis)
+      if p_hypothesis == 0:
+        posteriors.append(0.0)
+        continue
+      p_evidence_given_h = self.probability(hypothesis & evidence) / p_hypothesis
+      posteriors.append(bayes_theorem(p_hypothesis, p_evidence, p_evidence_given_h))
+    return posteriors
+
+  def __repr__(self) -> str:
+    kind = "equally likely" if self._weights is None else "weighted"
+    return f"EventSpace({len(self)} {kind} outcomes)"
+
+if __name__ == "__main__":
+  # The sets of Sets.py as events of the outcomes 0..19
+  space = EventSpace(20)
+  A = space.event({5, 3, 17, 12, 19})
+  B = space.event({17, 19, 6})
+  C = space.event({5, 3, 17, 12})
+  D = space.event({1, 2})
+
+  print(sorted(A | B), sorted(A & B), sorted(A - B), sorted(A ^ B))
+  print(C < A, A > C, D.isdisjoint(A))
+  print(space.probability(A), space.conditional(B, given=A))
+
+  # Two dice
+  dice = EventSpace([(a, b) for a in range(1, 7) for b in range(1, 7)])
+  doubles = dice.where(lambda o: o[0] == o[1])
+  high = dice.where(lambda o: o[0] + o[1] >= 10)
+  print(dice.probability(doubles | high), dice.conditional(doubles, given=high))
+  print(dice.bayes([doubles, ~doubles], high))
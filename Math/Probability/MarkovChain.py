@@ -0,0 +1,268 @@
+from collections import OrderedDict
+from math import fsum, log2
+from typing import Hashable, NamedTuple, Sequence
+
+from ..LinearAlgebra.Matrix import Matrix
+from ..LinearAlgebra.Vectors import Vector
+
+# A discrete-time Markov chain over n states.
+#
+# The transition matrix is row-stochastic: P[i, j] is the probability of moving
+# from state i to state j in one step, so every row sums to 1. A distribution
+# over the states is a Vector pi, and one step maps it to pi P, which is computed
+# as P.T * pi (P.T is a view, nothing is copied). After k steps the
+# distribution is pi P^k.
+#
+# There are two ways to take k steps: k matrix-vector products (O(k n^2)) or
+# one product with P^k, which Matrix.__pow__ computes in O(log k) matrix
+# products (O(n^3 log k)) and which is then reused for every starting
+# distribution. distribution() picks the cheaper one. The powers P^(2^i) built
+# on the way are kept, so later powers only cost the products they still need,
+# and so are the max_powers most recently used powers P^k themselves.
+
+# Tolerance on row sums and probabilities when validating a transition matrix
+_STOCHASTIC_TOLERANCE = 1e-9
+
+class SteadyState(NamedTuple):
+  distribution: Vector
+  iterations: int
+  change: float
+
+class MarkovChain:
+  def __init__(
+    self,
+    transition: Matrix | Sequence[Sequence[float]],
+    states: Sequence[Hashable] | None = None,
+    max_powers: int = 32,
+  ) -> None:
+    """
+    transition is a Matrix, or a list of rows, with P[i, j] the probability of
+    moving from state i to state j. states optionally names the states.
+    max_powers is how many powers P^k are kept for reuse, least recently used
+    first out, on top of the O(log k) powers P^(2^i).
+    """
+    if max_powers < 1:
+      raise ValueError("max_powers must be a positive integer")
+    if isinstance(transition, Matrix):
+      # A copy, so later changes to the caller's matrix cannot reach the cache
+      transition = transition.copy()
+    else:
+      # Rows of P are the columns of P.T
+      transition = Matrix([Vector(list(row)) for row in transition]).transpose()
+    if not transition.is_square():
+      raise ValueError("The transition matrix must be square")
+    n = transition.rows
+    rows = transition._backend.tolist(transition._buffer("C"))
+    if min(rows) < -_STOCHASTIC_TOLERANCE:
+      raise ValueError("Transition probabilities must be non-negative")
+    for i in range(n):
+      if abs(fsum(rows[i * n:(i + 1) * n]) - 1) > _STOCHASTIC_TOLERANCE:
+        raise ValueError(f"Row {i} of the transition matrix must sum to 1")
+    self._transition = transition
+    self.states = list(states) if states is not None else list(range(n))
+    if len(self.states) != n:
+      raise ValueError(f"Expected {n} state names, got {len(self.states)}")
+    self._index = {state: i for i, state in enumerate(self.states)}
+    # _squares[i] is P^(2^i)
+    self._squares: list[Matrix] = [transition]
+    self._powers: OrderedDict[int, Matrix] = OrderedDict()
+    self._max_powers = max_powers
+
+  @property
+  def size(self) -> int:
+    return self._transition.rows
+
+  @property
+  def transition(self) -> Matrix:
+    """
+    A copy of the transition matrix P.
+    """
+    return self._transition.copy()
+
+  def _distribution(self, initial: Vector | Sequence[float] | Hashable) -> Vector:
+    """
+    A distribution as a Vector; a state name stands for certainty of that state.
+    """
+    if isinstance(initial, Vector):
+      vector = initial
+    else:
+      try:
+        index = self._index.get(initial)
+      except TypeError:
+        # Not hashable (e.g. a list), so not a state name
+        index = None
+      if index is None:
+        vector = Vector(list(initial))
+      else:
+        vector = Vector([0.0] * self.size)
+        vector.items[index] = 1.0
+    if vector.dimension != self.size:
+      raise ValueError(f"A distribution must have {self.size} probabilities")
+    return vector
+
+  def step(self, distribution: Vector | Sequence[float] | Hashable) -> Vector:
+    """
+    The distribution one step after the given one: pi P.
+    """
+    return self._transition.T * self._distribution(distribution)
+
+  def power(self, k: int) -> Matrix:
+    """
+    P^k, the k-step transition probabilities. The power is cached for later
+    calls; the Matrix returned is a copy the caller is free to change.
+    """
+    return self._power(k).copy()
+
+  def _power(self, k: int) -> Matrix:
+    # The cached Matrix itself, which must not be changed
+    if k < 0:
+      raise ValueError("k must be a non-negative integer")
+    if k == 0:
+      return Matrix.identity(self.size)
+    powers = self._powers
+    if k in powers:
+      powers.move_to_end(k)
+      return powers[k]
+    while len(self._squares) < k.bit_length():
+      last = self._squares[-1]
+      self._squares.append(last * last)
+    if k & (k - 1) == 0:
+      # A power of two is one of the squares, which are all kept anyway
+      return self._squares[k.bit_length() - 1]
+    result = None
+    for i in range(k.bit_length()):
+      if k >> i & 1:
+        result = self._squares[i] if result is None else result * self._squares[i]
+    powers[k] = result
+    if len(powers) > self._max_powers:
+      powers.popitem(last=False)
+    return result
+
+  def _cached(self, k: int) -> bool:
+    # Whether P^k is ready without any product: a kept power, or a square
+    if k & (k - 1) == 0:
+      return k.bit_length() <= len(self._squares)
+    return k in self._powers
+
+  def precompute(self, steps: Sequence[int]) -> None:
+    """
+    Builds and caches P^k for every k in steps ahead of time; only the last
+    max_powers of them stay cached.
+    """
+    for k in steps:
+      self._power(k)
+
+  def probability(self, start: Hashable, end: Hashable, k: int = 1) -> float:
+    """
+    P(state k steps after start is end).
+    """
+    return self._power(k)[self._index[start], self._index[end]]
+
+  def distribution(self, initial: Vector | Sequence[float] | Hashable, k: int) -> Vector:
+    """
+    The distribution after k steps from initial (a distribution or a state).
+    """
+    if k < 0:
+      raise ValueError("k must be a non-negative integer")
+    pi = self._distribution(initial)
+    if k == 0:
+      return pi
+    n = self.size
+    # k products with a vector (k n^2) against the products still needed for P^k
+    # (about n^3 each, at most 2 log2(k) of them) plus one with a vector
+    if not self._cached(k) and k * n ** 2 <= 2 * log2(k + 1) * n ** 3:
+      for _ in range(k):
+        pi = self._transition.T * pi
+      return pi
+    return self._power(k).T * pi
+
+  def distributions(self, initial: Vector | Sequence[float] | Hashable, steps: Sequence[int]) -> list[Vector]:
+    """
+    The distributions after each number of steps in steps (in any order), reusing
+    every intermediate distribution.
+    """
+    pi = self._distribution(initial)
+    results: dict[int, Vector] = {0: pi}
+    done = 0
+    for k in sorted(set(steps)):
+      # Moving on from the previous distribution takes k - done steps
+      results[k] = self.distribution(results[done], k - done)
+      done = k
+    return [results[k] for k in steps]
+
+  def stationary(
+    self,
+    initial: Vector | Sequence[float] | Hashable | None = None,
+    tolerance: float = 1e-12,
+    max_iterations: int = 100_000,
+    damping: float = 0.0,
+  ) -> SteadyState:
+    """
+    A stationary distribution (pi = pi P) by power iteration from initial (the
+    uniform distribution by default), stopping when one step changes it by less
+    than tolerance in total (L1 norm).
+
+    A periodic chain never settles; damping = 0.5 iterates the lazy chain
+    pi <- (1 - d) pi P + d pi instead, which has the same stationary
+    distributions and always converges for an irreducible chain.
+    """
+    if not 0 <= damping < 1:
+      raise ValueError("damping must be in [0, 1)")
+    n = self.size
+    pi = self._distribution(initial) if initial is not None else Vector([1 / n] * n)
+    backend = pi._backend
+    transposed = self._transition.T
+    change = float("inf")
+    for iteration in range(1, max_iterations + 1):
+      following = transposed * pi
+      if damping:
+        following = Vector.linear_combination([following, pi], [1 - damping, damping])
+      # Renormalise, so rounding does not make the total drift away from 1
+      following /= fsum(backend.tolist(following.items))
+      change = fsum(map(abs, backend.tolist((following - pi).items)))
+      pi = following
+      if change < tolerance:
+        return SteadyState(pi, iteration, change)
+    raise ValueError(
+      f"Power iteration did not converge in {max_iterations} iterations (last change {change:.3g}); "
+      "the chain may be periodic, try damping=0.5"
+    )
+
+  def __repr__(self) -> str:
+    return f"MarkovChain({self.size} states)"
+
+if __name__ == "__main__":
+  from math import isclose
+
+  # Weather: sunny, cloudy, rainy
+  chain = MarkovChain(
+    [[0.8, 0.15, 0.05],
+     [0.3, 0.4, 0.3],
+     [0.2, 0.4, 0.4]],
+    states=["sunny", "cloudy", "rainy"],
+  )
+  print(chain.step("sunny"))
+  print(chain.distribution("sunny", 3))
+  print(chain.probability("rainy", "sunny", k=10))
+
+  steady = chain.stationary()
+  print(steady.distribution, steady.iterations)
+  assert all(isclose(a, b, abs_tol=1e-9) for a, b in zip(chain.step(steady.distribution), steady.distribution))
+  assert all(isclose(a, b, abs_tol=1e-9) for a, b in zip(chain.distribution("sunny", 200), steady.distribution))
+
+  # A periodic chain needs damping
+  flip = MarkovChain([[0, 1], [1, 0]])
+  print(flip.stationary(damping=0.5).distribution)
+
+  # Powers are handed out as copies, so changing one leaves the chain intact
+  P2 = chain.power(2)
+  P2 *= 0.5
+  assert chain.power(2) == chain.transition * chain.transition
+
+  # Only max_powers powers are kept, however many different k are asked for
+  bounded = MarkovChain(chain.transition, max_powers=4)
+  bounded.distributions([1, 0, 0], [k * k for k in range(100)])
+  bounded.precompute(range(1, 100))
+  assert len(bounded._powers) == 4
+  P99, expected = bounded.power(99), chain.power(99)
+  assert all(isclose(P99[i, j], expected[i, j]) for i in range(3) for j in range(3))
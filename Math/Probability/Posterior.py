@@ -0,0 +1,187 @@
+from array import array
+from heapq import nlargest
+from itertools import repeat
+from math import exp, fsum, inf, log
+from operator import add, sub
+from typing import Iterable, Sequence
+
+# Bayes' theorem over many hypotheses at once.
+#
+# bayes_theorem(p_a, p_b, p_b_given_a) updates one hypothesis A and needs P(B)
+# from the caller. A Posterior holds P(H_i) for every hypothesis H_i in one
+# array('d') and updates all of them with a vector of likelihoods P(B|H_i):
+#
+#   P(H_i|B) = P(B|H_i) P(H_i) / P(B),   P(B) = sum_i P(B|H_i) P(H_i)
+#
+# The probabilities are stored as logarithms: a product of hundreds of small
+# likelihoods underflows to 0.0 as a float, but its log is just a sum. P(B) is
+# summed with the log-sum-exp trick, subtracting the largest term before exp()
+# so the largest exponent is 0 and nothing overflows or underflows as a whole.
+#
+# Every step is a map() of a math or operator function over the whole vector,
+# so an update runs in C, not one Python call per hypothesis.
+
+def _logs(values: Iterable[float]) -> list[float]:
+  """
+  log of every value, with log(0) = -inf.
+  """
+  values = list(values)
+  try:
+    return list(map(log, values))
+  except ValueError:
+    # Some value is 0 (or negative), which math.log rejects
+    if min(values) < 0:
+      raise ValueError("Probabilities and likelihoods must be non-negative") from None
+    return [log(v) if v > 0 else -inf for v in values]
+
+def logsumexp(log_values: Sequence[float]) -> float:
+  """
+  log(sum(exp(v) for v in log_values)) without overflow or underflow.
+  """
+  largest = max(log_values)
+  if largest == -inf:
+    return -inf
+  return largest + log(fsum(map(exp, map(sub, log_values, repeat(largest)))))
+
+def _normalised(logs: array) -> tuple[array, float]:
+  # Divides by the total probability, i.e. subtracts its log; returns the
+  # result and that log
+  total = logsumexp(logs)
+  if total == -inf:
+    raise ValueError("The observations have probability 0 under every hypothesis")
+  return array("d", map(sub, logs, repeat(total))), total
+
+class Posterior:
+  """
+  Posterior probabilities of a fixed set of hypotheses 0..n-1, updated by
+  Bayes' theorem one observation (or a batch of observations) at a time.
+
+  prior is a vector of prior probabilities, or an int n for n equally likely
+  hypotheses. Non-negative weights are normalised by their sum.
+  """
+  __slots__ = ("_log", "log_evidence")
+
+  def __init__(self, prior: int | Iterable[float]) -> None:
+    if isinstance(prior, int):
+      if prior < 1:
+        raise ValueError("There must be at least one hypothesis")
+      self._log = array("d", repeat(-log(prior), prior))
+    else:
+      logs = array("d", _logs(prior))
+      if not logs:
+        raise ValueError("There must be at least one hypothesis")
+      self._log = _normalised(logs)[0]
+    # Running log P(all observations so far), the log marginal likelihood
+    self.log_evidence = 0.0
+
+  @classmethod
+  def from_log(cls, log_prior: Iterable[float]) -> "Posterior":
+    """
+    Builds a posterior from (possibly unnormalised) log prior probabilities.
+    """
+    result = cls.__new__(cls)
+    logs = array("d", log_prior)
+    if not logs:
+      raise ValueError("There must be at least one hypothesis")
+    result._log = _normalised(logs)[0]
+    result.log_evidence = 0.0
+    return result
+
+  def update_log(self, log_likelihoods: Sequence[float]) -> float:
+    """
+    Applies one observation B given as log P(B|H_i) for every hypothesis.
+    Returns log P(B), the log probability of the observation before the update.
+    """
+    if len(log_likelihoods) != len(self._log):
+      raise ValueError(f"Expected {len(self._log)} likelihoods, got {len(log_likelihoods)}")
+    # Assigned only once normalising succeeded, so a rejected observation
+    # leaves the posterior as it was
+    self._log, log_p_b = _normalised(array("d", map(add, self._log, log_likelihoods)))
+    self.log_evidence += log_p_b
+    return log_p_b
+
+  def update(self, likelihoods: Sequence[float]) -> float:
+    """
+    Applies one observation B given as P(B|H_i) for every hypothesis.
+    Returns P(B), the probability of the observation before the update.
+    """
+    return exp(self.update_log(_logs(likelihoods)))
+
+  def update_many(self, likelihood_vectors: Iterable[Sequence[float]], log: bool = False) -> float:
+    """
+    Applies a stream of independent observations, each a vector of likelihoods
+    (or log likelihoods with log=True). The log likelihoods are summed and the
+    posterior is normalised once at the end, which gives the same result as one
+    update() per observation. Returns log P(all of them).
+    """
+    n = len(self._log)
+    total = self._log
+    for vector in likelihood_vectors:
+      if len(vector) != n:
+        raise ValueError(f"Expected {n} likelihoods, got {len(vector)}")
+      total = array("d", map(add, total, vector if log else _logs(vector)))
+    self._log, log_p = _normalised(total)
+    self.log_evidence += log_p
+    return log_p
+
+  def __len__(self) -> int:
+    return len(self._log)
+
+  def __getitem__(self, index: int) -> float:
+    return exp(self._log[index])
+
+  @property
+  def log_probabilities(self) -> array:
+    """
+    The log posterior probabilities themselves (not a copy).
+    """
+    return self._log
+
+  @property
+  def probabilities(self) -> array:
+    return array("d", map(exp, self._log))
+
+  def most_likely(self) -> int:
+    """
+    Index of the maximum a posteriori hypothesis.
+    """
+    return max(range(len(self._log)), key=self._log.__getitem__)
+
+  def top(self, k: int) -> list[tuple[int, float]]:
+    """
+    The k most probable hypotheses as (index, probability) pairs.
+    """
+    best = nlargest(k, range(len(self._log)), key=self._log.__getitem__)
+    return [(i, exp(self._log[i])) for i in best]
+
+  def __repr__(self) -> str:
+    return f"Posterior({len(self._log)} hypotheses, most likely {self.most_likely()})"
+
+if __name__ == "__main__":
+  from .Probability import bayes_theorem
+
+  # Two hypotheses, A and not A, give back bayes_theorem with P(B) computed for us
+  p_a, p_b_given_a, p_b_given_not_a = 0.01, 0.9, 0.05
+  posterior = Posterior([p_a, 1 - p_a])
+  p_b = posterior.update([p_b_given_a, p_b_given_not_a])
+  print(posterior[0], bayes_theorem(p_a, p_b, p_b_given_a))
+
+  # Which of 101 coins (P(heads) = 0, 0.01, ..., 1) was flipped, after 1000 flips.
+  # The likelihood of the whole sequence is far below the smallest float, but
+  # its log is not
+  import random
+  rng = random.Random(0)
+  biases = [i / 100 for i in range(101)]
+  heads, tails = [b for b in biases], [1 - b for b in biases]
+  flips = [rng.random() < 0.37 for _ in range(1000)]
+  posterior = Posterior(len(biases))
+  posterior.update_many(heads if flip else tails for flip in flips)
+  print(posterior.top(3), posterior.log_evidence)
+
+  # An impossible observation is rejected and leaves the posterior unchanged
+  before = list(posterior.probabilities)
+  try:
+    posterior.update([0] * len(biases))
+  except ValueError:
+    pass
+  assert list(posterior.probabilities) == before
@@ -29,11 +29,12 @@ def bayes_theorem(p_a: float, p_b: float, p_b_given_a: float):
   # Here, conditional_probability(p_b_given_a, p_a) computes P(B|A) * P(A)
   return joint_probability(p_b_given_a, p_a) / p_b  # Divide by P(B) to get P(A|B)
 
-p_a = 7/10
-p_b = 7/10
-p_a_and_b = 5/10
+if __name__ == "__main__":
+  p_a = 7/10
+  p_b = 7/10
+  p_a_and_b = 5/10
 
-print(joint_probability(p_a_and_b, p_a))
-print(bayes_theorem(p_a, p_b, p_a_and_b))
+  print(joint_probability(p_a_and_b, p_a))
+  print(bayes_theorem(p_a, p_b, p_a_and_b))
 
-assert isclose(bayes_theorem(0.7, 0.7, 0.5), 0.5)
+  assert isclose(bayes_theorem(0.7, 0.7, 0.5), 0.5)
@@ -1,33 +1,36 @@
 # Mathematical Set of elements
 # Set is a collection of unique elements
+# EventSpace.py has the same operations on bit sets, for event spaces with
+# millions of outcomes
 
-A = {5,3,17,12,19}
-B = {17,19,6}
-C = {5,3,17,12}
-D = {1,2}
+if __name__ == "__main__":
+  A = {5,3,17,12,19}
+  B = {17,19,6}
+  C = {5,3,17,12}
+  D = {1,2}
 
-print(A)
-print(B)
-print(C)
-print(D)
-    
-# Union - Combination of all distinct elements in both sets
-print(A | B)
+  print(A)
+  print(B)
+  print(C)
+  print(D)
 
-# Intersection - Elements that are in both sets
-print(A & B)
+  # Union - Combination of all distinct elements in both sets
+  print(A | B)
 
-# Difference - Elements that are in A but not in B / Relative Complement
-print(A - B)
+  # Intersection - Elements that are in both sets
+  print(A & B)
 
-# Symmetric Difference - Elements that are in A or B but not in both
-print(A ^ B)
+  # Difference - Elements that are in A but not in B / Relative Complement
+  print(A - B)
 
-# isSubset - True if B is a subset of A (lhs, rhs matters)
-print(C < A)
+  # Symmetric Difference - Elements that are in A or B but not in both
+  print(A ^ B)
 
-# isSuperset - True if A is a superset of B (lhs, rhs matters)
-print(A > C)
+  # isSubset - True if B is a subset of A (lhs, rhs matters)
+  print(C < A)
 
-# isdisjoint - True if A and B have no elements in common
-print(D.isdisjoint(A))
\ No newline at end of file
+  # isSuperset - True if A is a superset of B (lhs, rhs matters)
+  print(A > C)
+
+  # isdisjoint - True if A and B have no elements in common
+  print(D.isdisjoint(A))
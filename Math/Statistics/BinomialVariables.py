@@ -1,4 +1,175 @@
-from Combinatorics import combination
+from array import array
+from math import exp, floor, inf, lgamma, log, log1p, sqrt
+from random import Random
+from .Combinatorics import combination
+from .DiscreteDistribution import BERRY_ESSEEN_CONSTANT, TABLE_MAX_ENTRIES, DiscreteDistribution, inversion_samples, log_table_from_mode, normal_sf, table_cache, table_windows, tables_from_logs
+from .PoissonDistribution import Poisson
+
+# Largest n sampled by inversion over the cached table of B(n, p)
+_INVERSION_MAX_N = 4096
+
+@table_cache(TABLE_MAX_ENTRIES)
+def _binomial_tables(n: int, p: float, start: int, stop: int) -> tuple[array, array, array]:
+  """
+  The (pmf, cdf, sf) tables of B(n, p) for k = start..stop-1, built in one
+  O(stop - start) pass and cached per (n, p, start, stop). The mass outside the
+  range is left out, so start and stop should be well clear of the mode.
+  """
+  size = stop - start
+  if p == 0 or p == 1:
+    logs = [-inf] * size
+    logs[(0 if p == 0 else n) - start] = 0.0
+    return tables_from_logs(logs)
+
+  # Start from the most likely k, computed directly, and walk outwards with
+  # P(k + 1) / P(k) = (n - k) / (k + 1) * p / (1 - p)
+  mode = min(n, floor((n + 1) * p))
+  log_p, log_q = log(p), log1p(-p)
+  log_mode = (
+    lgamma(n + 1) - lgamma(mode + 1) - lgamma(n - mode + 1)
+    + mode * log_p + (n - mode) * log_q
+  )
+  log_odds = log_p - log_q
+  logs = log_table_from_mode(mode - start, log_mode, size, lambda i: log(n - start - i) - log(start + i + 1) + log_odds)
+  return tables_from_logs(logs)
+
+def _binomial_sequential(n: int, p: float, rng: Random, size: int) -> list[int]:
+  """
+  Inversion without a table (BINV, Kachitvichyanukul & Schmeiser 1988) for
+  p <= 1/2 and small n * p: walks k = 0, 1, ... subtracting P(k) from U,
+  about n * p + 1 steps per draw.
+  """
+  q = 1 - p
+  s = p / q
+  a = (n + 1) * s
+  first = exp(n * log1p(-p))
+  draws = []
+  while len(draws) < size:
+    u = rng.random()
+    k = 0
+    term = first
+    while u > term and k < n:
+      u -= term
+      k += 1
+      term *= a / k - s
+    # k == n with u still left over is a rounding artefact, so draw again
+    if u <= term:
+      draws.append(k)
+  return draws
+
+def _binomial_btrs(n: int, p: float, rng: Random, size: int) -> list[int]:
+  """
+  Transformed rejection with squeeze (BTRS, Hormann 1993) for p <= 1/2 and
+  n * p >= 10. A transformed uniform proposes k, most proposals are accepted by
+  a cheap squeeze test and the rest by comparing against log P(k).
+  """
+  spq = sqrt(n * p * (1 - p))
+  b = 1.15 + 2.53 * spq
+  a = -0.0873 + 0.0248 * b + 0.01 * p
+  c = n * p + 0.5
+  v_r = 0.92 - 4.2 / b
+  alpha = (2.83 + 5.1 / b) * spq
+  log_odds = log(p / (1 - p))
+  m = floor((n + 1) * p)
+  h = lgamma(m + 1) + lgamma(n - m + 1)
+  draws = []
+  while len(draws) < size:
+    u = rng.random() - 0.5
+    v = rng.random()
+    us = 0.5 - abs(u)
+    k = floor((2 * a / us + b) * u + c)
+    if k < 0 or k > n:
+      continue
+    if us >= 0.07 and v <= v_r:
+      draws.append(k)
+      continue
+    v = log(v * alpha / (a / (us * us) + b))
+    if v <= h - lgamma(k + 1) - lgamma(n - k + 1) + (k - m) * log_odds:
+      draws.append(k)
+  return draws
+
+class Binomial(DiscreteDistribution):
+  """
+  Number of successes in n independent trials with success probability p.
+  Example: Binomial(7, 0.35).cdf([0, 1, 2])
+  """
+  def __init__(self, n: int, p: float) -> None:
+    if n < 0:
+      raise ValueError("n must be a non-negative integer")
+    if not (0 <= p <= 1):
+      raise ValueError("p must be between 0 and 1")
+    self.n = n
+    self.p = p
+    self.support_max = n
+
+  def _windows(self) -> tuple[tuple[int, int], tuple[int, int]]:
+    return table_windows(self._mode(), sqrt(self.variance), self.n)
+
+  def _tables(self) -> tuple[int, tuple[array, array, array]]:
+    start, top = self._windows()[1]
+    return start, _binomial_tables(self.n, self.p, start, top + 1)
+
+  def _table_window(self) -> tuple[int, int]:
+    return self._windows()[0]
+
+  def _logpmf(self, k: int) -> float:
+    n, p = self.n, self.p
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1) + k * log(p) + (n - k) * log1p(-p)
+
+  def _log_ratio(self, k: int) -> float:
+    return log(self.n - k) - log(k + 1) + log(self.p) - log1p(-self.p)
+
+  def _mode(self) -> int:
+    return min(self.n, floor((self.n + 1) * self.p))
+
+  def _point_mass(self) -> int | None:
+    if self.p == 0:
+      return 0
+    if self.p == 1:
+      return self.n
+    return None
+
+  def _approximation_bounds(self) -> dict[str, float]:
+    if self._point_mass() is not None or self.n == 0:
+      return {}
+    p, q = self.p, 1 - self.p
+    return {
+      # Berry-Esseen for a sum of n Bernoulli(p): E|Y - p|^3 / sd^3 = (p^2 + q^2) / sqrt(pq)
+      "normal": min(1.0, BERRY_ESSEEN_CONSTANT * (p * p + q * q) / sqrt(self.n * p * q)),
+      "poisson": p * (1 - exp(-self.n * p)),
+    }
+
+  def _approximate_sf(self, method: str, k: int) -> float:
+    if method == "normal":
+      return normal_sf(k, self.mean, self.variance)
+    return exp(Poisson(self.n * self.p)._logsf(k))
+
+  def _sample(self, rng: Random, size: int) -> list[int]:
+    n, p = self.n, self.p
+    point = self._point_mass()
+    if point is not None or n == 0:
+      return [point or 0] * size
+    if n <= _INVERSION_MAX_N:
+      # The last cdf entry can round to just below 1, so clamp the rare overshoot
+      start, (_, cdf, _) = self._tables()
+      last = len(cdf) - 1
+      return [start + (i if i <= last else last) for i in inversion_samples(cdf, rng, size)]
+    # Both algorithms need p <= 1/2, so for larger p count the failures instead
+    q = min(p, 1 - p)
+    draw = _binomial_btrs if n * q >= 10 else _binomial_sequential
+    draws = draw(n, q, rng, size)
+    return draws if q == p else [n - k for k in draws]
+
+  @property
+  def mean(self) -> float:
+    return self.n * self.p
+
+  @property
+  def variance(self) -> float:
+    return self.n * self.p * (1 - self.p)
+
+  def __repr__(self) -> str:
+    return f"Binomial(n={self.n}, p={self.p})"
 
 def binomial_probability(n: int,k :int) -> float:
   """
@@ -15,7 +186,16 @@ def binompdf(n: int, k: int, success_probability: float) -> float:
   if not (0 <= success_probability <= 1):
     raise ValueError("success_probability must be between 0 and 1")
   # This is the binomial probability distribution function
-  return combination(n, k) * (success_probability ** k) * ((1 - success_probability) ** (n - k))
+  # combination(n, k) * (success_probability ** k) * ((1 - success_probability) ** (n - k))
+  return Binomial(n, success_probability).pmf(k)
+
+def log_binompdf(n: int, k: int, success_probability: float) -> float:
+  if not (0 <= k <= n):
+    raise ValueError("k must be between 0 and n (inclusive)")
+  if not (0 <= success_probability <= 1):
+    raise ValueError("success_probability must be between 0 and 1")
+  # log of binompdf, safe for large n and k where binompdf underflows to 0
+  return Binomial(n, success_probability).logpmf(k)
 
 def binomcdf(n: int, k: int, success_probability: float) -> float:
   if not (0 <= k <= n):
@@ -23,7 +203,9 @@ def binomcdf(n: int, k: int, success_probability: float) -> float:
   if not (0 <= success_probability <= 1):
     raise ValueError("success_probability must be between 0 and 1")
   # This is the binomial cumulative distribution function
-  return sum(binompdf(n, i, success_probability) for i in range(k + 1))
+  # sum(binompdf(n, i, success_probability) for i in range(k + 1)), read from the
+  # cached table around the mode of B(n, p), or summed in log space for k in a tail
+  return Binomial(n, success_probability).cdf(k)
 
 def bernoulli_mean(p: float) -> float:
   if not (0 <= p <= 1):
@@ -76,9 +258,10 @@ def standard_deviation(n: int, p: float) -> float:
   
   return variance(n, p) ** 0.5
 
-print(f"{binomial_probability(60, 4) * 100}%")
-print(f"{binompdf(7, 4, 0.35) * 100}%")
-print(f"{binomcdf(7, 4, 0.35) * 100}%")
+if __name__ == "__main__":
+  print(f"{binomial_probability(60, 4) * 100}%")
+  print(f"{binompdf(7, 4, 0.35) * 100}%")
+  print(f"{binomcdf(7, 4, 0.35) * 100}%")
 
-print(f"{expected_value(500, 0.02)}")
-print(f"{standard_deviation(500, 0.02)}")
\ No newline at end of file
+  print(f"{expected_value(500, 0.02)}")
+  print(f"{standard_deviation(500, 0.02)}")
@@ -1,9 +1,213 @@
+from collections import OrderedDict
 from math import prod, perm, comb
+from typing import NamedTuple
+
+# Opt-in cache for the functions below, for callers that hit the same (n, r)
+# pairs over and over. It is disabled by default; enable_cache() turns it on for
+# factorial, permutation and combination, and also backs pascal_row and
+# combination_mod with reusable tables.
+
+# Miller-Rabin with these bases is exact for every p < 3.3 * 10**24
+_PRIME_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+_PRIME_BASES_LIMIT = 3_317_044_064_679_887_385_961_981
+
+def _is_prime(p: int) -> bool:
+  """
+  Whether p is prime; numbers past _PRIME_BASES_LIMIT count as not prime, so
+  callers fall back to the slower path that works for any modulus.
+  """
+  if p < 2 or p >= _PRIME_BASES_LIMIT:
+    return False
+  for q in _PRIME_BASES:
+    if p % q == 0:
+      return p == q
+  d, s = p - 1, 0
+  while d % 2 == 0:
+    d //= 2
+    s += 1
+  for a in _PRIME_BASES:
+    x = pow(a, d, p)
+    if x == 1 or x == p - 1:
+      continue
+    for _ in range(s - 1):
+      x = x * x % p
+      if x == p - 1:
+        break
+    else:
+      return False
+  return True
+
+# Distance between the factorials CombinatoricsCache keeps
+_FACTORIAL_STEP = 256
+# Moduli whose factorial tables CombinatoricsCache keeps
+_MOD_TABLES_KEPT = 8
+
+class CacheInfo(NamedTuple):
+  hits: int
+  misses: int
+  maxsize: int
+  currsize: int
+
+class CombinatoricsCache:
+  """
+  Memoized combinatorics:
+  - an LRU store of permutation/combination/Pascal-row results, holding at most
+    maxsize entries (the least recently used one is evicted first)
+  - every _FACTORIAL_STEP-th factorial up to factorial_limit, grown as needed,
+    so n! costs fewer than _FACTORIAL_STEP multiplications from the nearest one
+    below without keeping every k! (about 75 MB up to 10_000!)
+  - factorial and inverse factorial tables mod a prime p for combination_mod, of
+    at most factorial_limit entries, for the _MOD_TABLES_KEPT most recently
+    used primes, and the primality of the last maxsize moduli
+  """
+  def __init__(self, maxsize: int = 4096, factorial_limit: int = 10_000) -> None:
+    if maxsize < 1:
+      raise ValueError("maxsize must be a positive integer")
+    self.maxsize = maxsize
+    self.factorial_limit = factorial_limit
+    self.hits = 0
+    self.misses = 0
+    self._entries: OrderedDict[tuple, object] = OrderedDict()
+    # _factorials[j] = (j * _FACTORIAL_STEP)!
+    self._factorials = [1]
+    self._mod_tables: OrderedDict[int, tuple[list[int], list[int]]] = OrderedDict()
+    self._primality: OrderedDict[int, bool] = OrderedDict()
+
+  def _lookup(self, key: tuple, compute):
+    if key in self._entries:
+      self.hits += 1
+      self._entries.move_to_end(key)
+      return self._entries[key]
+    self.misses += 1
+    value = compute()
+    self._entries[key] = value
+    if len(self._entries) > self.maxsize:
+      self._entries.popitem(last=False)
+    return value
+
+  def factorial(self, num: int) -> int:
+    if num > self.factorial_limit:
+      self.misses += 1
+      return prod(range(1, num + 1))
+    table = self._factorials
+    checkpoint = num // _FACTORIAL_STEP
+    if checkpoint < len(table):
+      self.hits += 1
+    else:
+      self.misses += 1
+      for j in range(len(table), checkpoint + 1):
+        table.append(table[-1] * prod(range((j - 1) * _FACTORIAL_STEP + 1, j * _FACTORIAL_STEP + 1)))
+    return table[checkpoint] * prod(range(checkpoint * _FACTORIAL_STEP + 1, num + 1))
+
+  def permutation(self, n: int, r: int) -> int:
+    return self._lookup(("perm", n, r), lambda: perm(n, r))
+
+  def combination(self, n: int, r: int) -> int:
+    return self._lookup(("comb", n, r), lambda: comb(n, r))
+
+  def pascal_row(self, n: int) -> list[int]:
+    # Rows are cached as tuples so callers cannot change the cached copy
+    return list(self._lookup(("row", n), lambda: tuple(_pascal_row(n))))
+
+  def _is_prime(self, p: int) -> bool:
+    primality = self._primality
+    if p in primality:
+      primality.move_to_end(p)
+      return primality[p]
+    primality[p] = result = _is_prime(p)
+    if len(primality) > self.maxsize:
+      primality.popitem(last=False)
+    return result
+
+  def _mod_tables_for(self, size: int, p: int) -> tuple[list[int], list[int]]:
+    """
+    Returns (fact, inv_fact) with fact[i] = i! mod p and inv_fact[i] = (i!)^-1 mod p
+    for at least i = 0..size-1, extending the cached tables when needed.
+    """
+    tables = self._mod_tables
+    fact, inv_fact = tables.get(p, ([1], [1]))
+    if p in tables:
+      tables.move_to_end(p)
+    if len(fact) >= size:
+      self.hits += 1
+      return fact, inv_fact
+    self.misses += 1
+    start = len(fact)
+    for i in range(start, size):
+      fact.append(fact[-1] * i % p)
+    # One modular exponentiation (Fermat's little theorem) for the largest inverse,
+    # then (i - 1)!^-1 = i!^-1 * i walks the rest of the new entries down
+    new_inverses = [0] * (size - start)
+    new_inverses[-1] = pow(fact[size - 1], p - 2, p)
+    for i in range(size - 1, start, -1):
+      new_inverses[i - 1 - start] = new_inverses[i - start] * i % p
+    inv_fact.extend(new_inverses)
+    tables[p] = (fact, inv_fact)
+    if len(tables) > _MOD_TABLES_KEPT:
+      tables.popitem(last=False)
+    return fact, inv_fact
+
+  def combination_mod(self, n: int, r: int, p: int) -> int:
+    # Lucas' theorem: C(n, r) mod p is the product of C(n_i, r_i) mod p over the
+    # base p digits of n and r, so the tables only need to reach the largest
+    # digit of n. They hold inverses, which only exist for a prime p, and are
+    # capped at factorial_limit entries; otherwise the exact value is reduced.
+    digits, rest = [], n
+    while rest:
+      digits.append(rest % p)
+      rest //= p
+    size = max(digits, default=0) + 1
+    if size > self.factorial_limit or not self._is_prime(p):
+      self.misses += 1
+      return comb(n, r) % p
+    fact, inv_fact = self._mod_tables_for(size, p)
+    result = 1
+    while n or r:
+      n_digit, r_digit = n % p, r % p
+      if r_digit > n_digit:
+        return 0
+      result = result * fact[n_digit] * inv_fact[r_digit] * inv_fact[n_digit - r_digit] % p
+      n //= p
+      r //= p
+    return result
+
+  def cache_info(self) -> CacheInfo:
+    return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+  def cache_clear(self) -> None:
+    self._entries.clear()
+    self._factorials = [1]
+    self._mod_tables.clear()
+    self._primality.clear()
+    self.hits = 0
+    self.misses = 0
+
+_cache: CombinatoricsCache | None = None
+
+def enable_cache(maxsize: int = 4096, factorial_limit: int = 10_000) -> CombinatoricsCache:
+  """
+  Turns on memoization for the functions in this module and returns the cache.
+  """
+  global _cache
+  _cache = CombinatoricsCache(maxsize, factorial_limit)
+  return _cache
+
+def disable_cache() -> None:
+  global _cache
+  _cache = None
+
+def cache_info() -> CacheInfo | None:
+  """
+  Hit/miss statistics of the active cache, or None when caching is disabled.
+  """
+  return _cache.cache_info() if _cache is not None else None
+
 
 # Can also use math.factorial, which is much faster than even this implementation
 def factorial(num : int) -> int:
   if num == 0: return 1
   if num < 0: raise ValueError("Factorial is not defined for negative numbers")
+  if _cache is not None: return _cache.factorial(num)
 
   # x = 1
   # for i in range(1, num + 1):
@@ -17,6 +221,7 @@ def factorial(num : int) -> int:
 def permutation(n: int, r: int) -> int:
   if r > n: return 0
   if n < 0 or r < 0: raise ValueError("n and r must be non-negative integers")
+  if _cache is not None: return _cache.permutation(n, r)
   # return factorial(n) // factorial(n - r)
 
   # Calculate the number of permutations of n items taken r at a time
@@ -32,6 +237,7 @@ def permutation(n: int, r: int) -> int:
 def combination(n: int, r: int) -> int:
   if r > n: return 0
   if n < 0 or r < 0: raise ValueError("n and r must be non-negative integers")
+  if _cache is not None: return _cache.combination(n, r)
   # return permutation(n, r) // factorial(r)
   
   # Calculate the number of combinations of n items taken r at a time
@@ -43,8 +249,32 @@ def combination(n: int, r: int) -> int:
   # Combination using math.comb which is more efficient than python factorials
   return comb(n, r)
 
-assert combination(5, 2) == 10
-assert permutation(5, 2) == 20
+def _pascal_row(n: int) -> list[int]:
+  # Each entry follows from the previous one: C(n, k + 1) = C(n, k) * (n - k) / (k + 1)
+  row = [1] * (n + 1)
+  for k in range(n):
+    row[k + 1] = row[k] * (n - k) // (k + 1)
+  return row
+
+def pascal_row(n: int) -> list[int]:
+  if n < 0: raise ValueError("n must be a non-negative integer")
+  # Row n of Pascal's triangle, [C(n, 0), C(n, 1), ..., C(n, n)], in O(n)
+  # multiplications instead of n + 1 separate combinations
+  if _cache is not None: return _cache.pascal_row(n)
+  return _pascal_row(n)
+
+def combination_mod(n: int, r: int, p: int) -> int:
+  if n < 0 or r < 0: raise ValueError("n and r must be non-negative integers")
+  if p < 2: raise ValueError("p must be an integer >= 2")
+  if r > n: return 0
+  # C(n, r) mod p. With the cache enabled and a prime p this uses precomputed
+  # factorials and inverse factorials mod p, otherwise the exact value is reduced
+  if _cache is not None: return _cache.combination_mod(n, r, p)
+  return comb(n, r) % p
+
+if __name__ == "__main__":
+  assert combination(5, 2) == 10
+  assert permutation(5, 2) == 20
 
-print(permutation(5, 3))
-print(combination(60, 4))
+  print(permutation(5, 3))
+  print(combination(60, 4))
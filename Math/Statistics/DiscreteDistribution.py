@@ -0,0 +1,380 @@
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate, islice, repeat
+from math import erfc, exp, inf, log, log1p, sqrt
+from operator import index
+from random import Random
+from threading import Lock
+from typing import Callable, NamedTuple, Sequence, Union
+
+# A discrete distribution over the integers 0, 1, 2, ... whose probabilities are
+# evaluated as a whole table at once.
+#
+# Neighbouring probabilities of the binomial and Poisson distributions differ by a
+# simple ratio (the "term-ratio recurrence"), e.g. for Poisson:
+#   P(k + 1) = P(k) * lambda / (k + 1)
+# so a table of consecutive k costs O(1) per k instead of one factorial and power
+# per k. The recurrence is run on log P(k), starting from the mode (the largest
+# term, computed directly), which keeps it from underflowing or overflowing for
+# large n and k.
+#
+# Tables only cover the mode plus or minus 24 standard deviations, and are only
+# read for the k within 12 standard deviations of the mode: further out each
+# probability is computed on its own in log space (below). So a table costs O(sd)
+# rather than O(n), and a k far in a tail builds no table at all. Tables are
+# cached by TableCache, which bounds the total number of entries kept rather than
+# the number of tables.
+#
+# pmf, cdf and sf accept a single k or a sequence of k, and return a float or a
+# list of floats to match.
+#
+# Outside the window, and for distributions so wide that the window would not fit
+# in the cache, there is a table-free log-space path:
+#   logpmf(k) - log P(X = k) straight from lgamma, O(1) per k
+#   logsf(k)  - log P(X > k), summing only the terms that still change the result
+# Both work with logarithms throughout, so they return -inf for impossible values
+# but never overflow to inf or nan.
+#
+# tail_probability(k, method) trades exactness for speed with the classic
+# approximations, each reported with a proven bound on its absolute error:
+#   "normal"  - Berry-Esseen: |error| <= 0.4748 * E|X - mean|^3 / (sd^3 * sqrt(n))
+#   "poisson" - (binomial only) Barbour-Hall: |error| <= p * (1 - e^(-np))
+#
+# sample(size, seed) draws random values of X. When the pmf table is small the
+# draws use inversion: one uniform U per draw and a binary search for the first k
+# with U < cdf[k], all over a cached table. Large n or lbd use transformed
+# rejection instead (Hormann, 1993), which needs O(1) work per draw and no table.
+
+IntOrInts = Union[int, Sequence[int]]
+
+# Relative size below which a term no longer changes a running sum of probabilities
+_NEGLIGIBLE = 1e-17
+
+class TailProbability(NamedTuple):
+  probability: float
+  error_bound: float
+  method: str
+
+def _map_k(k: IntOrInts, fn: Callable[[int], float]) -> float | list[float]:
+  if isinstance(k, Sequence):
+    return [fn(index(x)) for x in k]
+  return fn(index(k))
+
+def log_table_from_mode(mode: int, log_mode: float, size: int, log_ratio) -> list[float]:
+  """
+  Fills log P(k) for k = 0..size-1 from log P(mode) using
+  log P(k + 1) = log P(k) + log_ratio(k), walking up and down from the mode.
+  """
+  logs = [0.0] * size
+  logs[mode] = log_mode
+  for k in range(mode, size - 1):
+    logs[k + 1] = logs[k] + log_ratio(k)
+  for k in range(mode - 1, -1, -1):
+    logs[k] = logs[k + 1] - log_ratio(k)
+  return logs
+
+def inversion_samples(cdf: Sequence[float], rng: Random, size: int) -> list[int]:
+  """
+  size draws of the smallest k with U < cdf[k], for uniform U in [0, 1).
+  A draw equals len(cdf) when U is beyond the end of the table.
+  """
+  uniforms = islice(iter(rng.random, None), size)
+  return list(map(bisect_right, repeat(cdf), uniforms))
+
+def as_rng(seed: "int | Random | None") -> Random:
+  """
+  A Random seeded with seed, or seed itself when it already is a Random, so that
+  repeated calls continue one stream.
+  """
+  return seed if isinstance(seed, Random) else Random(seed)
+
+def tables_from_logs(logs: list[float]) -> tuple[array, array, array]:
+  """
+  Returns (pmf, cdf, sf) tables, where cdf[k] = P(X <= k) and sf[k] = P(X > k).
+  The survival function is accumulated from the right so small upper tails keep
+  their precision instead of being computed as 1 - cdf.
+  """
+  pmf = array("d", map(exp, logs))
+  # Rounding in the recurrence and the running sums can push the total a few ulps
+  # past 1, which a probability must not do
+  cdf = array("d", map(min, accumulate(pmf), repeat(1.0)))
+  sf = array("d", map(min, accumulate(reversed(pmf[1:]), initial=0.0), repeat(1.0)))
+  sf.reverse()
+  return pmf, cdf, sf
+
+
+class TableCache:
+  """
+  Least recently used cache of the (pmf, cdf, sf) tables built by fn, keyed by
+  its arguments. It is bounded by the total number of table entries rather than
+  by the number of tables, so a few wide tables cannot fill memory; a table
+  larger than the whole budget is returned without being kept.
+  """
+  def __init__(self, fn: Callable[..., tuple[array, array, array]], max_entries: int) -> None:
+    self.fn = fn
+    self.max_entries = max_entries
+    self.entries = 0
+    self._tables: OrderedDict = OrderedDict()
+    self._lock = Lock()
+
+  def __call__(self, *key) -> tuple[array, array, array]:
+    with self._lock:
+      tables = self._tables.get(key)
+      if tables is not None:
+        self._tables.move_to_end(key)
+        return tables
+    tables = self.fn(*key)
+    size = len(tables[0])
+    if size > self.max_entries:
+      return tables
+    with self._lock:
+      if key not in self._tables:
+        self._tables[key] = tables
+        self.entries += size
+        while self.entries > self.max_entries:
+          _, (evicted, _, _) = self._tables.popitem(last=False)
+          self.entries -= len(evicted)
+    return tables
+
+  def cache_clear(self) -> None:
+    with self._lock:
+      self._tables.clear()
+      self.entries = 0
+
+def table_cache(max_entries: int) -> Callable[[Callable], TableCache]:
+  """
+  Decorator form of TableCache, like functools.lru_cache.
+  """
+  return lambda fn: TableCache(fn, max_entries)
+
+# Entries kept by each distribution's TableCache (three arrays of doubles each,
+# so about 24 MB), and so also the widest table that is built at all
+TABLE_MAX_ENTRIES = 1 << 20
+
+def table_windows(mode: int, sd: float, support_max: int | None) -> tuple[tuple[int, int], tuple[int, int]]:
+  """
+  The range of k read from the tables and the wider range they are built over,
+  both inclusive: the mode plus or minus 12 and 24 standard deviations (and a
+  few terms more, for a small sd), within the support. The margin keeps the
+  mass the table leaves out negligible next to every value read from it. When
+  the table would not fit in a TableCache the read range is empty.
+  """
+  spread = int(12 * sd) + 16
+  top = mode + 2 * spread if support_max is None else min(support_max, mode + 2 * spread)
+  built = (max(0, mode - 2 * spread), top)
+  if built[1] - built[0] >= TABLE_MAX_ENTRIES:
+    return (0, -1), built
+  read = (max(0, mode - spread), min(top, mode + spread))
+  return read, built
+
+
+class DiscreteDistribution:
+  """
+  Subclasses implement _tables(), returning (start, (pmf, cdf, sf)) for tables
+  whose entry i is k = start + i, _table_window(), the range of k read from
+  them, and support_max (None for an unbounded support).
+  """
+  support_max: int | None = None
+
+  def _tables(self) -> tuple[int, tuple[array, array, array]]:
+    raise NotImplementedError
+
+  def _table_window(self) -> tuple[int, int]:
+    """
+    The smallest and largest k read from the tables. Outside them each value is
+    computed on its own in log space, so a k far in a tail does not build (and
+    cache) a table reaching it.
+    """
+    raise NotImplementedError
+
+  # Log-space hooks implemented by subclasses
+  def _logpmf(self, k: int) -> float:
+    raise NotImplementedError
+
+  def _log_ratio(self, k: int) -> float:
+    """
+    log P(k + 1) - log P(k)
+    """
+    raise NotImplementedError
+
+  def _mode(self) -> int:
+    raise NotImplementedError
+
+  def _point_mass(self) -> int | None:
+    """
+    The only possible value for a degenerate distribution (e.g. p = 0), else None.
+    """
+    return None
+
+  def _approximation_bounds(self) -> dict[str, float]:
+    """
+    Error bound of every tail approximation this distribution supports.
+    """
+    return {}
+
+  def _approximate_sf(self, method: str, k: int) -> float:
+    raise NotImplementedError
+
+  def _sample(self, rng: Random, size: int) -> list[int]:
+    raise NotImplementedError
+
+  def sample(self, size: int | None = None, seed: int | Random | None = None) -> int | list[int]:
+    """
+    Random values of X: one int, or a list of size ints. The same seed gives
+    the same values; a random.Random as seed is used (and advanced) as is.
+    """
+    rng = as_rng(seed)
+    if size is None:
+      return self._sample(rng, 1)[0]
+    if size < 0:
+      raise ValueError("size must be a non-negative integer")
+    return self._sample(rng, size)
+
+  def _evaluate(self, k: IntOrInts, which: int, below: float, above: float) -> float | list[float]:
+    single = not isinstance(k, Sequence)
+    ks = [index(k)] if single else [index(x) for x in k]
+    if not ks:
+      return []
+    low, high = self._table_window()
+    # Only built once some k needs it
+    table = None
+
+    results = []
+    for x in ks:
+      if x < 0:
+        results.append(below)
+      elif self.support_max is not None and x > self.support_max:
+        results.append(above)
+      elif x < low or x > high:
+        results.append(self._untabulated(x, which))
+      else:
+        if table is None:
+          start, tables = self._tables()
+          table = tables[which]
+        results.append(table[x - start])
+    return results[0] if single else results
+
+  def _untabulated(self, k: int, which: int) -> float:
+    # pmf, cdf or sf (by table index) of one k outside _table_window()
+    if which == 0:
+      return exp(self._logpmf_checked(k))
+    if k < self._mode():
+      # Summed directly, as 1 - sf would lose a small lower tail to rounding
+      cdf = exp(self._log_sum(k, -1))
+      return cdf if which == 1 else 1 - cdf
+    sf = exp(self._logsf(k))
+    return sf if which == 2 else 1 - sf
+
+  def pmf(self, k: IntOrInts) -> float | list[float]:
+    """
+    P(X = k)
+    """
+    return self._evaluate(k, 0, 0.0, 0.0)
+
+  def cdf(self, k: IntOrInts) -> float | list[float]:
+    """
+    P(X <= k)
+    """
+    return self._evaluate(k, 1, 0.0, 1.0)
+
+  def sf(self, k: IntOrInts) -> float | list[float]:
+    """
+    P(X > k), the survival function
+    """
+    return self._evaluate(k, 2, 1.0, 0.0)
+
+  def logpmf(self, k: IntOrInts) -> float | list[float]:
+    """
+    log P(X = k), without building a table
+    """
+    return _map_k(k, self._logpmf_checked)
+
+  def _logpmf_checked(self, k: int) -> float:
+    if k < 0 or (self.support_max is not None and k > self.support_max):
+      return -inf
+    point = self._point_mass()
+    if point is not None:
+      return 0.0 if k == point else -inf
+    return self._logpmf(k)
+
+  def _log_sum(self, start: int, step: int) -> float:
+    """
+    log of P(start) + P(start + step) + P(start + 2 * step) + ..., walking away
+    from the mode so that the terms keep shrinking, and stopping once they no
+    longer change the sum.
+    """
+    log_first = self._logpmf_checked(start)
+    if log_first == -inf:
+      return -inf
+    # Sum the terms relative to the first one, which is the largest
+    total = 1.0
+    log_term = log_first
+    j = start
+    while True:
+      if step > 0:
+        if self.support_max is not None and j >= self.support_max:
+          break
+        log_term += self._log_ratio(j)
+        j += 1
+      else:
+        if j == 0:
+          break
+        j -= 1
+        log_term -= self._log_ratio(j)
+      term = exp(log_term - log_first)
+      total += term
+      if term < total * _NEGLIGIBLE:
+        break
+    return log_first + log(total)
+
+  def _logsf(self, k: int) -> float:
+    if k < 0:
+      return 0.0
+    if self.support_max is not None and k >= self.support_max:
+      return -inf
+    point = self._point_mass()
+    if point is not None:
+      return 0.0 if k < point else -inf
+    if k >= self._mode():
+      return self._log_sum(k + 1, 1)
+    # Below the mode the lower tail is the short sum: P(X > k) = 1 - P(X <= k)
+    return log1p(-exp(self._log_sum(k, -1)))
+
+  def logsf(self, k: IntOrInts) -> float | list[float]:
+    """
+    log P(X > k), without building a table
+    """
+    return _map_k(k, self._logsf)
+
+  def tail_probability(self, k: int, method: str = "exact", tolerance: float = 1e-3) -> TailProbability:
+    """
+    P(X > k) together with a bound on its absolute error.
+
+    method is "exact", one of the approximations of this distribution ("normal",
+    and "poisson" for a binomial), or "auto" to use the approximation with the
+    smallest error bound if that bound is within tolerance, else the exact sum.
+    """
+    k = index(k)
+    bounds = self._approximation_bounds()
+    if method == "auto":
+      method = "exact"
+      if bounds:
+        best = min(bounds, key=bounds.__getitem__)
+        if bounds[best] <= tolerance:
+          method = best
+    if method == "exact":
+      return TailProbability(exp(self._logsf(k)), 0.0, "exact")
+    if method not in bounds:
+      raise ValueError(f"Unknown method '{method}', expected 'exact', 'auto' or one of {sorted(bounds)}")
+    return TailProbability(self._approximate_sf(method, k), bounds[method], method)
+
+def normal_sf(k: int, mean: float, variance: float) -> float:
+  """
+  P(X > k) for a normal approximation of an integer valued X, with continuity correction.
+  """
+  return 0.5 * erfc((k + 0.5 - mean) / sqrt(2 * variance))
+
+# Best known constant of the Berry-Esseen inequality for sums of i.i.d. variables
+# (Shevtsova, 2011)
+BERRY_ESSEEN_CONSTANT = 0.4748
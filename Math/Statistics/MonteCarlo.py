@@ -0,0 +1,259 @@
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from itertools import accumulate, islice, repeat
+from math import fsum, sqrt
+from random import Random, SystemRandom
+from typing import Any, Callable, NamedTuple, Sequence
+
+from ..Probability.Probability import bayes_theorem
+from .BinomialVariables import Binomial, expected_value as binomial_expected_value, variance as binomial_variance
+from .DiscreteDistribution import DiscreteDistribution
+from .RandomVariables import MomentAccumulator, mean_fsum, variance
+
+# Monte Carlo estimation: draw many random samples, reduce them to a mean (and
+# higher moments), and compare that with the value computed in closed form.
+#
+# A sampler is any callable sampler(size, rng) returning size draws, e.g. the
+# sample method of a Binomial or Poisson. It may also return a pair
+# (values, weights) to estimate a weighted mean, which is how a conditional
+# probability P(A|B) is estimated: values are 1 where A happened and the weights
+# are 1 where B happened.
+#
+# Draws are generated in chunks of chunk_size and each chunk is folded into a
+# MomentAccumulator straight away, so memory does not grow with the number of
+# samples. Chunk i gets its own random stream, seeded from (seed, i) by a hash,
+# so the streams are independent of each other, a run is reproducible from its
+# seed, and the result does not depend on how many worker processes computed
+# the chunks.
+
+# Draws per chunk
+DEFAULT_CHUNK_SIZE = 65536
+
+# Number of standard errors an estimate may be away from the exact value and
+# still pass a check (a false alarm about once in 15,000 checks)
+DEFAULT_TOLERANCE_Z = 4.0
+
+class Estimate(NamedTuple):
+  value: float
+  standard_error: float
+  samples: int
+
+  def interval(self, z: float = 1.96) -> tuple[float, float]:
+    """
+    Approximate confidence interval, 95% for the default z.
+    """
+    return self.value - z * self.standard_error, self.value + z * self.standard_error
+
+class Check(NamedTuple):
+  quantity: str
+  exact: float
+  estimate: Estimate
+  z_score: float
+  passed: bool
+
+def stream_seed(seed: int, index: int) -> int:
+  """
+  Seed of the index-th independent random stream derived from seed.
+  """
+  digest = blake2b(f"{seed}:{index}".encode(), digest_size=16).digest()
+  return int.from_bytes(digest, "little")
+
+def _run_chunks(sampler: Callable, seed: int, chunks: Sequence[tuple[int, int]]) -> list[MomentAccumulator]:
+  """
+  Folds each (index, size) chunk into its own accumulator, in one process.
+  """
+  results = []
+  for index, size in chunks:
+    draws = sampler(size, Random(stream_seed(seed, index)))
+    accumulator = MomentAccumulator()
+    if isinstance(draws, tuple):
+      accumulator.update_batch(*draws)
+    else:
+      accumulator.update_batch(draws)
+    results.append(accumulator)
+  return results
+
+def simulate(
+  sampler: Callable[[int, Random], Any],
+  samples: int,
+  seed: int | None = None,
+  chunk_size: int = DEFAULT_CHUNK_SIZE,
+  workers: int = 1,
+) -> MomentAccumulator:
+  """
+  Moments of samples draws of sampler. With workers > 1 the chunks are split
+  between that many processes, so sampler must be picklable (a module level
+  function, or a method of a picklable object such as Binomial(n, p).sample).
+  """
+  if samples < 1:
+    raise ValueError("samples must be a positive integer")
+  if chunk_size < 1:
+    raise ValueError("chunk_size must be a positive integer")
+  if seed is None:
+    seed = SystemRandom().getrandbits(64)
+  chunks = [(index, min(chunk_size, samples - start)) for index, start in enumerate(range(0, samples, chunk_size))]
+
+  if workers <= 1 or len(chunks) == 1:
+    parts = _run_chunks(sampler, seed, chunks)
+  else:
+    shares = [chunks[w::workers] for w in range(workers)]
+    with ProcessPoolExecutor(workers) as pool:
+      results = list(pool.map(_run_chunks, repeat(sampler), repeat(seed), shares))
+    # Back into chunk order, so that merging is the same for any number of workers
+    parts = [None] * len(chunks)
+    for w, share in enumerate(results):
+      parts[w::workers] = share
+
+  total = MomentAccumulator()
+  for part in parts:
+    total.merge(part)
+  return total
+
+def mean_estimate(moments: MomentAccumulator) -> Estimate:
+  # For a weighted mean (a ratio estimate) the effective sample size is the
+  # number of draws with a positive weight
+  return Estimate(moments.mean, sqrt(moments.variance / moments.count), moments.count)
+
+def variance_estimate(moments: MomentAccumulator) -> Estimate:
+  # Var(sample variance) ~ (mu4 - sigma^4) / n = sigma^4 * (kurtosis - 1) / n
+  spread = max(moments.kurtosis - 1, 0.0)
+  return Estimate(moments.variance, moments.variance * sqrt(spread / moments.count), moments.count)
+
+def check(quantity: str, exact: float, estimate: Estimate, z: float = DEFAULT_TOLERANCE_Z) -> Check:
+  """
+  Compares an estimate with the exact value, allowing z standard errors.
+  """
+  error = estimate.value - exact
+  if estimate.standard_error > 0:
+    z_score = error / estimate.standard_error
+  else:
+    z_score = 0.0 if abs(error) <= 1e-12 * max(1.0, abs(exact)) else float("inf")
+  return Check(quantity, exact, estimate, z_score, abs(z_score) <= z)
+
+def verify_distribution(
+  distribution: DiscreteDistribution,
+  samples: int = 1_000_000,
+  seed: int | None = None,
+  chunk_size: int = DEFAULT_CHUNK_SIZE,
+  workers: int = 1,
+  z: float = DEFAULT_TOLERANCE_Z,
+) -> list[Check]:
+  """
+  Checks the mean and variance of a distribution against the moments of its
+  own samples: for a Binomial the expected_value and variance formulas of
+  BinomialVariables, for others (Poisson) its mean and variance properties.
+  """
+  moments = simulate(distribution.sample, samples, seed, chunk_size, workers)
+  if isinstance(distribution, Binomial):
+    mean = binomial_expected_value(distribution.n, distribution.p)
+    spread = binomial_variance(distribution.n, distribution.p)
+  else:
+    mean, spread = distribution.mean, distribution.variance
+  return [
+    check("mean", mean, mean_estimate(moments), z),
+    check("variance", spread, variance_estimate(moments), z),
+  ]
+
+class _DiscreteSampler:
+  """
+  Draws from the values of a discrete random variable with the given
+  probabilities, by inversion over the cumulative probabilities.
+  """
+  def __init__(self, values: Sequence[float], probabilities: Sequence[float]) -> None:
+    total = fsum(probabilities)
+    if total <= 0 or min(probabilities) < 0:
+      raise ValueError("probabilities must be non-negative with a positive sum")
+    self.values = list(values)
+    self.cumulative = [c / total for c in accumulate(probabilities)]
+
+  def __call__(self, size: int, rng: Random) -> list[float]:
+    last = len(self.values) - 1
+    uniforms = islice(iter(rng.random, None), size)
+    return [self.values[min(k, last)] for k in map(bisect_right, repeat(self.cumulative), uniforms)]
+
+def verify_expected_value(
+  values: Sequence[float],
+  probabilities: Sequence[float],
+  samples: int = 1_000_000,
+  seed: int | None = None,
+  chunk_size: int = DEFAULT_CHUNK_SIZE,
+  workers: int = 1,
+  z: float = DEFAULT_TOLERANCE_Z,
+) -> list[Check]:
+  """
+  Checks the expected value and variance of RandomVariables (mean_fsum and
+  variance) for a discrete random variable against simulated draws of it.
+  """
+  if len(values) != len(probabilities):
+    raise ValueError("Values and probabilities must have the same length")
+  moments = simulate(_DiscreteSampler(values, probabilities), samples, seed, chunk_size, workers)
+  mean = mean_fsum(values, probabilities)
+  return [
+    check("mean", mean, mean_estimate(moments), z),
+    check("variance", variance(values, probabilities, mean), variance_estimate(moments), z),
+  ]
+
+class _BayesTrial:
+  """
+  Simulates A ~ Bernoulli(P(A)) and then B with P(B|A) or P(B|not A). Returns
+  (indicator of A, indicator of B) so that the weighted mean is P(A|B).
+  """
+  def __init__(self, p_a: float, p_b_given_a: float, p_b_given_not_a: float) -> None:
+    self.p_a = p_a
+    self.p_b_given_a = p_b_given_a
+    self.p_b_given_not_a = p_b_given_not_a
+
+  def __call__(self, size: int, rng: Random) -> tuple[list[float], list[float]]:
+    a_values, b_weights = [], []
+    uniform = rng.random
+    for _ in range(size):
+      a = uniform() < self.p_a
+      b = uniform() < (self.p_b_given_a if a else self.p_b_given_not_a)
+      a_values.append(1.0 if a else 0.0)
+      b_weights.append(1.0 if b else 0.0)
+    return a_values, b_weights
+
+def verify_bayes_theorem(
+  p_a: float,
+  p_b_given_a: float,
+  p_b_given_not_a: float,
+  samples: int = 1_000_000,
+  seed: int | None = None,
+  chunk_size: int = DEFAULT_CHUNK_SIZE,
+  workers: int = 1,
+  z: float = DEFAULT_TOLERANCE_Z,
+) -> Check:
+  """
+  Checks bayes_theorem(P(A), P(B), P(B|A)) against the fraction of simulated
+  trials with B in which A also happened. P(B) follows from the law of total
+  probability, P(B) = P(B|A) P(A) + P(B|not A) (1 - P(A)).
+  """
+  for p in (p_a, p_b_given_a, p_b_given_not_a):
+    if not (0 <= p <= 1):
+      raise ValueError("Probabilities must be between 0 and 1")
+  p_b = p_b_given_a * p_a + p_b_given_not_a * (1 - p_a)
+  if p_b == 0:
+    raise ValueError("P(B) must be positive")
+  trial = _BayesTrial(p_a, p_b_given_a, p_b_given_not_a)
+  moments = simulate(trial, samples, seed, chunk_size, workers)
+  if moments.total_weight == 0:
+    raise ValueError("B never happened in the simulation, use more samples")
+  # The weighted mean of the A indicators is a proportion, whose standard error
+  # is sqrt(p (1 - p) / count), which is what mean_estimate computes
+  return check("P(A|B)", bayes_theorem(p_a, p_b, p_b_given_a), mean_estimate(moments), z)
+
+if __name__ == "__main__":
+  from .BinomialVariables import Binomial
+  from .PoissonDistribution import Poisson
+
+  for distribution in (Binomial(500, 0.02), Poisson(4)):
+    for result in verify_distribution(distribution, 200_000, seed=1):
+      print(f"{distribution} {result.quantity}: exact {result.exact}, estimate {result.estimate.value:.4f} "
+            f"+- {result.estimate.standard_error:.4f}, passed {result.passed}")
+
+  for result in verify_expected_value([-10000, 40000, 90000], [0.81, 0.18, 0.01], 200_000, seed=1):
+    print(f"Random variable {result.quantity}: exact {result.exact}, estimate {result.estimate.value:.1f}, passed {result.passed}")
+
+  result = verify_bayes_theorem(0.01, 0.9, 0.05, 200_000, seed=1)
+  print(f"P(A|B): exact {result.exact:.4f}, estimate {result.estimate.value:.4f}, passed {result.passed}")
@@ -1,8 +1,154 @@
-from math import factorial
+from array import array
+from math import floor, inf, lgamma, log, sqrt
+from random import Random
+from .DiscreteDistribution import BERRY_ESSEEN_CONSTANT, TABLE_MAX_ENTRIES, DiscreteDistribution, inversion_samples, log_table_from_mode, normal_sf, table_cache, table_windows, tables_from_logs
 
-e = 2.71828
+# lbd below which Poisson(lbd) is sampled by inversion over its cached table
+_INVERSION_MAX_LBD = 100
+
+@table_cache(TABLE_MAX_ENTRIES)
+def _poisson_tables(lbd: float, start: int, stop: int) -> tuple[array, array, array]:
+  """
+  The (pmf, cdf, sf) tables of Poisson(lbd) for k = start..stop-1, cached per
+  (lbd, start, stop).
+  """
+  size = stop - start
+  if lbd == 0:
+    logs = [-inf] * size
+    logs[0] = 0.0
+    return tables_from_logs(logs)
+
+  # Start from the most likely k, computed directly, and walk outwards with
+  # P(k + 1) / P(k) = lbd / (k + 1)
+  mode = min(max(floor(lbd), start), stop - 1)
+  log_lbd = log(lbd)
+  log_mode = mode * log_lbd - lbd - lgamma(mode + 1)
+  logs = log_table_from_mode(mode - start, log_mode, size, lambda i: log_lbd - log(start + i + 1))
+  return tables_from_logs(logs)
+
+def _poisson_ptrs(lbd: float, rng: Random, size: int) -> list[int]:
+  """
+  Transformed rejection with squeeze (PTRS, Hormann 1993) for lbd >= 10.
+  """
+  sqrt_lbd = sqrt(lbd)
+  log_lbd = log(lbd)
+  b = 0.931 + 2.53 * sqrt_lbd
+  a = -0.059 + 0.02483 * b
+  log_inv_alpha = log(1.1239 + 1.1328 / (b - 3.4))
+  v_r = 0.9277 - 3.6224 / (b - 2)
+  draws = []
+  while len(draws) < size:
+    u = rng.random() - 0.5
+    v = rng.random()
+    us = 0.5 - abs(u)
+    k = floor((2 * a / us + b) * u + lbd + 0.43)
+    if us >= 0.07 and v <= v_r:
+      draws.append(k)
+      continue
+    if k < 0 or (us < 0.013 and v > us):
+      continue
+    if log(v) + log_inv_alpha - log(a / (us * us) + b) <= -lbd + k * log_lbd - lgamma(k + 1):
+      draws.append(k)
+  return draws
+
+class Poisson(DiscreteDistribution):
+  """
+  Number of events in an interval when they happen independently at an average
+  rate of lbd per interval.
+  Example: Poisson(4).pmf(range(10))
+  """
+  def __init__(self, lbd: float) -> None:
+    if lbd < 0:
+      raise ValueError("lbd must be non-negative")
+    self.lbd = lbd
+
+  def _windows(self) -> tuple[tuple[int, int], tuple[int, int]]:
+    return table_windows(self._mode(), sqrt(self.lbd), None)
+
+  def _tables(self) -> tuple[int, tuple[array, array, array]]:
+    start, top = self._windows()[1]
+    return start, _poisson_tables(self.lbd, start, top + 1)
+
+  def _table_window(self) -> tuple[int, int]:
+    return self._windows()[0]
+
+  def _logpmf(self, k: int) -> float:
+    return k * log(self.lbd) - self.lbd - lgamma(k + 1)
+
+  def _log_ratio(self, k: int) -> float:
+    return log(self.lbd) - log(k + 1)
+
+  def _mode(self) -> int:
+    return floor(self.lbd)
+
+  def _point_mass(self) -> int | None:
+    return 0 if self.lbd == 0 else None
+
+  def _approximation_bounds(self) -> dict[str, float]:
+    if self.lbd == 0:
+      return {}
+    # Poisson(lbd) is the sum of m Poisson(lbd / m) variables for any m, and as m
+    # grows the Berry-Esseen bound of that sum tends to C / sqrt(lbd)
+    return {"normal": min(1.0, BERRY_ESSEEN_CONSTANT / sqrt(self.lbd))}
+
+  def _approximate_sf(self, method: str, k: int) -> float:
+    return normal_sf(k, self.lbd, self.lbd)
+
+  def _sample(self, rng: Random, size: int) -> list[int]:
+    if self.lbd == 0:
+      return [0] * size
+    if self.lbd >= _INVERSION_MAX_LBD:
+      return _poisson_ptrs(self.lbd, rng, size)
+    # lbd is small enough here for the table to start at 0
+    start, (pmf, cdf, _) = self._tables()
+    draws = inversion_samples(cdf, rng, size)
+    end = start + len(cdf)
+    for i, k in enumerate(draws):
+      if k == len(cdf):
+        # U fell in the (negligible) mass past the table: redraw from the tail
+        # by conditioning on X >= end
+        draws[i] = self._sample_tail(rng, end, pmf[-1])
+      else:
+        draws[i] = start + k
+    return draws
+
+  def _sample_tail(self, rng: Random, end: int, last: float) -> int:
+    # Sequential inversion within X >= end, continuing the recurrence
+    # P(k + 1) = P(k) * lbd / (k + 1) past the end of the table
+    terms = []
+    term = last
+    k = end - 1
+    while True:
+      k += 1
+      term *= self.lbd / k
+      if term == 0:
+        break
+      terms.append(term)
+    u = rng.random() * sum(terms)
+    for offset, term in enumerate(terms):
+      u -= term
+      if u < 0:
+        return end + offset
+    return end + max(len(terms) - 1, 0)
+
+  @property
+  def mean(self) -> float:
+    return self.lbd
+
+  @property
+  def variance(self) -> float:
+    return self.lbd
+
+  def __repr__(self) -> str:
+    return f"Poisson(lbd={self.lbd})"
 
 def poisson_distribution(lbd: float, k: int) -> float:
   # It comes from taking a very large lbd for a binomial distribution
-  return (lbd ** k) * (e ** (-lbd)) / (factorial(k))
-  
\ No newline at end of file
+  # (lbd ** k) * (e ** (-lbd)) / (factorial(k)), read from the cached table
+  # around lbd, or computed in log space for k far from lbd
+  return Poisson(lbd).pmf(k)
+
+def log_poisson_distribution(lbd: float, k: int) -> float:
+  # log of poisson_distribution via lgamma, which stays finite for k in the
+  # hundreds and beyond where lbd ** k / factorial(k) overflows
+  return Poisson(lbd).logpmf(k)
@@ -1,6 +1,12 @@
-from decimal import Decimal, getcontext
+from decimal import Decimal, localcontext
+from itertools import chain, repeat
 from math import fsum
-from typing import Sequence, Union
+from operator import mul, sub
+from typing import Iterable, Sequence, Union
+
+# Precision (significant digits) of the Decimal based functions. They run in a
+# local decimal context, so the global context of other threads is never changed.
+DECIMAL_PRECISION = 50
 
 def mean_with_error(values: Sequence[int], probabilities: Sequence[float]) -> float:
   if len(values) != len(probabilities):
@@ -12,15 +18,16 @@ def mean_decimal(values: Sequence[int], probabilities: Sequence[float]) -> Decim
     raise ValueError("Values and probabilities must have the same length")
   
   # Set the precision for decimal calculations
-  getcontext().prec = 50
+  with localcontext() as ctx:
+    ctx.prec = DECIMAL_PRECISION
 
-  # Convert inputs to Decimal objects
-  decimal_values = [Decimal(str(v)) for v in values] # Convert int to Decimal
-  decimal_probabilities = [Decimal(str(p)) for p in probabilities] # Convert float strings to Decimal
+    # Convert inputs to Decimal objects
+    decimal_values = [Decimal(str(v)) for v in values] # Convert int to Decimal
+    decimal_probabilities = [Decimal(str(p)) for p in probabilities] # Convert float strings to Decimal
 
-  sum_products = Decimal('0')
-  for i in range(len(decimal_values)):
-    sum_products += decimal_values[i] * decimal_probabilities[i]
+    sum_products = Decimal('0')
+    for i in range(len(decimal_values)):
+      sum_products += decimal_values[i] * decimal_probabilities[i]
   
   return sum_products
 
@@ -47,14 +54,15 @@ def variance_with_decimal(values: Sequence[int], probabilities: Sequence[float],
     mean = mean_decimal(values, probabilities)
     
   # Set the precision for decimal calculations
-  getcontext().prec = 50
+  with localcontext() as ctx:
+    ctx.prec = DECIMAL_PRECISION
     
-  decimal_values = [Decimal(str(v)) for v in values] # Convert int to Decimal
-  decimal_probabilities = [Decimal(str(p)) for p in probabilities] # Convert float strings to Decimal
+    decimal_values = [Decimal(str(v)) for v in values] # Convert int to Decimal
+    decimal_probabilities = [Decimal(str(p)) for p in probabilities] # Convert float strings to Decimal
 
-  sum_products = Decimal('0')
-  for i in range(len(decimal_values)):
-    sum_products += ((decimal_values[i] - mean) ** 2) * decimal_probabilities[i]
+    sum_products = Decimal('0')
+    for i in range(len(decimal_values)):
+      sum_products += ((decimal_values[i] - mean) ** 2) * decimal_probabilities[i]
   
   return sum_products
 
@@ -74,25 +82,253 @@ def standard_deviation_with_decimal(values: Union[Decimal, Sequence[int]], proba
     
     values = variance_with_decimal(values, probabilities, mean)
     
-  return values ** Decimal(0.5)
+  with localcontext() as ctx:
+    ctx.prec = DECIMAL_PRECISION
+    return values ** Decimal(0.5)
+
+# Fast precise mode, without Decimal.
+#
+# A float product v * p is rounded, but it can be rewritten exactly as a sum of four
+# products of half-length numbers: splitting each double into a high and a low part of
+# at most 26 significant bits (Veltkamp's split) makes every partial product fit in 53
+# bits, so none of them is rounded. math.fsum then adds all the partial products
+# without any intermediate rounding, which gives the exact sum of the products rounded
+# once to the nearest float. Every step is a map() over operator functions or fsum, so
+# the loops run in C.
+
+# 2^27 + 1, the Veltkamp splitting constant for doubles
+_SPLITTER = 134217729.0
+
+def _split(xs: Sequence[float]) -> tuple[list[float], list[float]]:
+  # x == high + low exactly, both with at most 26 significant bits
+  scaled = list(map(mul, xs, repeat(_SPLITTER)))
+  high = list(map(sub, scaled, map(sub, scaled, xs)))
+  low = list(map(sub, xs, high))
+  return high, low
+
+def _exact_products(xs: Sequence[float], ys: Sequence[float]) -> Iterable[float]:
+  # x * y == xh*yh + xh*yl + xl*yh + xl*yl, with no rounding in any of the four
+  x_high, x_low = _split(xs)
+  y_high, y_low = _split(ys)
+  return chain(
+    map(mul, x_high, y_high), map(mul, x_high, y_low),
+    map(mul, x_low, y_high), map(mul, x_low, y_low),
+  )
+
+def mean_precise(values: Sequence[float], probabilities: Sequence[float]) -> float:
+  if len(values) != len(probabilities):
+    raise ValueError("Values and probabilities must have the same length")
+  # The exact sum of values[i] * probabilities[i], correctly rounded to a float
+  return fsum(_exact_products(list(map(float, values)), probabilities))
+
+def variance_precise(values: Sequence[float], probabilities: Sequence[float], mean: float | None = None) -> float:
+  if len(values) != len(probabilities):
+    raise ValueError("Values and probabilities must have the same length")
+  
+  if mean is None:
+    mean = mean_precise(values, probabilities)
+
+  # Every term (v - mean)^2 * p is non-negative, so nothing cancels in the exact
+  # summation and the result stays within a few ulps of the true variance
+  deviations = list(map(sub, map(float, values), repeat(mean)))
+  return fsum(map(mul, map(mul, deviations, deviations), probabilities))
+
+def standard_deviation_precise(values: Sequence[float], probabilities: Sequence[float], mean: float | None = None) -> float:
+  return variance_precise(values, probabilities, mean) ** 0.5
+
+def _compensated_add(total: float, compensation: float, x: float) -> tuple[float, float]:
+  # Kahan-Babuska (Neumaier) summation step: `compensation` collects the low-order
+  # bits that were rounded off `total`, so long running sums do not drift
+  new_total = total + x
+  if abs(total) >= abs(x):
+    compensation += (total - new_total) + x
+  else:
+    compensation += (x - new_total) + total
+  return new_total, compensation
+
+class MomentAccumulator:
+  """
+  One-pass weighted mean, variance, skewness and kurtosis over a stream of
+  (value, weight) pairs, e.g. (value, probability).
+
+  It never stores the values: every update folds one pair into the running
+  central moments with the weighted Welford / Pebay formulas. Accumulators built
+  over separate shards can be combined with merge(), so a huge dataset can be
+  reduced in parallel and merged at the end.
+  """
+  def __init__(self) -> None:
+    self.count = 0
+    self._weight = 0.0
+    self._weight_c = 0.0
+    self._mean = 0.0
+    self._mean_c = 0.0
+    self._m2 = 0.0
+    self._m3 = 0.0
+    self._m4 = 0.0
+
+  def _combine(self, count: int, weight: float, mean: float, m2: float, m3: float, m4: float) -> None:
+    # Merges a second set of moments (weight n_b, central moment sums M2_b..M4_b)
+    # into this one. A single value is the case n_b = weight, M2_b = M3_b = M4_b = 0.
+    n_a = self.total_weight
+    if n_a == 0:
+      self.count = count
+      self._weight, self._weight_c = weight, 0.0
+      self._mean, self._mean_c = mean, 0.0
+      self._m2, self._m3, self._m4 = m2, m3, m4
+      return
+
+    n_b = weight
+    n = n_a + n_b
+    delta = mean - self.mean
+    delta_n = delta / n
+    m2_a, m3_a = self._m2, self._m3
+    cross = delta * delta_n * n_a * n_b  # delta^2 * n_a * n_b / n
+
+    self._m4 += (
+      m4
+      + cross * delta_n * delta_n * (n_a * n_a - n_a * n_b + n_b * n_b)
+      + 6 * delta_n * delta_n * (n_a * n_a * m2 + n_b * n_b * m2_a)
+      + 4 * delta_n * (n_a * m3 - n_b * m3_a)
+    )
+    self._m3 += m3 + cross * delta_n * (n_a - n_b) + 3 * delta_n * (n_a * m2 - n_b * m2_a)
+    self._m2 += m2 + cross
+    self._mean, self._mean_c = _compensated_add(self._mean, self._mean_c, delta_n * n_b)
+    self._weight, self._weight_c = _compensated_add(self._weight, self._weight_c, n_b)
+    self.count += count
+
+  def update(self, value: float, weight: float = 1.0) -> None:
+    if weight < 0:
+      raise ValueError("Weights must be non-negative")
+    if weight == 0:
+      return
+    self._combine(1, weight, value, 0.0, 0.0, 0.0)
+
+  def consume(self, pairs: Iterable[tuple[float, float]]) -> "MomentAccumulator":
+    """
+    Adds every (value, weight) pair of an iterable, e.g. zip(values, probabilities)
+    or a generator reading from disk. Returns self.
+    """
+    update = self.update
+    for value, weight in pairs:
+      update(value, weight)
+    return self
+
+  def update_batch(self, values: Sequence[float], weights: Sequence[float] | None = None) -> "MomentAccumulator":
+    """
+    Adds a whole chunk of values at once, with weights of 1 unless weights are
+    given. The chunk's own central moments are computed with C-level loops and
+    merged in one step, which is much faster than one update() per value, so a
+    stream read in batches is reduced at the speed of the batches. Returns self.
+    """
+    if weights is None:
+      weight = float(len(values))
+      if weight == 0:
+        return self
+      count = len(values)
+      mean = fsum(values) / weight
+      deviations = list(map(sub, values, repeat(mean)))
+      weighted_squares = list(map(mul, deviations, deviations))
+    else:
+      if len(weights) != len(values):
+        raise ValueError("values and weights must have the same length")
+      if len(weights) and min(weights) < 0:
+        raise ValueError("Weights must be non-negative")
+      weight = fsum(weights)
+      if weight == 0:
+        return self
+      # Pairs with a zero weight are skipped, as in update()
+      count = sum(map(bool, weights))
+      mean = fsum(map(mul, values, weights)) / weight
+      deviations = list(map(sub, values, repeat(mean)))
+      weighted_squares = list(map(mul, map(mul, deviations, deviations), weights))
+    weighted_cubes = list(map(mul, weighted_squares, deviations))
+    m2 = fsum(weighted_squares)
+    m3 = fsum(weighted_cubes)
+    m4 = fsum(map(mul, weighted_cubes, deviations))
+    self._combine(count, weight, mean, m2, m3, m4)
+    return self
+
+  def merge(self, other: "MomentAccumulator") -> "MomentAccumulator":
+    """
+    Folds the moments of another accumulator into this one. Returns self.
+    """
+    if other.total_weight > 0:
+      self._combine(other.count, other.total_weight, other.mean, other._m2, other._m3, other._m4)
+    return self
+
+  def _require_data(self) -> None:
+    if self.total_weight == 0:
+      raise ValueError("No values with a positive weight have been added")
+
+  @property
+  def total_weight(self) -> float:
+    return self._weight + self._weight_c
+
+  @property
+  def mean(self) -> float:
+    self._require_data()
+    return self._mean + self._mean_c
+
+  @property
+  def variance(self) -> float:
+    # Weighted by the weights themselves, so for probabilities this matches variance()
+    self._require_data()
+    return self._m2 / self.total_weight
+
+  @property
+  def std(self) -> float:
+    return self.variance ** 0.5
+
+  @property
+  def skewness(self) -> float:
+    self._require_data()
+    if self._m2 == 0:
+      return 0.0
+    return self.total_weight ** 0.5 * self._m3 / self._m2 ** 1.5
+
+  @property
+  def kurtosis(self) -> float:
+    # Pearson's kurtosis, 3 for a normal distribution
+    self._require_data()
+    if self._m2 == 0:
+      return 0.0
+    return self.total_weight * self._m4 / (self._m2 * self._m2)
+
+  @property
+  def excess_kurtosis(self) -> float:
+    return self.kurtosis - 3
+
+  def __repr__(self) -> str:
+    if self.total_weight == 0:
+      return "MomentAccumulator(empty)"
+    return (
+      f"MomentAccumulator(count={self.count}, mean={self.mean}, variance={self.variance}, "
+      f"skewness={self.skewness}, kurtosis={self.kurtosis})"
+    )
 
-values = [-10000, 40000, 90000]
-probabilities = [0.81, 0.18, 0.01]
+def streaming_moments(pairs: Iterable[tuple[float, float]]) -> MomentAccumulator:
+  # Single pass over (value, weight) pairs from any iterable
+  return MomentAccumulator().consume(pairs)
 
-result_decimal = mean_decimal(values, probabilities)
-result_with_error = mean_with_error(values, probabilities)
-result_fsum = mean_fsum(values, probabilities)
-result_variance = variance(values, probabilities)
-result_standard_deviation = standard_deviation(result_variance)
-result_variance_with_decimal = variance_with_decimal(values, probabilities)
-result_standard_deviation_with_decimal = standard_deviation_with_decimal(result_variance_with_decimal)
+if __name__ == "__main__":
+  values = [-10000, 40000, 90000]
+  probabilities = [0.81, 0.18, 0.01]
 
-print(f"Result with Decimal: {result_decimal}")
-print(f"Result with Error: {result_with_error}")
-print(f"Result with fsum: {result_fsum}")
+  result_decimal = mean_decimal(values, probabilities)
+  result_with_error = mean_with_error(values, probabilities)
+  result_fsum = mean_fsum(values, probabilities)
+  result_variance = variance(values, probabilities)
+  result_standard_deviation = standard_deviation(result_variance)
+  result_variance_with_decimal = variance_with_decimal(values, probabilities)
+  result_standard_deviation_with_decimal = standard_deviation_with_decimal(result_variance_with_decimal)
 
-print(f"Variance With Error: {result_variance}")
-print(f"Standard Deviation With Error: {result_standard_deviation}")
-print(f"Variance With Decimal: {result_variance_with_decimal}")
-print(f"Standard Deviation With Decimal: {result_standard_deviation_with_decimal}")
+  print(f"Result with Decimal: {result_decimal}")
+  print(f"Result with Error: {result_with_error}")
+  print(f"Result with fsum: {result_fsum}")
+  print(f"Result precise: {mean_precise(values, probabilities)}")
 
+  print(f"Variance With Error: {result_variance}")
+  print(f"Standard Deviation With Error: {result_standard_deviation}")
+  print(f"Variance With Decimal: {result_variance_with_decimal}")
+  print(f"Standard Deviation With Decimal: {result_standard_deviation_with_decimal}")
+  print(f"Streaming moments: {streaming_moments(zip(values, probabilities))}")
@@ -0,0 +1,6 @@
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+  __name__,
+  ["BinomialVariables", "Combinatorics", "DiscreteDistribution", "MonteCarlo", "PoissonDistribution", "RandomVariables"],
+)
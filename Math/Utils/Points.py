@@ -1,4 +1,11 @@
+from array import array
+from typing import Iterable, Iterator
+
+# __slots__ stores x and y in two fixed fields instead of an instance __dict__,
+# which roughly halves the size of every Point
 class Point:
+  __slots__ = ("x", "y")
+
   def __init__(self, x: float, y: float) -> None:
     self.x = x
     self.y = y
@@ -7,4 +14,86 @@ class Point:
     return f"Point({self.x}, {self.y})"
   
   def __repr__(self) -> str:
-    return self.__str__()
\ No newline at end of file
+    return self.__str__()
+
+# A PointCloud stores many points as interleaved x, y coordinates in one
+# array('d'): [x0, y0, x1, y1, ...], 16 bytes per point, with no object per point.
+#
+# cloud[i] builds a Point from the stored coordinates when it is asked for.
+# xs and ys are zero-copy strided views of all the x and all the y coordinates.
+# While such a view is alive the cloud cannot grow (array raises BufferError),
+# so release or drop views before calling append/extend.
+#
+# For nearest-neighbour and range queries over many points, index them with a
+# KDTree or a Grid (see SpatialIndex.py) instead of scanning every point.
+class PointCloud:
+  __slots__ = ("_coords",)
+
+  def __init__(self, points: Iterable[Point | tuple[float, float]] = ()) -> None:
+    self._coords = array("d")
+    self.extend(points)
+
+  @classmethod
+  def from_coordinates(cls, coords: Iterable[float]) -> "PointCloud":
+    """
+    Builds a cloud from a flat iterable of interleaved x, y coordinates.
+    """
+    cloud = cls()
+    cloud._coords.extend(coords)
+    if len(cloud._coords) % 2:
+      raise ValueError("Coordinates must come in x, y pairs")
+    return cloud
+
+  def append(self, point: Point | tuple[float, float]) -> None:
+    x, y = (point.x, point.y) if isinstance(point, Point) else point
+    self._coords.append(x)
+    self._coords.append(y)
+
+  def extend(self, points: Iterable[Point | tuple[float, float]]) -> None:
+    for point in points:
+      self.append(point)
+
+  @property
+  def coordinates(self) -> array:
+    """
+    The interleaved x, y buffer itself (not a copy).
+    """
+    return self._coords
+
+  @property
+  def xs(self) -> memoryview:
+    return memoryview(self._coords)[0::2]
+
+  @property
+  def ys(self) -> memoryview:
+    return memoryview(self._coords)[1::2]
+
+  @property
+  def nbytes(self) -> int:
+    return self._coords.itemsize * len(self._coords)
+
+  def __len__(self) -> int:
+    return len(self._coords) // 2
+
+  def _offset(self, index: int) -> int:
+    if index < 0:
+      index += len(self)
+    if not 0 <= index < len(self):
+      raise IndexError("PointCloud index out of range")
+    return 2 * index
+
+  def __getitem__(self, index: int) -> Point:
+    i = self._offset(index)
+    return Point(self._coords[i], self._coords[i + 1])
+
+  def __setitem__(self, index: int, point: Point | tuple[float, float]) -> None:
+    i = self._offset(index)
+    self._coords[i], self._coords[i + 1] = (point.x, point.y) if isinstance(point, Point) else point
+
+  def __iter__(self) -> Iterator[Point]:
+    coords = self._coords
+    for i in range(0, len(coords), 2):
+      yield Point(coords[i], coords[i + 1])
+
+  def __repr__(self) -> str:
+    return f"PointCloud({list(self)})"
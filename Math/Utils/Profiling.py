@@ -0,0 +1,357 @@
+import importlib
+import inspect
+import json
+import sys
+import threading
+from time import perf_counter
+from typing import Any, Callable, Sequence
+
+# Opt-in instrumentation for finding hot paths.
+#
+#   with Profiler() as profiler:
+#     run_the_job()
+#   print(profiler.report())
+#   profiler.to_json("profile.json")
+#
+# Inside the with block every public method of Vector, Matrix and the
+# distribution classes, and every public function of the distribution and
+# combinatorics modules, is replaced by a wrapper that records per operation:
+# - calls
+# - elements: the size of the operands (components of a Vector, entries of a
+#   Matrix, length of a sequence, or n for a function of an integer n)
+# - allocations: Vector and Matrix objects created while it runs
+# - seconds: wall time
+# On exit the original functions are put back, so when no Profiler is active
+# nothing is wrapped and there is no overhead at all.
+#
+# Time and allocations are inclusive (they include the operations it calls) and
+# are only counted for the outermost call when an operation calls itself.
+# Generators such as Matrix.rows_iter are timed while they produce items, not
+# while the caller consumes them. Every loaded module (the script's __main__
+# included) that imported a function by name (from X import f) has that name
+# rebound too. References kept anywhere else, such as in a local variable, a
+# default argument or a dict, are not seen, and neither is work done in other
+# processes (Parallel.py). The counters may be updated from several threads.
+
+# (module, class name or None for the module's functions)
+_TARGETS = [
+  ("Math.LinearAlgebra.Vectors", "Vector"),
+  ("Math.LinearAlgebra.Matrix", "Matrix"),
+  ("Math.Statistics.DiscreteDistribution", "DiscreteDistribution"),
+  ("Math.Statistics.BinomialVariables", "Binomial"),
+  ("Math.Statistics.BinomialVariables", None),
+  ("Math.Statistics.PoissonDistribution", "Poisson"),
+  ("Math.Statistics.PoissonDistribution", None),
+  ("Math.Statistics.RandomVariables", None),
+  ("Math.Statistics.Combinatorics", None),
+]
+
+# Classes whose instances are counted as allocations
+_ALLOCATED = [
+  ("Math.LinearAlgebra.Vectors", "Vector"),
+  ("Math.LinearAlgebra.Matrix", "Matrix"),
+]
+
+# Methods that would only add noise (or that count allocations instead)
+_SKIPPED = {"__init__", "__new__", "__repr__", "__str__", "__init_subclass__", "__class_getitem__"}
+
+_profiler_lock = threading.Lock()
+_active_profiler: "Profiler | None" = None
+
+def _size(value: Any) -> int:
+  dimension = getattr(value, "_dimension", None)
+  if dimension is not None:
+    return dimension
+  rows = getattr(value, "_rows", None)
+  if rows is not None:
+    return rows * value._cols
+  if isinstance(value, (str, bytes)):
+    return 0
+  try:
+    return len(value)
+  except TypeError:
+    return 0
+
+def _elements(args: tuple, kwargs: dict) -> int:
+  if args and type(args[0]) is int:
+    return args[0]
+  return sum(map(_size, args)) + sum(map(_size, kwargs.values()))
+
+class OperationStats:
+  __slots__ = ("calls", "elements", "allocations", "seconds")
+
+  def __init__(self) -> None:
+    self.calls = 0
+    self.elements = 0
+    self.allocations = 0
+    self.seconds = 0.0
+
+  def to_dict(self) -> dict:
+    return {"calls": self.calls, "elements": self.elements, "allocations": self.allocations, "seconds": self.seconds}
+
+  def __repr__(self) -> str:
+    return f"OperationStats(calls={self.calls}, elements={self.elements}, allocations={self.allocations}, seconds={self.seconds:.6f})"
+
+class Profiler:
+  """
+  Context manager recording calls, elements, allocations and time per
+  operation. include optionally keeps only the operations whose name starts
+  with one of its prefixes, e.g. ["Matrix.", "BinomialVariables.binomcdf"].
+  A Profiler can be entered again to keep adding to its counters; only one can
+  be active at a time.
+
+  Calls are seen through the classes and modules that define the operations and
+  through names imported from them into any loaded module (from X import f),
+  which are rebound on entry. A function reached only through some other
+  reference taken before entry, e.g. f = binomcdf inside a function, is not
+  recorded.
+  """
+  def __init__(self, include: Sequence[str] | None = None) -> None:
+    self.include = tuple(include) if include is not None else None
+    self.stats: dict[str, OperationStats] = {}
+    self.allocations: dict[str, int] = {}
+    self.seconds = 0.0
+    self._local = threading.local()
+    # Guards the counters, which any thread may update
+    self._lock = threading.Lock()
+    self._patches: list[tuple[Any, str, Any, bool]] = []
+    self._started = 0.0
+
+  # Wrapping
+
+  def _active(self) -> dict[str, int]:
+    # Per thread: operation name -> how many calls of it are running
+    try:
+      return self._local.active
+    except AttributeError:
+      self._local.active = {}
+      return self._local.active
+
+  def _record(self, name: str) -> OperationStats:
+    stats = self.stats.get(name)
+    if stats is None:
+      stats = self.stats[name] = OperationStats()
+    return stats
+
+  def _wrap(self, name: str, fn: Callable) -> Callable:
+    record, active, lock = self._record, self._active, self._lock
+
+    def count(args: tuple, kwargs: dict) -> OperationStats:
+      elements = _elements(args, kwargs)
+      with lock:
+        stats = record(name)
+        stats.calls += 1
+        stats.elements += elements
+      return stats
+
+    def enter() -> tuple[dict[str, int], bool]:
+      running = active()
+      outermost = name not in running
+      running[name] = running.get(name, 0) + 1
+      return running, outermost
+
+    def leave(stats: OperationStats, running: dict[str, int], outermost: bool, started: float) -> None:
+      if outermost:
+        elapsed = perf_counter() - started
+        with lock:
+          stats.seconds += elapsed
+        del running[name]
+      else:
+        running[name] -= 1
+
+    if inspect.isgeneratorfunction(fn):
+      def wrapper(*args, **kwargs):
+        stats = count(args, kwargs)
+        iterator = fn(*args, **kwargs)
+        while True:
+          running, outermost = enter()
+          started = perf_counter()
+          try:
+            item = next(iterator)
+          except StopIteration:
+            return
+          finally:
+            leave(stats, running, outermost, started)
+          yield item
+    else:
+      def wrapper(*args, **kwargs):
+        stats = count(args, kwargs)
+        running, outermost = enter()
+        started = perf_counter()
+        try:
+          return fn(*args, **kwargs)
+        finally:
+          leave(stats, running, outermost, started)
+
+    wrapper.__name__ = fn.__name__
+    wrapper.__qualname__ = fn.__qualname__
+    wrapper.__doc__ = fn.__doc__
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+  def _counting(self, cls: type, fn: Callable) -> Callable:
+    """
+    Wraps a constructor of cls so that each call counts one allocation, for
+    cls and for every operation running at the time.
+    """
+    name, allocations, record, active, lock = cls.__name__, self.allocations, self._record, self._active, self._lock
+
+    def wrapper(*args, **kwargs):
+      with lock:
+        allocations[name] = allocations.get(name, 0) + 1
+        for operation in active():
+          record(operation).allocations += 1
+      return fn(*args, **kwargs)
+
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+  def _patch(self, owner: Any, attribute: str, value: Any) -> None:
+    # owner.__dict__ can be a mappingproxy, so check membership rather than .get
+    existed = attribute in vars(owner)
+    self._patches.append((owner, attribute, vars(owner)[attribute] if existed else None, existed))
+    setattr(owner, attribute, value)
+
+  def _included(self, name: str) -> bool:
+    return self.include is None or name.startswith(self.include)
+
+  def _install(self) -> None:
+    wrapped: dict[int, Callable] = {}
+    for module_name, class_name in _TARGETS:
+      module = importlib.import_module(module_name)
+      prefix = module_name.rsplit(".", 1)[1]
+      if class_name is None:
+        for attribute, value in list(vars(module).items()):
+          if attribute.startswith("_") or not inspect.isfunction(value) or value.__module__ != module_name:
+            continue
+          if self._included(f"{prefix}.{attribute}"):
+            wrapped[id(value)] = self._wrap(f"{prefix}.{attribute}", value)
+            self._patch(module, attribute, wrapped[id(value)])
+        continue
+      cls = getattr(module, class_name)
+      for attribute, value in list(vars(cls).items()):
+        if attribute in _SKIPPED or (attribute.startswith("_") and not attribute.endswith("__")):
+          continue
+        name = f"{class_name}.{attribute}"
+        if not self._included(name):
+          continue
+        if isinstance(value, (staticmethod, classmethod)):
+          self._patch(cls, attribute, type(value)(self._wrap(name, value.__func__)))
+        elif inspect.isfunction(value):
+          self._patch(cls, attribute, self._wrap(name, value))
+
+    # Rebind functions that other modules, __main__ included, imported by name
+    for module in list(sys.modules.values()):
+      namespace = getattr(module, "__dict__", None)
+      if not isinstance(namespace, dict):
+        continue
+      for attribute, value in list(namespace.items()):
+        if inspect.isfunction(value) and id(value) in wrapped and wrapped[id(value)].__wrapped__ is value:
+          self._patch(module, attribute, wrapped[id(value)])
+
+    # A Vector or Matrix is built either by __init__ or, without copying or
+    # validating, by the _from_buffer classmethod
+    for module_name, class_name in _ALLOCATED:
+      cls = getattr(importlib.import_module(module_name), class_name)
+      self._patch(cls, "__init__", self._counting(cls, vars(cls)["__init__"]))
+      from_buffer = vars(cls)["_from_buffer"].__func__
+      self._patch(cls, "_from_buffer", classmethod(self._counting(cls, from_buffer)))
+
+  def _uninstall(self) -> None:
+    while self._patches:
+      owner, attribute, original, existed = self._patches.pop()
+      if existed:
+        setattr(owner, attribute, original)
+      else:
+        delattr(owner, attribute)
+
+  def __enter__(self) -> "Profiler":
+    global _active_profiler
+    with _profiler_lock:
+      if _active_profiler is not None:
+        raise RuntimeError("Another Profiler is already active")
+      _active_profiler = self
+    try:
+      self._install()
+    except BaseException:
+      self._uninstall()
+      _active_profiler = None
+      raise
+    self._started = perf_counter()
+    return self
+
+  def __exit__(self, *exc_info: Any) -> None:
+    global _active_profiler
+    self.seconds += perf_counter() - self._started
+    self._uninstall()
+    with _profiler_lock:
+      _active_profiler = None
+
+  # Results
+
+  def reset(self) -> None:
+    with self._lock:
+      self.stats.clear()
+      self.allocations.clear()
+      self.seconds = 0.0
+
+  def to_dict(self) -> dict:
+    return {
+      "seconds": self.seconds,
+      "allocations": dict(self.allocations),
+      "operations": {name: stats.to_dict() for name, stats in sorted(self.stats.items())},
+    }
+
+  def to_json(self, path: Any = None, indent: int = 2) -> str:
+    """
+    The counters as JSON, also written to path when one is given.
+    """
+    text = json.dumps(self.to_dict(), indent=indent)
+    if path is not None:
+      with open(path, "w") as file:
+        file.write(text)
+    return text
+
+  def report(self, limit: int | None = 20, sort: str = "seconds") -> str:
+    """
+    A table of the operations, the most expensive (by sort) first.
+    """
+    rows = sorted(self.stats.items(), key=lambda item: getattr(item[1], sort), reverse=True)[:limit]
+    lines = [f"{'operation':<40} {'calls':>10} {'elements':>12} {'allocations':>12} {'seconds':>10}"]
+    for name, stats in rows:
+      lines.append(f"{name:<40} {stats.calls:>10} {stats.elements:>12} {stats.allocations:>12} {stats.seconds:>10.6f}")
+    allocated = ", ".join(f"{count} {name}" for name, count in sorted(self.allocations.items()))
+    lines.append(f"{self.seconds:.6f} s profiled, allocated {allocated or 'nothing'}")
+    return "\n".join(lines)
+
+def profile(include: Sequence[str] | None = None) -> Profiler:
+  """
+  Shorthand for Profiler(include), for `with profile() as profiler:`.
+  """
+  return Profiler(include)
+
+if __name__ == "__main__":
+  from ..LinearAlgebra.Matrix import Matrix
+  from ..LinearAlgebra.Vectors import Vector
+  from ..Statistics import BinomialVariables
+  from ..Statistics.BinomialVariables import binomcdf
+
+  A = Matrix([Vector([1, 2, 3]), Vector([4, 5, 6]), Vector([7, 8, 10])])
+  multiply = Matrix.__mul__
+
+  with Profiler() as profiler:
+    rows = list(A.rows_iter())
+    A * A * Vector([1, 1, 1])
+    BinomialVariables.binomcdf(50, 20, 0.3)
+    # Imported by name into this script before the Profiler started
+    binomcdf(50, 20, 0.3)
+  print(profiler.report())
+
+  stats = profiler.stats
+  assert stats["Matrix.rows_iter"].calls == 1 and stats["Matrix.rows_iter"].allocations == 3
+  assert stats["Matrix.__mul__"].calls == 2 and stats["Matrix.__mul__"].elements == 9 + 9 + 9 + 3
+  assert stats["BinomialVariables.binomcdf"].calls == 2
+  assert profiler.allocations["Vector"] >= 4
+  # Everything is put back on exit
+  assert Matrix.__mul__ is multiply and not hasattr(Matrix.__init__, "__wrapped__")
+  assert "Matrix.__mul__" in profiler.to_dict()["operations"]
@@ -0,0 +1,549 @@
+from array import array
+from heapq import heappush, heapreplace
+from math import floor, sqrt
+from typing import Iterable, Iterator, NamedTuple
+
+from .Points import Point, PointCloud
+
+# Spatial indexes over 2D points, for nearest-neighbour and range queries
+# without scanning every point.
+#
+# - KDTree splits the plane recursively at the median of the coordinate with
+#   the larger spread, down to buckets of at most _LEAF_SIZE points. A query
+#   visits O(log n) nodes for well spread data, whatever its distribution.
+# - Grid hashes points into square cells. For dense, roughly uniform data a
+#   query only looks at the few cells around it, which is cheaper than walking
+#   a tree; for clustered data most cells are empty or crowded and KDTree wins.
+#
+# Both are built in bulk from a PointCloud or any iterable of Points or (x, y)
+# pairs, and identify a point by its index: its position in the initial points,
+# or the number insert() returned. Indexes stay valid across deletes.
+#
+#   tree = KDTree(cloud)
+#   tree.nearest(Point(0.5, 0.5), k=3)       # [Neighbour(index, distance), ...]
+#   tree.within(Point(0.5, 0.5), 0.1)        # indexes of the points in the circle
+#   tree.in_box(0, 0, 0.2, 0.2)              # indexes of the points in the box
+#   tree.nearest_many(queries, k=3)          # one list of neighbours per query
+
+# Points in a KD-tree leaf; a leaf that grows past twice this many is split
+_LEAF_SIZE = 16
+# Changes since the last build after which a KDTree is rebuilt, at least
+_REBUILD_MIN = 64
+
+class Neighbour(NamedTuple):
+  index: int
+  distance: float
+
+def _coordinates(point: Point | tuple[float, float]) -> tuple[float, float]:
+  return (point.x, point.y) if isinstance(point, Point) else (point[0], point[1])
+
+def _pairs(points: PointCloud | Iterable[Point | tuple[float, float]]) -> Iterator[tuple[float, float]]:
+  if isinstance(points, PointCloud):
+    # Straight from the buffer, without a Point per query
+    coords = points.coordinates
+    return zip(coords[0::2], coords[1::2])
+  return map(_coordinates, points)
+
+def _sorted_neighbours(heap: list[tuple[float, int]]) -> list[Neighbour]:
+  # heap holds (-squared distance, index)
+  return [Neighbour(i, sqrt(-d)) for d, i in sorted(heap, key=lambda item: (-item[0], item[1]))]
+
+class SpatialIndex:
+  """
+  Point storage, insert/delete and the batch queries shared by KDTree and Grid.
+  """
+  def __init__(self, points: PointCloud | Iterable[Point | tuple[float, float]] = ()) -> None:
+    self._xs = array("d")
+    self._ys = array("d")
+    if isinstance(points, PointCloud):
+      self._xs.extend(points.coordinates[0::2])
+      self._ys.extend(points.coordinates[1::2])
+    else:
+      for x, y in map(_coordinates, points):
+        self._xs.append(x)
+        self._ys.append(y)
+    # 1 for a live point, 0 for a deleted one
+    self._alive = bytearray(b"\x01") * len(self._xs)
+    self._count = len(self._xs)
+
+  def __len__(self) -> int:
+    return self._count
+
+  def __contains__(self, index: int) -> bool:
+    return 0 <= index < len(self._alive) and self._alive[index] == 1
+
+  def point(self, index: int) -> Point:
+    if index not in self:
+      raise KeyError(f"No point with index {index}")
+    return Point(self._xs[index], self._ys[index])
+
+  def indexes(self) -> Iterator[int]:
+    return (i for i, alive in enumerate(self._alive) if alive)
+
+  def insert(self, point: Point | tuple[float, float]) -> int:
+    """
+    Adds a point and returns its index.
+    """
+    x, y = _coordinates(point)
+    index = len(self._xs)
+    self._xs.append(x)
+    self._ys.append(y)
+    self._alive.append(1)
+    self._count += 1
+    self._add(index)
+    return index
+
+  def delete(self, index: int) -> None:
+    if index not in self:
+      raise KeyError(f"No point with index {index}")
+    # Marked first, so that a rebuild started by _remove leaves it out
+    self._alive[index] = 0
+    self._count -= 1
+    self._remove(index)
+
+  def nearest(self, point: Point | tuple[float, float], k: int = 1) -> list[Neighbour]:
+    """
+    The k points closest to point, nearest first. Fewer when the index holds
+    fewer than k points.
+    """
+    if k < 1:
+      raise ValueError("k must be a positive integer")
+    x, y = _coordinates(point)
+    return self._nearest(x, y, k)
+
+  def within(self, point: Point | tuple[float, float], radius: float) -> list[int]:
+    """
+    Indexes of the points at distance <= radius from point, in no particular order.
+    """
+    if radius < 0:
+      raise ValueError("radius must be non-negative")
+    x, y = _coordinates(point)
+    return self._within(x, y, radius)
+
+  def in_box(self, x_min: float, y_min: float, x_max: float, y_max: float) -> list[int]:
+    """
+    Indexes of the points with x_min <= x <= x_max and y_min <= y <= y_max, in
+    no particular order.
+    """
+    if x_min > x_max or y_min > y_max:
+      return []
+    return self._in_box(x_min, y_min, x_max, y_max)
+
+  def nearest_many(self, points: PointCloud | Iterable[Point | tuple[float, float]], k: int = 1) -> list[list[Neighbour]]:
+    if k < 1:
+      raise ValueError("k must be a positive integer")
+    nearest = self._nearest
+    return [nearest(x, y, k) for x, y in _pairs(points)]
+
+  def within_many(self, points: PointCloud | Iterable[Point | tuple[float, float]], radius: float) -> list[list[int]]:
+    if radius < 0:
+      raise ValueError("radius must be non-negative")
+    within = self._within
+    return [within(x, y, radius) for x, y in _pairs(points)]
+
+  def in_boxes(self, boxes: Iterable[tuple[float, float, float, float]]) -> list[list[int]]:
+    return [self.in_box(*box) for box in boxes]
+
+  def __repr__(self) -> str:
+    return f"{type(self).__name__}({self._count} points)"
+
+class KDTree(SpatialIndex):
+  def __init__(self, points: PointCloud | Iterable[Point | tuple[float, float]] = ()) -> None:
+    super().__init__(points)
+    self._build()
+
+  # The nodes are stored in parallel lists. A leaf has axis -1 and a bucket of
+  # point indexes; an inner node sends points with coordinate < split to left
+  # and the others to right, so equal coordinates always go the same way and
+  # delete() can find a point again.
+
+  def _build(self) -> None:
+    self._axis: list[int] = []
+    self._split: list[float] = []
+    self._left: list[int] = []
+    self._right: list[int] = []
+    self._buckets: list[list[int] | None] = []
+    # Size past which a leaf is split again
+    self._limit: list[int] = []
+    self._changes = 0
+    self._fill(self._new_node(), list(self.indexes()))
+
+  def _new_node(self) -> int:
+    self._axis.append(-1)
+    self._split.append(0.0)
+    self._left.append(-1)
+    self._right.append(-1)
+    self._buckets.append(None)
+    self._limit.append(2 * _LEAF_SIZE)
+    return len(self._axis) - 1
+
+  def _fill(self, node: int, ids: list[int]) -> None:
+    """
+    Makes node the root of a balanced subtree over the points ids.
+    """
+    if len(ids) > _LEAF_SIZE:
+      xs, ys = self._xs, self._ys
+      x_spread = max(map(xs.__getitem__, ids)) - min(map(xs.__getitem__, ids))
+      y_spread = max(map(ys.__getitem__, ids)) - min(map(ys.__getitem__, ids))
+      axis = 0 if x_spread >= y_spread else 1
+      coordinate = (xs if axis == 0 else ys).__getitem__
+      ids.sort(key=coordinate)
+      # Split at the median, moved past any points equal to it so they all
+      # land on the right
+      middle = len(ids) // 2
+      split = coordinate(ids[middle])
+      while middle > 0 and coordinate(ids[middle - 1]) == split:
+        middle -= 1
+      if middle == 0:
+        while middle < len(ids) and coordinate(ids[middle]) == split:
+          middle += 1
+        if middle < len(ids):
+          split = coordinate(ids[middle])
+      if 0 < middle < len(ids):
+        left, right = self._new_node(), self._new_node()
+        self._axis[node], self._split[node] = axis, split
+        self._left[node], self._right[node] = left, right
+        self._buckets[node] = None
+        self._fill(left, ids[:middle])
+        self._fill(right, ids[middle:])
+        return
+    # Few points, or all of them at the same coordinate. Such a bucket can be
+    # any size, and is only tried again once it has doubled, so inserting the
+    # same point over and over does not sort the bucket every time.
+    self._axis[node] = -1
+    self._buckets[node] = ids
+    self._limit[node] = max(2 * _LEAF_SIZE, 2 * len(ids))
+
+  def _leaf(self, x: float, y: float) -> int:
+    node, axis = 0, self._axis
+    while axis[node] >= 0:
+      node = self._left[node] if (x if axis[node] == 0 else y) < self._split[node] else self._right[node]
+    return node
+
+  def _changed(self) -> None:
+    # Inserts can unbalance the tree and deletes leave empty leaves behind;
+    # rebuilding after as many changes as there are points keeps queries at
+    # O(log n) for an amortised O(log n) per change
+    self._changes += 1
+    if self._changes > max(_REBUILD_MIN, self._count):
+      self._build()
+
+  def _add(self, index: int) -> None:
+    leaf = self._leaf(self._xs[index], self._ys[index])
+    bucket = self._buckets[leaf]
+    bucket.append(index)
+    if len(bucket) > self._limit[leaf]:
+      self._fill(leaf, bucket)
+    self._changed()
+
+  def _remove(self, index: int) -> None:
+    self._buckets[self._leaf(self._xs[index], self._ys[index])].remove(index)
+    self._changed()
+
+  def _nearest(self, x: float, y: float, k: int) -> list[Neighbour]:
+    xs, ys = self._xs, self._ys
+    axes, splits, lefts, rights, buckets = self._axis, self._split, self._left, self._right, self._buckets
+    heap: list[tuple[float, int]] = []
+    # (node, lower bound on the squared distance to any point under it, and the
+    # x and y distances from the query to the region of the node it is made of)
+    stack = [(0, 0.0, 0.0, 0.0)]
+    while stack:
+      node, bound, offset_x, offset_y = stack.pop()
+      if len(heap) == k and bound >= -heap[0][0]:
+        continue
+      axis = axes[node]
+      if axis < 0:
+        for i in buckets[node]:
+          dx = xs[i] - x
+          dy = ys[i] - y
+          d = dx * dx + dy * dy
+          if len(heap) < k:
+            heappush(heap, (-d, i))
+          elif d < -heap[0][0]:
+            heapreplace(heap, (-d, i))
+        continue
+      if axis == 0:
+        diff = x - splits[node]
+        # The far side is at least |diff| away in x, and as far in y as before
+        far_bound = bound - offset_x * offset_x + diff * diff
+        far = (lefts[node] if diff >= 0 else rights[node], far_bound, diff, offset_y)
+      else:
+        diff = y - splits[node]
+        far_bound = bound - offset_y * offset_y + diff * diff
+        far = (lefts[node] if diff >= 0 else rights[node], far_bound, offset_x, diff)
+      stack.append(far)
+      stack.append((rights[node] if diff >= 0 else lefts[node], bound, offset_x, offset_y))
+    return _sorted_neighbours(heap)
+
+  def _within(self, x: float, y: float, radius: float) -> list[int]:
+    xs, ys = self._xs, self._ys
+    axes, splits, lefts, rights, buckets = self._axis, self._split, self._left, self._right, self._buckets
+    squared = radius * radius
+    found = []
+    stack = [0]
+    while stack:
+      node = stack.pop()
+      axis = axes[node]
+      if axis < 0:
+        for i in buckets[node]:
+          dx = xs[i] - x
+          dy = ys[i] - y
+          if dx * dx + dy * dy <= squared:
+            found.append(i)
+        continue
+      diff = (x if axis == 0 else y) - splits[node]
+      if diff - radius < 0:
+        stack.append(lefts[node])
+      if diff + radius >= 0:
+        stack.append(rights[node])
+    return found
+
+  def _in_box(self, x_min: float, y_min: float, x_max: float, y_max: float) -> list[int]:
+    xs, ys = self._xs, self._ys
+    axes, splits, lefts, rights, buckets = self._axis, self._split, self._left, self._right, self._buckets
+    found = []
+    stack = [0]
+    while stack:
+      node = stack.pop()
+      axis = axes[node]
+      if axis < 0:
+        found.extend(i for i in buckets[node] if x_min <= xs[i] <= x_max and y_min <= ys[i] <= y_max)
+        continue
+      low, high = (x_min, x_max) if axis == 0 else (y_min, y_max)
+      if low < splits[node]:
+        stack.append(lefts[node])
+      if high >= splits[node]:
+        stack.append(rights[node])
+    return found
+
+  def depth(self) -> int:
+    """
+    The number of levels of the tree, for checking its balance.
+    """
+    deepest, stack = 0, [(0, 1)]
+    while stack:
+      node, level = stack.pop()
+      deepest = max(deepest, level)
+      if self._axis[node] >= 0:
+        stack.append((self._left[node], level + 1))
+        stack.append((self._right[node], level + 1))
+    return deepest
+
+class Grid(SpatialIndex):
+  def __init__(self, points: PointCloud | Iterable[Point | tuple[float, float]] = (), cell_size: float | None = None) -> None:
+    """
+    cell_size defaults to a size that puts about 2 points in a cell on average
+    over the box holding the middle 98% of the points along each axis, so a few
+    outliers do not crowd everything else into one cell. The default is worked
+    out again, and the points moved to the new cells, whenever the number of
+    points doubles, so a grid that starts empty or small adapts to the data
+    inserted later.
+    """
+    super().__init__(points)
+    if cell_size is not None and not cell_size > 0:
+      raise ValueError("cell_size must be positive")
+    self._automatic = cell_size is None
+    self._regrid(cell_size)
+
+  def _regrid(self, cell_size: float | None = None) -> None:
+    self.cell_size = cell_size if cell_size is not None else self._default_cell_size()
+    self._cells: dict[tuple[int, int], list[int]] = {}
+    # Range of occupied cell coordinates: columns, then rows
+    self._bounds = [0, 0, -1, -1]
+    self._regrid_at = max(2 * self._count, 16)
+    for index in self.indexes():
+      self._place(index)
+
+  def _default_cell_size(self) -> float:
+    if self._count < 2:
+      return 1.0
+    live = list(self.indexes())
+    all_xs, all_ys = self._xs, self._ys
+    xs, ys = sorted(all_xs[i] for i in live), sorted(all_ys[i] for i in live)
+    # The box holding the middle 98% of the points along each axis, so that a
+    # few far outliers do not stretch the cells over all the others; the whole
+    # bounding box when the points in that box are all on a line or at one spot
+    low, high = len(live) // 100, len(live) - 1 - len(live) // 100
+    for x_min, y_min, x_max, y_max in [(xs[low], ys[low], xs[high], ys[high]), (xs[0], ys[0], xs[-1], ys[-1])]:
+      width = x_max - x_min
+      height = y_max - y_min
+      inside = sum(1 for i in live if x_min <= all_xs[i] <= x_max and y_min <= all_ys[i] <= y_max)
+      if width * height > 0:
+        return sqrt(2 * width * height / inside)
+      if width + height > 0:
+        # Points on a line
+        return 2 * (width + height) / inside
+    return 1.0
+
+  def _cell(self, x: float, y: float) -> tuple[int, int]:
+    return floor(x / self.cell_size), floor(y / self.cell_size)
+
+  def _add(self, index: int) -> None:
+    if self._automatic and self._count > self._regrid_at:
+      # Places the new point too
+      self._regrid()
+    else:
+      self._place(index)
+
+  def _place(self, index: int) -> None:
+    cell = self._cell(self._xs[index], self._ys[index])
+    bucket = self._cells.get(cell)
+    if bucket is None:
+      bucket = self._cells[cell] = []
+    bucket.append(index)
+    column, row = cell
+    bounds = self._bounds
+    if bounds[0] > bounds[2]:
+      self._bounds = [column, row, column, row]
+    else:
+      bounds[0], bounds[1] = min(bounds[0], column), min(bounds[1], row)
+      bounds[2], bounds[3] = max(bounds[2], column), max(bounds[3], row)
+
+  def _remove(self, index: int) -> None:
+    cell = self._cell(self._xs[index], self._ys[index])
+    bucket = self._cells[cell]
+    bucket.remove(index)
+    if not bucket:
+      # The occupied range is not shrunk; it only bounds the search
+      del self._cells[cell]
+
+  def _nearest(self, x: float, y: float, k: int) -> list[Neighbour]:
+    if not self._count:
+      return []
+    xs, ys, cells = self._xs, self._ys, self._cells
+    column, row = self._cell(x, y)
+    min_column, min_row, max_column, max_row = self._bounds
+    heap: list[tuple[float, int]] = []
+
+    def scan(bucket: list[int]) -> None:
+      for i in bucket:
+        dx = xs[i] - x
+        dy = ys[i] - y
+        d = dx * dx + dy * dy
+        if len(heap) < k:
+          heappush(heap, (-d, i))
+        elif d < -heap[0][0]:
+          heapreplace(heap, (-d, i))
+
+    # Search square rings of cells around the query's cell, clipped to the
+    # occupied range. Every point outside rings 0..r is more than r cells away.
+    first = max(min_column - column, column - max_column, min_row - row, row - max_row, 0)
+    last = max(column - min_column, max_column - column, row - min_row, max_row - row)
+    # Cells looked at so far. Walking the rings is cheaper than sorting the
+    # occupied cells until it has looked at a few times as many cells
+    work = 0
+    for r in range(first, last + 1):
+      low_column, high_column = max(column - r, min_column), min(column + r, max_column)
+      low_row, high_row = max(row - r, min_row), min(row + r, max_row)
+      work += 2 * (high_column - low_column + high_row - low_row + 2)
+      if work > 4 * len(cells):
+        # Mostly empty rings, e.g. between the bulk of the points and a far
+        # outlier: visit the occupied cells outside ring r - 1 instead
+        self._scan_beyond(x, y, column, row, r - 1, k, heap, scan)
+        break
+      for ring_row in (row - r, row + r) if r else (row,):
+        if min_row <= ring_row <= max_row:
+          for ring_column in range(low_column, high_column + 1):
+            bucket = cells.get((ring_column, ring_row))
+            if bucket:
+              scan(bucket)
+      if r:
+        for ring_column in (column - r, column + r):
+          if min_column <= ring_column <= max_column:
+            for ring_row in range(max(row - r + 1, min_row), min(row + r - 1, max_row) + 1):
+              bucket = cells.get((ring_column, ring_row))
+              if bucket:
+                scan(bucket)
+      reach = r * self.cell_size
+      if len(heap) == k and -heap[0][0] < reach * reach:
+        break
+    return _sorted_neighbours(heap)
+
+  def _scan_beyond(self, x: float, y: float, column: int, row: int, r: int, k: int, heap: list[tuple[float, int]], scan) -> None:
+    # Scans the occupied cells more than r rings from (column, row), nearest
+    # first, until none of them can hold a point closer than the heap's k-th
+    size = self.cell_size
+    rest = []
+    for (cell_column, cell_row), bucket in self._cells.items():
+      if max(abs(cell_column - column), abs(cell_row - row)) > r:
+        dx = max(cell_column * size - x, x - (cell_column + 1) * size, 0.0)
+        dy = max(cell_row * size - y, y - (cell_row + 1) * size, 0.0)
+        rest.append((dx * dx + dy * dy, cell_column, cell_row))
+    rest.sort()
+    cells = self._cells
+    for d, cell_column, cell_row in rest:
+      if len(heap) == k and -heap[0][0] < d:
+        break
+      scan(cells[(cell_column, cell_row)])
+
+  def _in_cells(self, x_min: float, y_min: float, x_max: float, y_max: float) -> Iterator[list[int]]:
+    # The occupied cells overlapping the box
+    low_column, low_row = self._cell(x_min, y_min)
+    high_column, high_row = self._cell(x_max, y_max)
+    min_column, min_row, max_column, max_row = self._bounds
+    low_column, low_row = max(low_column, min_column), max(low_row, min_row)
+    high_column, high_row = min(high_column, max_column), min(high_row, max_row)
+    cells = self._cells
+    if (high_column - low_column + 1) * (high_row - low_row + 1) > len(cells):
+      # A box wider than the data: visiting the occupied cells is cheaper
+      for (cell_column, cell_row), bucket in cells.items():
+        if low_column <= cell_column <= high_column and low_row <= cell_row <= high_row:
+          yield bucket
+      return
+    for cell_row in range(low_row, high_row + 1):
+      for cell_column in range(low_column, high_column + 1):
+        bucket = cells.get((cell_column, cell_row))
+        if bucket:
+          yield bucket
+
+  def _within(self, x: float, y: float, radius: float) -> list[int]:
+    xs, ys = self._xs, self._ys
+    squared = radius * radius
+    found = []
+    for bucket in self._in_cells(x - radius, y - radius, x + radius, y + radius):
+      for i in bucket:
+        dx = xs[i] - x
+        dy = ys[i] - y
+        if dx * dx + dy * dy <= squared:
+          found.append(i)
+    return found
+
+  def _in_box(self, x_min: float, y_min: float, x_max: float, y_max: float) -> list[int]:
+    xs, ys = self._xs, self._ys
+    found = []
+    for bucket in self._in_cells(x_min, y_min, x_max, y_max):
+      found.extend(i for i in bucket if x_min <= xs[i] <= x_max and y_min <= ys[i] <= y_max)
+    return found
+
+if __name__ == "__main__":
+  from random import Random
+
+  rng = Random(0)
+  cloud = PointCloud((rng.random(), rng.random()) for _ in range(2000))
+  queries = [(rng.random(), rng.random()) for _ in range(50)]
+
+  def brute_nearest(x: float, y: float, k: int) -> list[int]:
+    distances = sorted(((px - x) ** 2 + (py - y) ** 2, i) for i, (px, py) in enumerate(zip(cloud.xs, cloud.ys)))
+    return [i for _, i in distances[:k]]
+
+  for index in (KDTree(cloud), Grid(cloud)):
+    print(index, index.nearest(Point(0.5, 0.5), k=3))
+    for x, y in queries:
+      assert [n.index for n in index.nearest((x, y), k=5)] == brute_nearest(x, y, 5)
+      inside = [i for i, p in enumerate(cloud) if (p.x - x) ** 2 + (p.y - y) ** 2 <= 0.01]
+      assert sorted(index.within((x, y), 0.1)) == inside
+    assert sorted(index.in_box(0.2, 0.3, 0.4, 0.5)) == [i for i, p in enumerate(cloud) if 0.2 <= p.x <= 0.4 and 0.3 <= p.y <= 0.5]
+
+    # Incremental updates
+    closest = index.nearest((0.5, 0.5))[0].index
+    index.delete(closest)
+    assert index.nearest((0.5, 0.5))[0].index == brute_nearest(0.5, 0.5, 2)[1]
+    added = index.insert(Point(0.5, 0.5))
+    assert index.nearest((0.5, 0.5))[0] == Neighbour(added, 0.0)
+    assert len(index.nearest_many(queries, k=2)) == len(queries)
+
+  # A far outlier does not stretch the default cells over the other points, and
+  # queries near it do not walk the empty cells in between
+  grid = Grid([*cloud, (1e6, 1e6)])
+  assert grid.cell_size < 0.1
+  assert [n.index for n in grid.nearest((1e6, 1e6), k=2)] == [len(cloud), brute_nearest(1e6, 1e6, 1)[0]]
@@ -0,0 +1,3 @@
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, ["Points", "Profiling", "SpatialIndex"])
@@ -0,0 +1,13 @@
+# The Math packages are imported lazily: `import Math` imports none of them, and a
+# package imports one of its modules only when that module is first used.
+#
+#   from Math.LinearAlgebra.Matrix import Matrix
+#   import Math
+#   Math.Statistics.BinomialVariables.binompdf(7, 4, 0.35)
+#
+# Every module can also be run on its own to see its examples, e.g.
+#   python -m Math.LinearAlgebra.Matrix
+
+from ._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, ["LinearAlgebra", "Probability", "Statistics", "Utils"])
@@ -0,0 +1,28 @@
+import importlib
+
+# PEP 562 module __getattr__ for the Math packages.
+#
+# Importing a package only runs its __init__, which lists its submodules. A
+# submodule is imported the first time it is looked up as an attribute, e.g.
+# Math.Statistics.BinomialVariables, and the import system then stores it in the
+# package namespace so later lookups are plain attribute reads. `import Math`
+# therefore costs almost nothing, and only the modules actually used are loaded.
+
+# Deliberately typing-free: importing typing would cost more than the rest of
+# the package import put together
+def attach(package: str, submodules: list[str]) -> tuple:
+    """
+    Returns (__getattr__, __dir__, __all__) for a package whose submodules are
+    imported on first access.
+    """
+    names = sorted(submodules)
+
+    def __getattr__(name: str) -> object:
+        if name in names:
+            return importlib.import_module(f"{package}.{name}")
+        raise AttributeError(f"module '{package}' has no attribute '{name}'")
+
+    def __dir__() -> list[str]:
+        return sorted(set(importlib.import_module(package).__dict__) | set(names))
+
+    return __getattr__, __dir__, names
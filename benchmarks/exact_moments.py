@@ -0,0 +1,43 @@
+# Benchmark: the Decimal based RandomVariables functions against the fsum based
+# precise mode, on the same inputs.
+#
+# Run from the repository root:
+#   python benchmarks/exact_moments.py [size]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Math.Statistics.RandomVariables import mean_decimal, mean_precise, variance_precise, variance_with_decimal  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main(size: int) -> None:
+    rng = random.Random(0)
+    values = [rng.randint(-10**6, 10**6) for _ in range(size)]
+    weights = [rng.random() for _ in range(size)]
+    total = sum(weights)
+    probabilities = [w / total for w in weights]
+
+    print(f"{size} values")
+    print(f"{'function':>10} {'Decimal (s)':>12} {'precise (s)':>12} {'speedup':>9}")
+    for name, slow, fast in [
+        ("mean", mean_decimal, mean_precise),
+        ("variance", variance_with_decimal, variance_precise),
+    ]:
+        slow_time, slow_result = timed(slow, values, probabilities)
+        fast_time, fast_result = timed(fast, values, probabilities)
+        print(f"{name:>10} {slow_time:>12.3f} {fast_time:>12.3f} {slow_time / fast_time:>8.1f}x")
+        print(f"{'':>10} Decimal={float(slow_result)!r} precise={fast_result!r}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,79 @@
+# Benchmark: cold start cost of importing the Math package and each of its
+# modules, measured with `python -X importtime` in a fresh interpreter per run.
+#
+# Run from the repository root:
+#   python benchmarks/import_time.py [repeats]
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+MODULES = [
+    "Math",
+    "Math.LinearAlgebra",
+    "Math.LinearAlgebra.Vectors",
+    "Math.LinearAlgebra.Matrix",
+    "Math.LinearAlgebra.SparseMatrix",
+    "Math.LinearAlgebra.VectorArray",
+    "Math.LinearAlgebra.LinearTransform",
+    "Math.LinearAlgebra.Lazy",
+    "Math.Statistics",
+    "Math.Statistics.Combinatorics",
+    "Math.Statistics.BinomialVariables",
+    "Math.Statistics.PoissonDistribution",
+    "Math.Statistics.RandomVariables",
+    "Math.Statistics.MonteCarlo",
+    "Math.Probability.EventSpace",
+    "Math.Probability.MarkovChain",
+    "Math.Probability.Posterior",
+    "Math.Probability.Probability",
+    "Math.Probability.Sets",
+    "Math.Utils.Points",
+    "Math.Utils.Profiling",
+    "Math.Utils.SpatialIndex",
+]
+
+
+def import_once(module: str) -> tuple[int, int, str]:
+    """
+    Imports module in a new interpreter and returns (cumulative microseconds,
+    number of Math modules loaded, anything printed to stdout).
+    """
+    run = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like "import time:   self [us] | cumulative | imported package",
+    # with the imported name indented by its nesting depth
+    cumulative = 0
+    loaded = 0
+    for line in run.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if name == "Math" or name.startswith("Math."):
+            loaded += 1
+        if name == module:
+            cumulative = int(total)
+    return cumulative, loaded, run.stdout
+
+
+def main(repeats: int) -> None:
+    print(f"{'module':<38} {'median (ms)':>12} {'Math modules':>13} {'stdout':>7}")
+    for module in MODULES:
+        runs = [import_once(module) for _ in range(repeats)]
+        median = statistics.median(total for total, _, _ in runs) / 1000
+        loaded = runs[-1][1]
+        quiet = "clean" if not any(out for _, _, out in runs) else "NOISY"
+        print(f"{module:<38} {median:>12.2f} {loaded:>13} {quiet:>7}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
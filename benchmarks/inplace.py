@@ -0,0 +1,66 @@
+# Benchmark: an iterative update loop written with operators that create new
+# Vectors against the same loop with in-place operators and axpy.
+#
+# Run from the repository root:
+#   python benchmarks/inplace.py [dimension] [iterations]
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Math.LinearAlgebra.Backends import use_backend  # noqa: E402
+from Math.LinearAlgebra.Vectors import Vector  # noqa: E402
+
+
+def allocating(y: Vector, x: Vector, iterations: int) -> Vector:
+    for _ in range(iterations):
+        y = y + 0.5 * x
+        y = y - 0.25 * x
+        y = y / 1.0000001
+    return y
+
+
+def in_place(y: Vector, x: Vector, iterations: int) -> Vector:
+    for _ in range(iterations):
+        y.axpy(0.5, x)
+        y.axpy(-0.25, x)
+        y /= 1.0000001
+    return y
+
+
+def run(fn, y: Vector, x: Vector, iterations: int) -> tuple[float, int]:
+    """
+    Returns (seconds, bytes allocated by the loop and not yet freed at its peak).
+    """
+    start = time.perf_counter()
+    fn(Vector(list(y)), x, iterations)
+    elapsed = time.perf_counter() - start
+
+    y = Vector(list(y))
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    fn(y, x, iterations)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(dimension: int, iterations: int) -> None:
+    rng = random.Random(0)
+    x = Vector([rng.random() for _ in range(dimension)])
+    y = Vector([rng.random() for _ in range(dimension)])
+    print(f"dimension {dimension}, {iterations} iterations")
+    print(f"{'loop':<12} {'time (s)':>10} {'peak alloc (KB)':>16}")
+    with use_backend("python"):
+        for name, fn in (("operators", allocating), ("in place", in_place)):
+            elapsed, peak = run(fn, y, x, iterations)
+            print(f"{name:<12} {elapsed:>10.4f} {peak / 1024:>16.1f}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [10_000, 200][len(args):]))
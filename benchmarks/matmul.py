@@ -0,0 +1,73 @@
+# Benchmark: Matrix multiplication on the flat array('d') storage against the
+# original list-of-column-Vectors implementation.
+#
+# Run from the repository root:
+#   python benchmarks/matmul.py [size ...]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Math.LinearAlgebra.Vectors import Vector  # noqa: E402
+from Math.LinearAlgebra.Matrix import Matrix  # noqa: E402
+
+
+class LegacyMatrix:
+    """
+    The original storage: a list of column Vectors, with rows rebuilt through
+    bounds-checked __getitem__ for every multiplication.
+    """
+
+    def __init__(self, columns: list[Vector]) -> None:
+        self.value = columns
+        self.rows = columns[0].dimension
+        self.cols = len(columns)
+
+    def __getitem__(self, index: tuple[int, int]):
+        rowIdx, colIdx = index
+        if rowIdx < 0 or rowIdx >= self.rows or colIdx < 0 or colIdx >= self.cols:
+            raise IndexError("Index out of bounds for the matrix")
+        return self.value[colIdx].items[rowIdx]
+
+    def __iter__(self):
+        for r_idx in range(self.rows):
+            yield Vector([self[r_idx, c_idx] for c_idx in range(self.cols)])
+
+    def __mul__(self, other: "LegacyMatrix") -> "LegacyMatrix":
+        result_columns = []
+        for col_vector in other.value:
+            result_columns.append(Vector([row_vector * col_vector for row_vector in self]))
+        return LegacyMatrix(result_columns)
+
+
+def random_columns(size: int, rng: random.Random) -> list[Vector]:
+    return [Vector([rng.random() for _ in range(size)]) for _ in range(size)]
+
+
+def best_of(repeats: int, fn) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(sizes: list[int]) -> None:
+    rng = random.Random(0)
+    print(f"{'size':>6} {'legacy (s)':>12} {'array (s)':>12} {'speedup':>9}")
+    for size in sizes:
+        a_cols, b_cols = random_columns(size, rng), random_columns(size, rng)
+        legacy_a, legacy_b = LegacyMatrix(a_cols), LegacyMatrix(b_cols)
+        a, b = Matrix(a_cols), Matrix(b_cols)
+
+        legacy = best_of(1, lambda: legacy_a * legacy_b)
+        current = best_of(3, lambda: a * b)
+        print(f"{size:>6} {legacy:>12.4f} {current:>12.4f} {legacy / current:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [50, 100, 200])
@@ -0,0 +1,82 @@
+# Benchmark: memory held by many vectors and points, measured with tracemalloc,
+# for the original dict-based classes, the __slots__ classes, and the packed
+# VectorArray / PointCloud containers.
+#
+# Run from the repository root:
+#   python benchmarks/memory.py [count]
+
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Math.LinearAlgebra.Backends import use_backend  # noqa: E402
+from Math.LinearAlgebra.Vectors import Vector  # noqa: E402
+from Math.LinearAlgebra.VectorArray import VectorArray  # noqa: E402
+from Math.Utils.Points import Point, PointCloud  # noqa: E402
+
+
+class LegacyVector:
+    """
+    The original storage: a list of numbers and the dimension in an instance __dict__.
+    """
+    def __init__(self, items: list[float]) -> None:
+        self.items = list(items)
+        self._dimension = len(items)
+
+
+class LegacyPoint:
+    def __init__(self, x: float, y: float) -> None:
+        self.x = x
+        self.y = y
+
+
+def measure(build) -> int:
+    """
+    Returns the bytes still allocated by the object build() returns.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main(count: int) -> None:
+    rng = random.Random(0)
+    # Shared input rows, so only the containers themselves are measured
+    rows = [[rng.random() for _ in range(3)] for _ in range(count)]
+    flat = [x for row in rows for x in row]
+    pairs = [(row[0], row[1]) for row in rows]
+
+    print(f"{count} vectors of dimension 3 (ideal {8 * 3} bytes each)")
+    print(f"{'storage':<28} {'total (MB)':>11} {'bytes/vector':>13}")
+    with use_backend("python"):
+        results = [
+            ("legacy Vector (list, dict)", measure(lambda: [LegacyVector([float(x) for x in row]) for row in rows])),
+            ("Vector (__slots__, array)", measure(lambda: [Vector(row) for row in rows])),
+            ("VectorArray", measure(lambda: VectorArray.from_buffer(flat, 3))),
+        ]
+    for name, size in results:
+        print(f"{name:<28} {size / 1e6:>11.2f} {size / count:>13.1f}")
+
+    print()
+    print(f"{count} points (ideal {8 * 2} bytes each)")
+    print(f"{'storage':<28} {'total (MB)':>11} {'bytes/point':>13}")
+    results = [
+        ("legacy Point (dict)", measure(lambda: [LegacyPoint(float(x), float(y)) for x, y in pairs])),
+        ("Point (__slots__)", measure(lambda: [Point(float(x), float(y)) for x, y in pairs])),
+        ("PointCloud", measure(lambda: PointCloud(pairs))),
+    ]
+    for name, size in results:
+        print(f"{name:<28} {size / 1e6:>11.2f} {size / count:>13.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
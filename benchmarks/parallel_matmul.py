@@ -0,0 +1,60 @@
+# Benchmark: Matrix products split across worker processes against the serial
+# product, for a growing number of workers.
+#
+# Run from the repository root:
+#   python benchmarks/parallel_matmul.py [size ...]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Math.LinearAlgebra.Vectors import Vector  # noqa: E402
+from Math.LinearAlgebra.Matrix import Matrix  # noqa: E402
+from Math.LinearAlgebra.Parallel import ParallelExecutor  # noqa: E402
+
+
+def random_matrix(size: int, rng: random.Random) -> Matrix:
+    return Matrix([Vector([rng.uniform(-1, 1) for _ in range(size)]) for _ in range(size)])
+
+
+def best_of(repeats: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def worker_counts() -> list[int]:
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def main(sizes: list[int]) -> None:
+    rng = random.Random(0)
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'size':>6} {'workers':>8} {'time (s)':>10} {'speedup':>9} {'efficiency':>11}")
+    for size in sizes:
+        a, b = random_matrix(size, rng), random_matrix(size, rng)
+        serial = best_of(3, lambda: a * b)
+        print(f"{size:>6} {'serial':>8} {serial:>10.4f} {1:>8.1f}x {1:>10.0%}")
+        for workers in worker_counts()[1:]:
+            with ParallelExecutor(workers) as pool:
+                # The first product starts the worker processes
+                pool.matmul(a, b)
+                parallel = best_of(3, lambda: pool.matmul(a, b))
+            speedup = serial / parallel
+            print(f"{size:>6} {workers:>8} {parallel:>10.4f} {speedup:>8.1f}x {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [200, 400])
@@ -0,0 +1,49 @@
+# Benchmark: Binomial and Poisson sampling throughput for small and large
+# parameters (table inversion vs. transformed rejection), and a chunked Monte
+# Carlo run with one and several worker processes.
+#
+# Run from the repository root:
+#   python benchmarks/sampling.py [samples] [workers]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Math.Statistics.BinomialVariables import Binomial  # noqa: E402
+from Math.Statistics.MonteCarlo import simulate  # noqa: E402
+from Math.Statistics.PoissonDistribution import Poisson  # noqa: E402
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(samples: int, workers: int) -> None:
+    print(f"{samples} draws")
+    print(f"{'distribution':<32} {'time (s)':>9} {'draws/s':>12}")
+    for distribution in [
+        Binomial(20, 0.3), Binomial(1000, 0.5), Binomial(10**6, 0.3), Binomial(10**9, 1e-8),
+        Poisson(3), Poisson(50), Poisson(1000), Poisson(10**7),
+    ]:
+        elapsed, _ = timed(distribution.sample, samples, seed=0)
+        print(f"{str(distribution):<32} {elapsed:>9.3f} {samples / elapsed:>12,.0f}")
+
+    distribution = Binomial(10**6, 0.3)
+    print(f"\nMonte Carlo moments of {distribution}")
+    results = {}
+    for count in sorted({1, workers}):
+        elapsed, moments = timed(simulate, distribution.sample, samples, seed=0, workers=count)
+        results[count] = (moments.mean, moments.variance)
+        print(f"{count} worker(s): {elapsed:.3f}s, mean {moments.mean:.3f}, variance {moments.variance:.1f}")
+    print(f"Same result for every worker count: {len(set(results.values())) == 1}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2,
+    )
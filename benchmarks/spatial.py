@@ -0,0 +1,73 @@
+# Benchmark: nearest-neighbour and range queries with KDTree and Grid against
+# brute force, both the Vector subtraction and magnitude() loop and a plain
+# loop over the coordinates, for uniformly spread and clustered points, and for
+# uniform points plus one far outlier (which must not collapse the Grid).
+#
+# Run from the repository root:
+#   python benchmarks/spatial.py [points] [queries]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Math.LinearAlgebra.Vectors import Vector  # noqa: E402
+from Math.Utils.Points import Point, PointCloud  # noqa: E402
+from Math.Utils.SpatialIndex import Grid, KDTree  # noqa: E402
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def brute_force_vectors(points: list[Point], query: Point) -> int:
+    target = Vector([query.x, query.y])
+    return min(range(len(points)), key=lambda i: (Vector([points[i].x, points[i].y]) - target).magnitude())
+
+
+def brute_force(cloud: PointCloud, query: Point) -> int:
+    x, y = query.x, query.y
+    return min(range(len(cloud)), key=lambda i, xs=cloud.xs, ys=cloud.ys: (xs[i] - x) ** 2 + (ys[i] - y) ** 2)
+
+
+def main(count: int, queries: int) -> None:
+    rng = random.Random(0)
+    uniform = PointCloud((rng.random(), rng.random()) for _ in range(count))
+    centres = [(rng.random(), rng.random()) for _ in range(20)]
+    clustered = PointCloud(
+        (cx + rng.gauss(0, 0.01), cy + rng.gauss(0, 0.01)) for cx, cy in (rng.choice(centres) for _ in range(count))
+    )
+    outlier = PointCloud([*zip(uniform.xs, uniform.ys), (1e6, 1e6)])
+    probes = [Point(rng.random(), rng.random()) for _ in range(queries)]
+
+    for label, cloud in [("uniform", uniform), ("clustered", clustered), ("uniform plus one outlier", outlier)]:
+        print(f"\n{count} {label} points, {queries} queries (times per query)")
+        points = list(cloud)
+        # Brute force is slow, so it only runs a few queries
+        few = probes[:max(1, queries // 100)]
+        vectors, expected = timed(lambda: [brute_force_vectors(points, q) for q in few])
+        plain, _ = timed(lambda: [brute_force(cloud, q) for q in few])
+        print(f"{'brute force, Vector magnitude()':<34} {vectors / len(few) * 1e3:>10.3f} ms")
+        print(f"{'brute force, coordinates':<34} {plain / len(few) * 1e3:>10.3f} ms")
+
+        for cls in (KDTree, Grid):
+            build, index = timed(cls, cloud)
+            assert [n[0].index for n in index.nearest_many(few)] == expected
+            nearest, _ = timed(index.nearest_many, probes, k=1)
+            nearest10, _ = timed(index.nearest_many, probes, k=10)
+            radius, _ = timed(index.within_many, probes, 0.01)
+            boxes, _ = timed(index.in_boxes, [(q.x, q.y, q.x + 0.02, q.y + 0.02) for q in probes])
+            print(f"{cls.__name__} build {build:.3f}s")
+            for name, elapsed in [("nearest", nearest), ("nearest k=10", nearest10), ("within r=0.01", radius), ("in_box 0.02", boxes)]:
+                print(f"  {name:<32} {elapsed / queries * 1e3:>10.3f} ms  ({plain / len(few) / (elapsed / queries):,.0f}x brute force)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1_000,
+    )
@@ -0,0 +1,70 @@
+# Benchmark: saving and loading a Matrix through JSON against the binary format,
+# read into memory and memory-mapped.
+#
+# Run from the repository root:
+#   python benchmarks/storage.py [size]
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Math.LinearAlgebra.Vectors import Vector  # noqa: E402
+from Math.LinearAlgebra.Matrix import Matrix  # noqa: E402
+
+
+def measure(fn) -> tuple[float, int, object]:
+    """
+    Returns (seconds, peak bytes allocated, result) for one call of fn.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def json_save(matrix: Matrix, path: str) -> None:
+    with open(path, "w") as file:
+        json.dump([list(column) for column in matrix.value], file)
+
+
+def json_load(path: str) -> Matrix:
+    with open(path) as file:
+        return Matrix([Vector(column) for column in json.load(file)])
+
+
+def main(size: int) -> None:
+    rng = random.Random(0)
+    matrix = Matrix([Vector([rng.random() for _ in range(size)]) for _ in range(size)])
+    print(f"({size} x {size}) matrix, {8 * size * size / 1e6:.1f} MB of float64")
+    print(f"{'format':<16} {'save (s)':>9} {'load (s)':>9} {'load peak (MB)':>15} {'first use (s)':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "matrix.json")
+        binary_path = os.path.join(directory, "matrix.lamx")
+        cases = [
+            ("json", lambda: json_save(matrix, json_path), lambda: json_load(json_path)),
+            ("binary", lambda: matrix.save(binary_path), lambda: Matrix.load(binary_path)),
+            ("binary, mmap", lambda: matrix.save(binary_path), lambda: Matrix.load(binary_path, mmap=True)),
+        ]
+        for name, save, load in cases:
+            start = time.perf_counter()
+            save()
+            save_time = time.perf_counter() - start
+            load_time, peak, loaded = measure(load)
+            # Touch every element once, which is when a mapped file is actually read
+            use_time = measure(lambda: sum(loaded._data))[0]
+            assert loaded == matrix
+            del loaded
+            print(f"{name:<16} {save_time:>9.3f} {load_time:>9.4f} {peak / 1e6:>15.2f} {use_time:>14.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,68 @@
+# Benchmark: peak memory and time of the streaming readers and consumers for
+# growing inputs, with a fixed batch memory ceiling. The peak should stay flat as
+# the file grows.
+#
+# Run from the repository root:
+#   python benchmarks/streaming.py [rows ...]
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Math.LinearAlgebra.Streaming import (  # noqa: E402
+    chunked_matvec, column_moments, read_binary_batches, read_csv_blocks,
+)
+from Math.LinearAlgebra.Vectors import Vector  # noqa: E402
+
+DIMENSION = 8
+MAX_BYTES = 1 << 20
+
+
+def write_inputs(directory: str, rows: int, rng: random.Random) -> tuple[str, str]:
+    csv_path = os.path.join(directory, f"data_{rows}.csv")
+    raw_path = os.path.join(directory, f"data_{rows}.bin")
+    with open(csv_path, "w") as csv_file, open(raw_path, "wb") as raw_file:
+        for _ in range(rows):
+            row = [rng.random() for _ in range(DIMENSION)]
+            csv_file.write(",".join(map(repr, row)) + "\n")
+            raw_file.write(array("d", row).tobytes())
+    return csv_path, raw_path
+
+
+def measure(fn) -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(sizes: list[int]) -> None:
+    rng = random.Random(0)
+    x = Vector([rng.random() for _ in range(DIMENSION)])
+    print(f"dimension {DIMENSION}, batch ceiling {MAX_BYTES >> 10} KB")
+    print(f"{'rows':>9} {'input (MB)':>11} {'task':<22} {'time (s)':>9} {'peak (MB)':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            csv_path, raw_path = write_inputs(directory, rows, rng)
+            tasks = [
+                ("csv matvec", lambda: chunked_matvec(read_csv_blocks(csv_path, max_bytes=MAX_BYTES), x)),
+                ("binary column moments", lambda: column_moments(
+                    read_binary_batches(raw_path, dimension=DIMENSION, max_bytes=MAX_BYTES))),
+            ]
+            for name, task in tasks:
+                elapsed, peak = measure(task)
+                size = os.path.getsize(csv_path if name.startswith("csv") else raw_path)
+                print(f"{rows:>9} {size / 1e6:>11.1f} {name:<22} {elapsed:>9.3f} {peak / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [50_000, 200_000])
@@ -0,0 +1,380 @@
+# Benchmark suite: times a registry of cases over every Math subsystem at
+# several sizes, writes the results to a JSON file, and compares two result
+# files to flag regressions.
+#
+# Run from the repository root:
+#   python benchmarks/suite.py list
+#   python benchmarks/suite.py run [--output results.json] [--filter matrix] [--quick]
+#   python benchmarks/suite.py compare baseline.json [current.json] [--threshold 0.1]
+#
+# compare without a current file runs the suite first. It exits with status 1
+# when any case got slower than the baseline by more than the threshold, so it
+# can gate a change: save a baseline on the parent commit, then compare.
+#
+# A case is a setup function registered with @benchmark(name, sizes). It is
+# called once per size, outside the timing, and returns the zero-argument
+# callable to time. New cases only need to be added to this file (or to a
+# module that imports `benchmark` from it and is imported before main runs).
+#
+# Cases over functions that cache their results (the distribution tables) pass
+# new arguments on every call, so they time the computation, not a cache hit.
+# compare refuses (exit status 2) to compare runs made with a different Python,
+# machine or linear algebra backend, whose differences would show up as
+# regressions, unless given --allow-mismatch.
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+from typing import Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Math.LinearAlgebra.Backends import get_backend  # noqa: E402
+from Math.LinearAlgebra.Matrix import Matrix  # noqa: E402
+from Math.LinearAlgebra.Vectors import Vector  # noqa: E402
+from Math.Probability.MarkovChain import MarkovChain  # noqa: E402
+from Math.Statistics import Combinatorics, RandomVariables  # noqa: E402
+from Math.Statistics.BinomialVariables import binomcdf  # noqa: E402
+from Math.Statistics.PoissonDistribution import poisson_distribution  # noqa: E402
+from Math.Utils.SpatialIndex import Grid, KDTree  # noqa: E402
+
+# name -> (sizes, setup)
+CASES: dict[str, tuple[list[int], Callable[[int], Callable[[], object]]]] = {}
+
+
+def benchmark(name: str, sizes: list[int]):
+    """
+    Registers setup(size) -> callable as the case `name`, run at every size.
+    """
+    def register(setup: Callable[[int], Callable[[], object]]):
+        if name in CASES:
+            raise ValueError(f"Duplicate benchmark {name}")
+        CASES[name] = (sizes, setup)
+        return setup
+    return register
+
+
+def _values(size: int, seed: int = 0) -> list[float]:
+    rng = random.Random(seed)
+    return [rng.uniform(-1, 1) for _ in range(size)]
+
+
+def _matrix(size: int, seed: int = 0) -> Matrix:
+    rng = random.Random(seed)
+    return Matrix([Vector([rng.uniform(-1, 1) for _ in range(size)]) for _ in range(size)])
+
+
+def _fresh(start: float, step: float = 1e-9) -> Callable[[], float]:
+    """
+    A different float on every call, from start upwards in tiny steps.
+    """
+    counter = itertools.count()
+    return lambda: start + step * next(counter)
+
+
+def _distribution(size: int, seed: int = 0) -> tuple[list[int], list[float]]:
+    rng = random.Random(seed)
+    weights = [rng.random() for _ in range(size)]
+    total = sum(weights)
+    return [rng.randint(-1000, 1000) for _ in range(size)], [w / total for w in weights]
+
+
+# Linear algebra
+
+@benchmark("matrix.multiply", [16, 64, 128])
+def _(size):
+    a, b = _matrix(size, 1), _matrix(size, 2)
+    return lambda: a * b
+
+
+@benchmark("matrix.transpose", [64, 256, 512])
+def _(size):
+    a = _matrix(size)
+    return a.transpose
+
+
+@benchmark("matrix.T", [64, 512])
+def _(size):
+    a = _matrix(size)
+    return lambda: a.T
+
+
+@benchmark("matrix.block", [64, 512])
+def _(size):
+    a = _matrix(size)
+    half = size // 2
+    return lambda: a[:half, half:]
+
+
+@benchmark("matrix.block_copy", [64, 512])
+def _(size):
+    a = _matrix(size)
+    half = size // 2
+    return lambda: a[:half, half:].copy()
+
+
+@benchmark("matrix.pow", [16, 64])
+def _(size):
+    a = _matrix(size)
+    return lambda: a ** 16
+
+
+@benchmark("matrix.str", [16, 64])
+def _(size):
+    a = _matrix(size)
+    return a.__str__
+
+
+@benchmark("lazy.chain_matvec", [64, 128])
+def _(size):
+    a, b, c = _matrix(size, 1), _matrix(size, 2), _matrix(size, 3)
+    v = Vector(_values(size))
+    return lambda: (a.lazy() * b * c * v).evaluate()
+
+
+@benchmark("lazy.fused_sum", [64, 256])
+def _(size):
+    a, b, c = _matrix(size, 1), _matrix(size, 2), _matrix(size, 3)
+    return lambda: (a.lazy() + b - 2 * c + a / 4).evaluate()
+
+
+@benchmark("vector.add", [1_000, 100_000])
+def _(size):
+    x, y = Vector(_values(size, 1)), Vector(_values(size, 2))
+    return lambda: x + y
+
+
+@benchmark("vector.dot", [1_000, 100_000])
+def _(size):
+    x, y = Vector(_values(size, 1)), Vector(_values(size, 2))
+    return lambda: x * y
+
+
+@benchmark("vector.scale", [1_000, 100_000])
+def _(size):
+    x = Vector(_values(size))
+    return lambda: 2.5 * x
+
+
+@benchmark("vector.axpy", [1_000, 100_000])
+def _(size):
+    x, y = Vector(_values(size, 1)), Vector(_values(size, 2))
+    return lambda: y.axpy(1e-9, x)
+
+
+@benchmark("markov.distribution", [16, 64])
+def _(size):
+    rng = random.Random(0)
+    rows = [[rng.random() for _ in range(size)] for _ in range(size)]
+    chain = MarkovChain([[x / sum(row) for x in row] for row in rows])
+    return lambda: chain.distribution(0, 100)
+
+
+# Spatial indexes: 100 nearest-neighbour queries against size points
+
+for _name, _cls in [("kdtree", KDTree), ("grid", Grid)]:
+    @benchmark(f"spatial.{_name}_nearest", [1_000, 100_000])
+    def _(size, cls=_cls):
+        rng = random.Random(0)
+        index = cls([(rng.random(), rng.random()) for _ in range(size)])
+        queries = [(rng.random(), rng.random()) for _ in range(100)]
+        return lambda: index.nearest_many(queries, k=5)
+
+
+# Distributions: p and lbd change on every call, so each call builds its table
+
+@benchmark("binomcdf", [100, 1_000, 10_000])
+def _(size):
+    p = _fresh(0.3)
+    return lambda: binomcdf(size, size // 2, p())
+
+
+@benchmark("poisson_distribution", [10, 100, 1_000])
+def _(size):
+    lbd = _fresh(size)
+    return lambda: poisson_distribution(lbd(), size)
+
+
+# RandomVariables mean and variance variants
+
+for _name in ["mean_with_error", "mean_decimal", "mean_fsum", "mean_precise", "variance", "variance_with_decimal", "variance_precise"]:
+    # The Decimal variants are about 100 times slower, so they get smaller sizes
+    @benchmark(f"random_variables.{_name}", [1_000, 10_000] if "decimal" in _name else [1_000, 100_000])
+    def _(size, fn=getattr(RandomVariables, _name)):
+        values, probabilities = _distribution(size)
+        return lambda: fn(values, probabilities)
+
+
+# Combinatorics, with its opt-in cache off so that every call computes
+
+@benchmark("combinatorics.factorial", [100, 1_000, 10_000])
+def _(size):
+    Combinatorics.disable_cache()
+    return lambda: Combinatorics.factorial(size)
+
+
+@benchmark("combinatorics.combination", [100, 1_000, 10_000])
+def _(size):
+    Combinatorics.disable_cache()
+    return lambda: Combinatorics.combination(size, size // 2)
+
+
+@benchmark("combinatorics.permutation", [100, 1_000, 10_000])
+def _(size):
+    Combinatorics.disable_cache()
+    return lambda: Combinatorics.permutation(size, size // 2)
+
+
+@benchmark("combinatorics.pascal_row", [100, 1_000])
+def _(size):
+    Combinatorics.disable_cache()
+    return lambda: Combinatorics.pascal_row(size)
+
+
+def measure(fn: Callable[[], object], warmup: int, repeats: int, min_time: float) -> dict:
+    """
+    Seconds per call of fn. Each repeat times enough calls to last min_time.
+    """
+    for _ in range(warmup):
+        fn()
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    times = [t / number for t in timer.repeat(repeats, number)]
+    return {
+        "number": number,
+        "repeats": repeats,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if repeats > 1 else 0.0,
+    }
+
+
+def run(filters: list[str], quick: bool, warmup: int, repeats: int, min_time: float) -> dict:
+    results = {}
+    for name, (sizes, setup) in CASES.items():
+        if filters and not any(f in name for f in filters):
+            continue
+        for size in sizes[:1] if quick else sizes:
+            key = f"{name}[{size}]"
+            result = measure(setup(size), warmup, repeats, min_time)
+            results[key] = {"case": name, "size": size, **result}
+            print(f"{key:<48} {result['median'] * 1e6:>14.2f} us")
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "backend": get_backend().name,
+            "warmup": warmup,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+# Run settings that must match for timings to be comparable
+COMPARABLE_META = ["python", "implementation", "machine", "backend"]
+
+
+def mismatched_meta(baseline: dict, current: dict) -> list[str]:
+    """
+    The COMPARABLE_META settings that differ between the two runs, described.
+    """
+    old, new = baseline.get("meta", {}), current.get("meta", {})
+    return [f"{key}: {old.get(key)} vs {new.get(key)}" for key in COMPARABLE_META if old.get(key) != new.get(key)]
+
+
+def compare(baseline: dict, current: dict, threshold: float, metric: str) -> list[str]:
+    """
+    Prints every case found in both runs and returns the ones that regressed.
+    """
+    regressions = []
+    print(f"{'case':<48} {'baseline (us)':>14} {'current (us)':>14} {'change':>8}")
+    for key, old in baseline["results"].items():
+        new = current["results"].get(key)
+        if new is None:
+            continue
+        change = new[metric] / old[metric] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{key:<48} {old[metric] * 1e6:>14.2f} {new[metric] * 1e6:>14.2f} {change:>+7.1%}{flag}")
+    missing = sorted(set(baseline["results"]) - set(current["results"]))
+    if missing:
+        print(f"{len(missing)} baseline case(s) not in the current run")
+    print(f"{len(regressions)} regression(s) beyond {threshold:.0%} ({metric})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Math benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list the benchmark cases and their sizes")
+
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument("--filter", action="append", default=[], help="only run cases whose name contains this")
+    options.add_argument("--quick", action="store_true", help="only run the smallest size of each case")
+    options.add_argument("--warmup", type=int, default=1, help="untimed calls before timing")
+    options.add_argument("--repeats", type=int, default=5, help="timed repeats per case")
+    options.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per repeat")
+
+    run_parser = commands.add_parser("run", parents=[options], help="run the suite and write JSON results")
+    run_parser.add_argument("--output", default="benchmark-results.json")
+
+    compare_parser = commands.add_parser("compare", parents=[options], help="compare results with a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current", nargs="?", help="results file, or omit to run the suite now")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, 0.10 for 10%%")
+    compare_parser.add_argument("--metric", choices=["min", "median", "mean"], default="median")
+    compare_parser.add_argument("--output", help="also write the new results here")
+    compare_parser.add_argument(
+        "--allow-mismatch", action="store_true", help="compare even when the runs used a different Python or backend"
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        for name, (sizes, _) in CASES.items():
+            print(f"{name:<40} {sizes}")
+        return 0
+
+    if args.command == "compare" and args.current:
+        with open(args.current) as file:
+            current = json.load(file)
+    else:
+        current = run(args.filter, args.quick, args.warmup, args.repeats, args.min_time)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.command == "compare":
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        mismatches = mismatched_meta(baseline, current)
+        if mismatches:
+            print("The runs are not comparable (baseline vs current):")
+            for mismatch in mismatches:
+                print(f"  {mismatch}")
+            if not args.allow_mismatch:
+                print("Not comparing; pass --allow-mismatch to compare anyway")
+                return 2
+        return 1 if compare(baseline, current, args.threshold, args.metric) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())